@@ -34,7 +34,15 @@ from modules.tool_schema_extractor import tool_schema_extractor_bp
 from modules.schema_manager import schema_manager_bp
 from modules.trajectory_viewer import trajectory_viewer_bp
 from modules.health import health_bp
+from modules.checkpoints import checkpoints_bp
+from modules.profiling import profiling_bp
+from modules.trial_runner import trial_runner_bp
+from modules.trajectory_archive import trajectory_archive_bp
+from modules.action_gaps import action_gaps_bp
+from modules.task_diff import task_diff_bp
+from modules.state_comparison import state_comparison_bp
 ################# END OF BLUEPRINTS #####################
+from modules.preload import preload_from_environment
 
 from dotenv import load_dotenv
 load_dotenv()
@@ -71,8 +79,19 @@ app.register_blueprint(tool_schema_extractor_bp, url_prefix='/clone')
 app.register_blueprint(schema_manager_bp, url_prefix='/clone')
 app.register_blueprint(trajectory_viewer_bp, url_prefix='/clone')
 app.register_blueprint(health_bp, url_prefix='/clone')
+app.register_blueprint(checkpoints_bp, url_prefix='/clone')
+app.register_blueprint(profiling_bp, url_prefix='/clone')
+app.register_blueprint(trial_runner_bp, url_prefix='/clone')
+app.register_blueprint(trajectory_archive_bp, url_prefix='/clone')
+app.register_blueprint(action_gaps_bp, url_prefix='/clone')
+app.register_blueprint(task_diff_bp, url_prefix='/clone')
+app.register_blueprint(state_comparison_bp, url_prefix='/clone')
 ####### END OF REGISTER BLUEPRINTS #######
 
+# Warm interface manifests, Tools classes and dataset baselines before gunicorn
+# forks its workers (requires --preload); no-op unless PRELOAD_ENVIRONMENTS is set
+preload_from_environment()
+
 PUBLIC_ROUTES = {
     '/',
     '/login',
@@ -1,6 +1,9 @@
 # Copyright Sierra
 
+import copy
+import inspect
 import random
+import threading
 from hashlib import sha256
 from tau_bench.envs.tool import Tool
 from typing import Any, Callable, Dict, List, Type, Optional, Set, Union, Tuple
@@ -76,25 +79,37 @@ class Env(object):
         self.actions: List[Action] = []
 
     def reset(self, task_index: Optional[int] = None) -> EnvResetResponse:
+        self.begin_episode(task_index)
+        initial_observation = self.user.reset(instruction=self.task.instruction)
+        return EnvResetResponse(
+            observation=initial_observation, info=EnvInfo(task=self.task, source="user")
+        )
+
+    def begin_episode(self, task_index: Optional[int] = None) -> None:
         if task_index is None:
             task_index = random.randint(0, len(self.tasks))
         self.task_index = task_index
         self.data = self.data_load_func()
         self.task = self.tasks[task_index]
         self.actions = []
-        initial_observation = self.user.reset(instruction=self.task.instruction)
-        return EnvResetResponse(
-            observation=initial_observation, info=EnvInfo(task=self.task, source="user")
-        )
 
     def step(self, action: Action) -> EnvResponse:
+        user_observation = None
+        if action.name == RESPOND_ACTION_NAME:
+            user_observation = self.user.step(action.kwargs["content"])
+        return self.apply_step(action, user_observation)
+
+    def apply_step(
+        self, action: Action, user_observation: Optional[str] = None
+    ) -> EnvResponse:
+        """Step with the user's reply to a respond action already known."""
         self.actions.append(action)
 
         info = EnvInfo(task=self.task)
         reward = 0
         done = False
         if action.name == RESPOND_ACTION_NAME:
-            observation = self.user.step(action.kwargs["content"])
+            observation = user_observation
             info.source = "user"
             done = "###STOP###" in observation
         elif action.name in self.tools_map:
@@ -119,8 +134,26 @@ class Env(object):
         return EnvResponse(observation=observation, reward=reward, done=done, info=info)
 
     def get_data_hash(self) -> str:
+        if isinstance(self.data, CopyOnWriteData):
+            return self.data.data_hash()
         return consistent_hash(to_hashable(self.data))
 
+    # Task index -> ground truth data hash, shared by the episodes of a BatchEnv
+    ground_truth_hashes: Optional[Dict[int, str]] = None
+
+    def get_ground_truth_data_hash(self) -> str:
+        if self.ground_truth_hashes is not None and self.task_index in self.ground_truth_hashes:
+            # Same bookkeeping as the replay below, without redoing it
+            self.actions.extend(
+                action for action in self.task.actions if action.name not in self.terminate_tools
+            )
+            return self.ground_truth_hashes[self.task_index]
+        self.data = self.data_load_func()
+        for action in self.task.actions:
+            if action.name not in self.terminate_tools:
+                self.step(action)
+        return self.get_data_hash()
+
     def calculate_reward(self) -> RewardResult:
         data_hash = self.get_data_hash()
         reward = 1.0
@@ -129,12 +162,7 @@ class Env(object):
         ]
 
         # Check if the database changes are correct. If they are not correct, then we set the reward to 0.
-        # TODO: cache gt_data_hash in tasks.py (low priority)
-        self.data = self.data_load_func()
-        for action in self.task.actions:
-            if action.name not in self.terminate_tools:
-                self.step(action)
-        gt_data_hash = self.get_data_hash()
+        gt_data_hash = self.get_ground_truth_data_hash()
         info = RewardActionInfo(
             r_actions=data_hash == gt_data_hash, gt_data_hash=gt_data_hash
         )
@@ -162,3 +190,185 @@ class Env(object):
             info = RewardOutputInfo(r_outputs=r_outputs, outputs=outputs)
             
         return RewardResult(reward=reward, info=info, actions=actions)
+
+
+def copy_json(value: Any) -> Any:
+    """Deep copy of JSON-shaped data, much cheaper than copy.deepcopy."""
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [copy_json(item) for item in value]
+    return value
+
+
+class SharedBaseline(object):
+    """Baseline tables shared read-only by the CopyOnWriteData views of a BatchEnv."""
+
+    def __init__(self, tables: Dict[str, Any]) -> None:
+        self.tables = tables
+        self.table_reprs: Dict[str, str] = {}
+        self.lock = threading.Lock()
+
+    def view(self) -> "CopyOnWriteData":
+        return CopyOnWriteData(self)
+
+    def table_repr(self, name: str) -> str:
+        """repr of the hashable form of an untouched table, computed once."""
+        with self.lock:
+            if name not in self.table_reprs:
+                self.table_reprs[name] = repr(to_hashable(self.tables[name]))
+            return self.table_reprs[name]
+
+
+class CopyOnWriteData(dict):
+    """
+    Episode data over a SharedBaseline. A table is copied the first time the
+    episode looks it up, so tools can mutate it freely while the tables an
+    episode never touches stay shared. data_hash() equals consistent_hash of
+    the full data but only rehashes the copied tables.
+    """
+
+    def __init__(self, baseline: SharedBaseline) -> None:
+        super().__init__(baseline.tables)
+        self.baseline = baseline
+        self.owned: Set[str] = set()
+
+    def _own(self, key: str) -> Any:
+        if key not in self.owned and dict.__contains__(self, key):
+            dict.__setitem__(self, key, copy_json(dict.__getitem__(self, key)))
+            self.owned.add(key)
+        return dict.__getitem__(self, key)
+
+    def __getitem__(self, key: str) -> Any:
+        return self._own(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            return default
+        return self._own(key)
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        if not dict.__contains__(self, key):
+            self[key] = default
+        return self._own(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        dict.__setitem__(self, key, value)
+        self.owned.add(key)
+
+    def values(self):
+        return [self._own(key) for key in self.keys()]
+
+    def items(self):
+        return [(key, self._own(key)) for key in self.keys()]
+
+    def data_hash(self) -> str:
+        parts = []
+        for key in sorted(self.keys()):
+            if key in self.owned or key not in self.baseline.tables:
+                table_repr = repr(to_hashable(dict.__getitem__(self, key)))
+            else:
+                table_repr = self.baseline.table_repr(key)
+            parts.append(f"({key!r}, {table_repr})")
+        # str() of the tuple to_hashable builds for the whole data
+        return consistent_hash(
+            "(" + ", ".join(parts) + ("," if len(parts) == 1 else "") + ")"
+        )
+
+
+class BatchEnv(object):
+    """
+    K episodes of one environment over a single shared copy of its data.
+
+    Each episode is a shallow copy of env (tools, tasks and wiki are shared)
+    with its own user simulator and a CopyOnWriteData view of env's data.
+    Ground truth hashes are computed once per task and shared, so rewards
+    skip the ground truth replay. Episodes are stepped in lockstep with
+    reset/step, or independently with areset/astep, which await async user
+    simulators such as AsyncLLMUserSimulationEnv.
+    """
+
+    def __init__(
+        self,
+        env: Env,
+        num_episodes: int,
+        user_factory: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self.env = env
+        self.baseline = SharedBaseline(env.data)
+        self.ground_truth_hashes: Dict[int, str] = {}
+        self.lock = threading.Lock()
+        self.episodes: List[Env] = []
+        for _ in range(num_episodes):
+            episode = copy.copy(env)
+            episode.data_load_func = self.baseline.view
+            episode.data = self.baseline.view()
+            episode.user = user_factory() if user_factory is not None else copy.copy(env.user)
+            episode.actions = []
+            episode.ground_truth_hashes = self.ground_truth_hashes
+            self.episodes.append(episode)
+        self.done = [False] * num_episodes
+
+    def __len__(self) -> int:
+        return len(self.episodes)
+
+    def ground_truth_hash(self, task_index: int) -> str:
+        """Data hash after the task's actions, replayed once per task."""
+        with self.lock:
+            if task_index not in self.ground_truth_hashes:
+                replay = copy.copy(self.env)
+                replay.data_load_func = self.baseline.view
+                replay.begin_episode(task_index)
+                for action in replay.task.actions:
+                    if action.name not in replay.terminate_tools and action.name != RESPOND_ACTION_NAME:
+                        replay.apply_step(action)
+                self.ground_truth_hashes[task_index] = replay.get_data_hash()
+            return self.ground_truth_hashes[task_index]
+
+    def reset(self, task_indices: List[int]) -> List[EnvResetResponse]:
+        responses = []
+        for index, task_index in enumerate(task_indices):
+            self.ground_truth_hash(task_index)
+            self.done[index] = False
+            responses.append(self.episodes[index].reset(task_index=task_index))
+        return responses
+
+    def step(self, actions: List[Optional[Action]]) -> List[Optional[EnvResponse]]:
+        """Step every episode given an action; None skips an episode this round."""
+        responses: List[Optional[EnvResponse]] = []
+        for index, action in enumerate(actions):
+            if action is None or self.done[index]:
+                responses.append(None)
+                continue
+            response = self.episodes[index].step(action)
+            self.done[index] = response.done
+            responses.append(response)
+        return responses
+
+    async def areset(self, index: int, task_index: int) -> EnvResetResponse:
+        self.ground_truth_hash(task_index)
+        episode = self.episodes[index]
+        self.done[index] = False
+        episode.begin_episode(task_index)
+        observation = episode.user.reset(instruction=episode.task.instruction)
+        if inspect.isawaitable(observation):
+            observation = await observation
+        return EnvResetResponse(
+            observation=observation, info=EnvInfo(task=episode.task, source="user")
+        )
+
+    async def astep(self, index: int, action: Action) -> EnvResponse:
+        episode = self.episodes[index]
+        user_observation = None
+        if action.name == RESPOND_ACTION_NAME:
+            user_observation = episode.user.step(action.kwargs["content"])
+            if inspect.isawaitable(user_observation):
+                user_observation = await user_observation
+        response = episode.apply_step(action, user_observation)
+        self.done[index] = response.done
+        return response
+
+    def calculate_rewards(self) -> List[RewardResult]:
+        for episode in self.episodes:
+            self.ground_truth_hash(episode.task_index)
+        return [episode.calculate_reward() for episode in self.episodes]
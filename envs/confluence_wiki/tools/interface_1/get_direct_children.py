@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy
 
 
 class GetDirectChildren(Tool):
@@ -79,11 +80,10 @@ class GetDirectChildren(Tool):
                 }
             )
 
-        # Gather direct children first
-        children = []
-        for _, page in pages.items():
-            if str(page.get("parent_page_id")) == str(page_id):
-                children.append(page)
+        # Gather direct children from the maintained hierarchy index
+        children = [
+            pages[child_id] for child_id in get_page_hierarchy(data).child_ids(page_id)
+        ]
 
         # Apply AND of filters
         if filters:
@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import page_moved
 
 
 class UpdatePage(Tool):
@@ -299,6 +300,7 @@ class UpdatePage(Tool):
             page["parent_page_id"] = (
                 str(parent_page_id) if parent_page_id != "-1" else None
             )
+            page_moved(data, page_id_str)
 
         if body_storage is not None:
             page["body_storage"] = body_storage
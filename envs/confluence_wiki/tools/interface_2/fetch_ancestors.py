@@ -1,6 +1,7 @@
 import json
-from typing import Any, Dict, List, Set
+from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy
 
 
 class FetchAncestors(Tool):
@@ -23,44 +24,6 @@ class FetchAncestors(Tool):
           {"success": False, "error": "..."} on error
         """
 
-        def get_ancestors_recursive(
-            pages_dict: Dict[str, Any], page_id: str, visited: Set[str]
-        ) -> List[Dict[str, Any]]:
-            ancestors = []
-
-            # Prevent infinite loops in case of circular references
-            if page_id in visited:
-                return ancestors
-
-            visited.add(page_id)
-
-            # Get the current page
-            current_page = pages_dict.get(page_id)
-            if not isinstance(current_page, dict):
-                return ancestors
-
-            # Get the parent_page_id
-            parent_id = current_page.get("parent_page_id")
-
-            # If there's a parent, add it to ancestors and recurse
-            if parent_id is not None:
-                parent_id_str = str(parent_id)
-
-                # Check if parent exists in pages_dict
-                if parent_id_str in pages_dict:
-                    parent_page = pages_dict[parent_id_str]
-                    if isinstance(parent_page, dict):
-                        parent_copy = parent_page.copy()
-                        ancestors.append(parent_copy)
-
-                        # Recursively find ancestors of the parent
-                        parent_ancestors = get_ancestors_recursive(
-                            pages_dict, parent_id_str, visited
-                        )
-                        ancestors.extend(parent_ancestors)
-
-            return ancestors
-
         # Basic input validation
         if not isinstance(data, dict):
             return json.dumps(
@@ -96,9 +59,12 @@ class FetchAncestors(Tool):
                 }
             )
 
-        # Get all ancestors recursively
-        visited = set()
-        ancestors = get_ancestors_recursive(pages_dict, page_id_str, visited)
+        # Get all ancestors from the maintained hierarchy index
+        hierarchy = get_page_hierarchy(data)
+        ancestors = [
+            pages_dict[ancestor_id].copy()
+            for ancestor_id in hierarchy.ancestor_ids(page_id_str)
+        ]
 
         return json.dumps({"success": True, "ancestors": ancestors})
 
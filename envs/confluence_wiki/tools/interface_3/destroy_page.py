@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy, page_removed
 
 
 class DestroyPage(Tool):
@@ -91,11 +92,7 @@ class DestroyPage(Tool):
             )
 
         # Check for descendants (should be handled before calling delete)
-        has_descendants = any(
-            p.get("parent_page_id") == page_id_str
-            for p in pages_dict.values()
-            if isinstance(p, dict)
-        )
+        has_descendants = get_page_hierarchy(data).has_children(page_id_str)
 
         if has_descendants:
             return json.dumps(
@@ -110,6 +107,7 @@ class DestroyPage(Tool):
         if hard_delete:
             # Hard delete: Remove page from database
             del pages_dict[page_id_str]
+            page_removed(data, page_id_str)
 
             return json.dumps(
                 {
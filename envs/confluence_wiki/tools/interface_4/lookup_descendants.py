@@ -1,6 +1,7 @@
 import json
-from typing import Any, Dict, List, Set
+from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy
 
 
 class LookupDescendants(Tool):
@@ -23,40 +24,6 @@ class LookupDescendants(Tool):
           {"success": False, "error": "..."} on error
         """
 
-        def get_descendants_recursive(
-            pages_dict: Dict[str, Any], page_id: str, visited: Set[str]
-        ) -> List[Dict[str, Any]]:
-            descendants = []
-
-            # Find all direct children (pages where parent_page_id == page_id)
-            for page_key, page in pages_dict.items():
-                if not isinstance(page, dict):
-                    continue
-
-                parent_id = page.get("parent_page_id")
-
-                # Check if this page is a direct child
-                if parent_id is not None and str(parent_id) == str(page_id):
-                    child_id = page.get("page_id")
-
-                    # Prevent infinite loops in case of circular references
-                    if child_id and str(child_id) in visited:
-                        continue
-
-                    page_copy = page.copy()
-                    descendants.append(page_copy)
-
-                    # Mark this child as visited and recursively find its descendants
-                    if child_id:
-                        child_id_str = str(child_id)
-                        visited.add(child_id_str)
-                        child_descendants = get_descendants_recursive(
-                            pages_dict, child_id_str, visited
-                        )
-                        descendants.extend(child_descendants)
-
-            return descendants
-
         # Basic input validation
         if not isinstance(data, dict):
             return json.dumps(
@@ -91,9 +58,12 @@ class LookupDescendants(Tool):
                 }
             )
 
-        # Get all descendants recursively
-        visited = set()
-        descendants = get_descendants_recursive(pages_dict, page_id_str, visited)
+        # Get all descendants from the maintained hierarchy index
+        hierarchy = get_page_hierarchy(data)
+        descendants = [
+            pages_dict[child_id].copy()
+            for child_id in hierarchy.descendant_ids(page_id_str)
+        ]
 
         return json.dumps({"success": True, "descendants": descendants})
 
@@ -2,6 +2,7 @@ import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import page_added
 
 
 class MakePage(Tool):
@@ -171,6 +172,7 @@ class MakePage(Tool):
 
         # Add page to data (modify in place)
         pages_dict[new_page_id] = new_page
+        page_added(data, new_page_id)
 
         return json.dumps({"success": True, "page": new_page})
 
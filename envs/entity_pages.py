@@ -0,0 +1,59 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional
+
+# Paging for the discover_* entity tools. Without limit/offset/cursor the
+# result is unchanged ({"count", "results"} with every match); with them the
+# tool returns one page plus "total_count", "offset" and "next_cursor".
+
+
+def encode_cursor(offset: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({"offset": offset}).encode("utf-8")).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))["offset"]
+    except (ValueError, TypeError, KeyError, AttributeError):
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    if not isinstance(offset, int) or isinstance(offset, bool) or offset < 0:
+        raise ValueError(f"Invalid cursor '{cursor}'")
+    return offset
+
+
+def _non_negative_int(name: str, value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Invalid {name} '{value}'. Must be a non-negative integer")
+    return value
+
+
+def paginate(
+    results: List[Any], limit: Optional[int] = None, offset: Optional[int] = None, cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Select one page of results.
+
+    Raises:
+        ValueError: for invalid limit, offset or cursor, or both offset and cursor
+    """
+    if limit is None and offset is None and cursor is None:
+        return {"count": len(results), "results": results}
+
+    if cursor is not None:
+        if offset is not None:
+            raise ValueError("Provide either offset or cursor, not both")
+        start = decode_cursor(cursor)
+    else:
+        start = _non_negative_int("offset", offset) if offset is not None else 0
+    if limit is not None and _non_negative_int("limit", limit) == 0:
+        raise ValueError("Invalid limit '0'. Must be a positive integer")
+
+    end = len(results) if limit is None else min(start + limit, len(results))
+    page = results[start:end]
+    return {
+        "count": len(page),
+        "total_count": len(results),
+        "offset": start,
+        "next_cursor": encode_cursor(end) if end < len(results) else None,
+        "results": page,
+    }
@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat, cached_strptime
 
 class FilterInvestors(Tool):
     @staticmethod
@@ -49,7 +50,7 @@ class FilterInvestors(Tool):
                 inc_date = investor.get("date_of_incorporation")
                 if inc_date:
                     try:
-                        inc_date_obj = datetime.strptime(inc_date, "%Y-%m-%d").date()
+                        inc_date_obj = cached_strptime(inc_date, "%Y-%m-%d").date()
                         if incorporation_date_from:
                             from_date = datetime.strptime(incorporation_date_from, "%Y-%m-%d").date()
                             if inc_date_obj < from_date:
@@ -89,7 +90,7 @@ class FilterInvestors(Tool):
                 created_at = investor.get("created_at")
                 if created_at:
                     try:
-                        created_date = datetime.fromisoformat(created_at.replace('Z', '+00:00'))
+                        created_date = cached_fromisoformat(created_at.replace('Z', '+00:00'))
                         if created_after:
                             after_date = datetime.fromisoformat(created_after.replace('Z', '+00:00'))
                             if created_date < after_date:
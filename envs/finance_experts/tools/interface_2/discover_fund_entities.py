@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverFundEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover fund entities.
         
@@ -40,11 +48,18 @@ class DiscoverFundEntities(Tool):
             else:
                 results.append({**entity_data, "fund_id": entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -64,6 +79,18 @@ class DiscoverFundEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For funds, filters are: fund_id (string), name (string), fund_type (enum: 'mutual_funds', 'exchange_traded_funds', 'pension_funds', 'private_equity_funds', 'hedge_funds', 'sovereign_wealth_funds', 'money_market_funds', 'real_estate_investment_trusts', 'infrastructure_funds', 'multi_asset_funds'), manager_id (string), size (decimal), status (enum: 'open', 'closed'), created_at (timestamp), updated_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverInstrumentEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover instrument entities.
         
@@ -40,11 +48,18 @@ class DiscoverInstrumentEntities(Tool):
             else:
                 results.append({**entity_data, "instrument_id": entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -64,6 +79,18 @@ class DiscoverInstrumentEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For instruments, filters are: instrument_id (string), ticker (string), name (string), status (enum: 'active', 'inactive'), instrument_type (enum: 'equities_common_shares', 'equities_preferred_shares', 'equities_indexed', 'equities_domestic', 'equities_international', 'bonds_corporate', 'bonds_municipal', 'bonds_government', 'bonds_inflation_linked', 'bonds_high_yield', 'bonds_distressed', 'money_market_treasury_bills', 'money_market_commercial_paper', 'certificates_of_deposit', 'repurchase_agreements', 'short_term_municipal_notes', 'bankers_acceptances', 'commodities_gold_oil_futures', 'commodities_spot', 'commodities_futures', 'derivatives_options', 'derivatives_futures', 'derivatives_swaps', 'real_estate_direct_property', 'real_estate_reits', 'mortgage_backed_securities', 'property_development_loans', 'private_equity', 'equity_stakes_private_companies', 'equity_stakes_infrastructure_assets', 'mezzanine_financing', 'convertible_preferred_stock', 'leveraged_buyout_debt', 'distressed_debt', 'project_finance_debt', 'infrastructure_bonds', 'ppp_investments', 'infrastructure_debt_equity', 'infrastructure_projects', 'alternative_assets_hedge_funds', 'alternative_assets_commodities')"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
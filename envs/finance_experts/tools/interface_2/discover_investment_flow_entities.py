@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverInvestmentFlowEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover investment flow entities: subscriptions, commitments, and redemptions.
         
@@ -49,11 +57,18 @@ class DiscoverInvestmentFlowEntities(Tool):
             else:
                 results.append({**entity_data, id_field: entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -73,6 +88,18 @@ class DiscoverInvestmentFlowEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For subscriptions, filters are: subscription_id (string), fund_id (string), investor_id (string), amount (decimal), status (enum: 'pending', 'approved', 'cancelled'), request_assigned_to (string), request_date (date), approval_date (date), updated_at (timestamp). For commitments, filters are: commitment_id (string), fund_id (string), investor_id (string), commitment_amount (decimal), commitment_date (date), status (enum: 'pending', 'fulfilled'), updated_at (timestamp). For redemptions, filters are: redemption_id (string), subscription_id (string), request_date (date), redemption_amount (decimal), status (enum: 'pending', 'approved', 'processed', 'cancelled'), processed_date (date), redemption_fee (decimal), updated_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverInvestorEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover investor entities.
         
@@ -40,11 +48,18 @@ class DiscoverInvestorEntities(Tool):
             else:
                 results.append({**entity_data, "investor_id": entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -64,6 +79,18 @@ class DiscoverInvestorEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For investors, filters are: investor_id (string), name (string), registration_number (string), date_of_incorporation (date), country (string), address (string), tax_id (string), source_of_funds (enum: 'retained_earnings', 'shareholder_capital', 'asset_sale', 'loan_facility', 'external_investment', 'government_grant', 'merger_or_acquisition_proceeds', 'royalty_or_licensing_income', 'dividend_income', 'other'), status (enum: 'onboarded', 'offboarded'), contact_email (string), accreditation_status (enum: 'accredited', 'non_accredited'), created_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
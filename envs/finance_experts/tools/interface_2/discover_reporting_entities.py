@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverReportingEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover reporting entities: reports and documents.
         
@@ -47,11 +55,18 @@ class DiscoverReportingEntities(Tool):
             else:
                 results.append({**entity_data, id_field: entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -71,6 +86,18 @@ class DiscoverReportingEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For reports, filters are: report_id (string), fund_id (string), investor_id (string), report_date (date), report_type (enum: 'performance', 'holding', 'financial'), generated_by (string), status (enum: 'pending', 'completed', 'failed'), created_at (timestamp), export_period_end (date). For documents, filters are: document_id (string), name (string), format (enum: 'pdf', 'xlsx', 'docx', 'csv', 'other'), uploaded_by (string), upload_date (timestamp), report_id (string), size_bytes (bigint), confidentiality_level (enum: 'public', 'internal', 'confidential', 'restricted'), status (enum: 'available', 'archived', 'deleted')"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
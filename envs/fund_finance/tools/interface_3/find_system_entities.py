@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class FindSystemEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover system entities: notifications and audit trails.
         
@@ -47,11 +55,18 @@ class FindSystemEntities(Tool):
             else:
                 results.append({**entity_data, id_field: entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -71,6 +86,18 @@ class FindSystemEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For notifications, filters are: notification_id (string), email (string), type (enum: 'alert', 'report', 'reminder', 'subscription_update'), class (enum: 'funds', 'investors', 'portfolios', 'trades', 'invoices', 'reports', 'documents', 'subscriptions', 'commitments'), reference_id (string), status (enum: 'pending', 'sent', 'failed'), sent_at (timestamp), created_at (timestamp). For audit_trails, filters are: audit_trail_id (string), reference_id (string), reference_type (enum: 'user', 'fund', 'investor', 'subscription', 'commitment', 'redemption', 'trade', 'portfolio', 'holding', 'instrument', 'invoice', 'payment', 'document', 'report', 'nav', 'notification'), action (enum: 'create', 'update', 'delete', 'approve', 'cancel', 'process'), user_id (string), field_name (string), old_value (text), new_value (text), created_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
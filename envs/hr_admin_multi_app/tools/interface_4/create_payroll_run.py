@@ -2,6 +2,7 @@ import json
 from datetime import datetime
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class CreatePayrollRun(Tool):
     @staticmethod
@@ -65,8 +66,8 @@ class CreatePayrollRun(Tool):
                 continue
 
             try:
-                existing_start = datetime.strptime(existing_start_str, "%Y-%m-%d")
-                existing_end = datetime.strptime(existing_end_str, "%Y-%m-%d")
+                existing_start = cached_strptime(existing_start_str, "%Y-%m-%d")
+                existing_end = cached_strptime(existing_end_str, "%Y-%m-%d")
             except ValueError:
                 continue # Skip malformed existing records
 
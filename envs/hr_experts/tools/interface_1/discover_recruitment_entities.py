@@ -1,10 +1,18 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 class DiscoverRecruitmentEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover recruitment entities.
         
@@ -49,11 +57,18 @@ class DiscoverRecruitmentEntities(Tool):
             else:
                 results.append({**entity_data, id_field: entity_id})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -73,6 +88,18 @@ class DiscoverRecruitmentEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For candidates: candidate_id (string), first_name (string), last_name (string), email (string), phone_number (string), address (string), source (enum: 'job_board', 'referral', 'company_website', 'recruiter', 'social_media', 'career_fair'), status (enum: 'new', 'screening', 'interviewing', 'offer', 'hired', 'rejected', 'withdrawn'), created_at (timestamp), updated_at (timestamp). For job_applications: application_id (string), candidate_id (string), position_id (string), application_date (date), status (enum: 'submitted', 'under_review', 'screening', 'interviewing', 'offer_made', 'accepted', 'rejected', 'withdrawn'), recruiter_id (string), ai_screening_score (decimal), final_decision (enum: 'hire', 'reject', 'hold'), created_at (timestamp), updated_at (timestamp). For interviews: interview_id (string), application_id (string), interviewer_id (string), interview_type (enum: 'phone_screening', 'technical', 'behavioral', 'panel', 'final'), scheduled_date (timestamp), duration_minutes (integer), status (enum: 'scheduled', 'completed', 'cancelled', 'no_show'), overall_rating (enum: 'excellent', 'good', 'average', 'below_average', 'poor'), technical_score (decimal), communication_score (decimal), cultural_fit_score (decimal), recommendation (enum: 'strong_hire', 'hire', 'no_hire', 'strong_no_hire'), created_at (timestamp), updated_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
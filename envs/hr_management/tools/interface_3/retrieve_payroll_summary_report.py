@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class RetrievePayrollSummaryReport(Tool):
     @staticmethod
@@ -26,8 +27,8 @@ class RetrievePayrollSummaryReport(Tool):
                 
                 # Convert strings to dates for comparison
                 try:
-                    record_start_date = datetime.strptime(record_start, "%Y-%m-%d").date()
-                    record_end_date = datetime.strptime(record_end, "%Y-%m-%d").date()
+                    record_start_date = cached_strptime(record_start, "%Y-%m-%d").date()
+                    record_end_date = cached_strptime(record_end, "%Y-%m-%d").date()
                     
                     # Filter by start date (payroll period must start on or after this date)
                     if pay_period_start:
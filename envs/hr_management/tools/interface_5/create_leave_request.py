@@ -2,6 +2,7 @@ import json
 from datetime import datetime
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class CreateLeaveRequest(Tool):
     @staticmethod
@@ -66,7 +67,7 @@ class CreateLeaveRequest(Tool):
                 
                 # Check if request is in 2025
                 try:
-                    request_start = datetime.strptime(request["start_date"], "%Y-%m-%d")
+                    request_start = cached_strptime(request["start_date"], "%Y-%m-%d")
                     if request_start.year == 2025:
                         total_used_days += request["days_requested"]
                 except (ValueError, KeyError):
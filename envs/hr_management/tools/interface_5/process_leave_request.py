@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class ProcessLeaveRequest(Tool):
     @staticmethod
@@ -36,8 +37,7 @@ class ProcessLeaveRequest(Tool):
                     
                     # Check if request is in 2025
                     try:
-                        from datetime import datetime
-                        request_start = datetime.strptime(request["start_date"], "%Y-%m-%d")
+                        request_start = cached_strptime(request["start_date"], "%Y-%m-%d")
                         if request_start.year == 2025:
                             total_used_days += request["days_requested"]
                     except (ValueError, KeyError):
@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class QueryIncidentReports(Tool):
     @staticmethod
@@ -19,7 +20,7 @@ class QueryIncidentReports(Tool):
                 if not ts:
                     return None
                 ts_local = ts.replace("Z", "+00:00")
-                return datetime.fromisoformat(ts_local)
+                return cached_fromisoformat(ts_local)
 
             reports: Dict[str, Any] = data.get("incident_reports", {})
             results: List[Dict[str, Any]] = []
@@ -1,7 +1,7 @@
 import json
 from typing import Any, Dict, Optional
-from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class ReviseIncidentReport(Tool):
     @staticmethod
@@ -18,7 +18,7 @@ class ReviseIncidentReport(Tool):
             # Local ISO validator (accepts trailing 'Z')
             def is_iso(ts: str) -> bool:
                 try:
-                    datetime.fromisoformat(ts.strip().replace("Z", "+00:00"))
+                    cached_fromisoformat(ts.strip().replace("Z", "+00:00"))
                     return True
                 except Exception:
                     return False
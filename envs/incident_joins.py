@@ -0,0 +1,103 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+# Materialized incident -> client join path for the incident environments:
+#   incidents -> incident_configuration_items -> ci_client_assignments -> clients
+# SLA, escalation and reporting tools read it instead of rebuilding the maps
+# on every call. Parsed incident timestamps live in envs/timestamp_columns.py.
+# ci_client_assignments rows are never updated in place, and
+# incident_configuration_items updates go through incident_links_changed(),
+# so comparing table sizes is enough to notice inserted or deleted links.
+
+LINK_TABLES = ("incident_configuration_items", "ci_client_assignments")
+
+# (id(incident_configuration_items), id(ci_client_assignments)) ->
+# (link tables, IncidentJoins). The tables are kept so their ids stay unique.
+# Trials run in thread pools share the cache, so it is only touched under
+# _JOINS_LOCK.
+_JOINS: "OrderedDict[Tuple[int, int], Any]" = OrderedDict()
+_JOINS_LOCK = threading.Lock()
+MAX_JOINS = 32
+
+
+class IncidentJoins:
+    def __init__(self, incident_cis: Dict[str, Any], assignments: Dict[str, Any]) -> None:
+        self.incident_cis = incident_cis
+        self.assignments = assignments
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        # ci_id -> [(assignment position, client_id), ...]
+        ci_clients: Dict[Any, List[Tuple[int, Any]]] = {}
+        for position, assignment in enumerate(self.assignments.values()):
+            client_id = assignment.get("client_id")
+            if client_id:
+                ci_clients.setdefault(assignment.get("ci_id"), []).append((position, client_id))
+
+        # incident_id -> {ci_id, ...}
+        incident_ci_ids: Dict[Any, set] = {}
+        for link in self.incident_cis.values():
+            ci_id = link.get("ci_id")
+            if ci_id:
+                incident_ci_ids.setdefault(link.get("incident_id"), set()).add(ci_id)
+
+        self.incident_clients: Dict[Any, Tuple[Any, ...]] = {}
+        for incident_id, ci_ids in incident_ci_ids.items():
+            # Distinct clients in assignment table order, like a scan of
+            # ci_client_assignments would find them
+            matches = sorted(match for ci_id in ci_ids for match in ci_clients.get(ci_id, ()))
+            self.incident_clients[incident_id] = tuple(dict.fromkeys(client_id for _, client_id in matches))
+
+        self.sizes = (len(self.incident_cis), len(self.assignments))
+
+    def is_current(self) -> bool:
+        return self.sizes == (len(self.incident_cis), len(self.assignments))
+
+    def client_ids(self, incident_id: Any) -> Tuple[Any, ...]:
+        """Clients affected by an incident through its configuration items, in assignment order."""
+        return self.incident_clients.get(incident_id, ())
+
+
+def _tables(data: Dict[str, Any]) -> Optional[Tuple[Dict[str, Any], Dict[str, Any]]]:
+    incident_cis = data.get("incident_configuration_items")
+    assignments = data.get("ci_client_assignments")
+    if not isinstance(incident_cis, dict) or not isinstance(assignments, dict):
+        return None
+    return incident_cis, assignments
+
+
+def get_incident_joins(data: Dict[str, Any]) -> IncidentJoins:
+    """Return the join cache for data, building or rebuilding it when needed."""
+    tables = _tables(data)
+    if tables is None:
+        return IncidentJoins({}, {})
+    key = (id(tables[0]), id(tables[1]))
+    with _JOINS_LOCK:
+        entry = _JOINS.get(key)
+        if entry is not None and entry[0][0] is tables[0] and entry[0][1] is tables[1]:
+            _JOINS.move_to_end(key)
+        else:
+            entry = None
+    if entry is None:
+        joins = IncidentJoins(*tables)
+        with _JOINS_LOCK:
+            _JOINS[key] = (tables, joins)
+            while len(_JOINS) > MAX_JOINS:
+                _JOINS.popitem(last=False)
+        return joins
+    joins = entry[1]
+    if not joins.is_current():
+        joins.rebuild()
+    return joins
+
+
+def incident_links_changed(data: Dict[str, Any]) -> None:
+    """Call after updating an incident_configuration_items or ci_client_assignments row in place."""
+    tables = _tables(data)
+    if tables is None:
+        return
+    with _JOINS_LOCK:
+        entry = _JOINS.get((id(tables[0]), id(tables[1])))
+    if entry is not None and entry[0][0] is tables[0] and entry[0][1] is tables[1]:
+        entry[1].rebuild()
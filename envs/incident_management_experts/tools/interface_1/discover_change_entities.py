@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverChangeEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover change and rollback request entities.
         
@@ -43,11 +51,18 @@ class DiscoverChangeEntities(Tool):
             else:
                 results.append({**entity_data, id_field: str(entity_id)})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -67,6 +82,18 @@ class DiscoverChangeEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For change_requests, filters are: change_id (string), change_code (string), incident_id (string), title (string), change_type (enum: 'emergency', 'standard', 'normal'), requested_by_id (string), approved_by_id (string), risk_level (enum: 'high', 'medium', 'low'), scheduled_start (timestamp), scheduled_end (timestamp), actual_start (timestamp), actual_end (timestamp), status (enum: 'requested', 'approved', 'scheduled', 'in_progress', 'completed', 'failed', 'rolled_back'), created_at (timestamp). For rollback_requests, filters are: rollback_id (string), rollback_code (string), change_id (string), incident_id (string), requested_by_id (string), approved_by_id (string), executed_at (timestamp), validation_completed (boolean: True/False), status (enum: 'requested', 'approved', 'in_progress', 'completed', 'failed'), created_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
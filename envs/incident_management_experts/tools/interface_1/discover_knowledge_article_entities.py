@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverKnowledgeArticleEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover knowledge base article entities.
         
@@ -40,11 +48,18 @@ class DiscoverKnowledgeArticleEntities(Tool):
             else:
                 results.append({**entity_data, "article_id": str(entity_id)})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -64,6 +79,18 @@ class DiscoverKnowledgeArticleEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For knowledge_base_articles, filters are: article_id (string), incident_id (string), title (string), article_type (enum: 'troubleshooting', 'resolution_steps', 'prevention_guide', 'faq'), created_by_id (string), reviewed_by_id (string), category (enum: 'authentication_issues', 'payment_processing', 'api_integration', 'data_synchronization', 'system_outages', 'performance_degradation', 'security_incidents', 'backup_recovery', 'user_management', 'billing_issues', 'compliance_procedures', 'vendor_escalations', 'configuration_changes', 'monitoring_alerts', 'network_connectivity', 'database_issues', 'file_transfer_problems', 'reporting_errors', 'mobile_app_issues', 'browser_compatibility', 'third_party_integrations', 'scheduled_maintenance', 'emergency_procedures', 'client_onboarding', 'account_provisioning', 'sla_management', 'incident_response', 'change_management', 'capacity_planning', 'disaster_recovery'), view_count (int), status (enum: 'draft', 'published', 'archived'), created_at (timestamp), updated_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
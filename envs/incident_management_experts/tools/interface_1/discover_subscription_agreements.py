@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class DiscoverSubscriptionAgreements(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover subscription and SLA agreement entities.
         
@@ -44,11 +52,18 @@ class DiscoverSubscriptionAgreements(Tool):
             else:
                 results.append({**entity_data, id_field: str(entity_id)})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -68,6 +83,18 @@ class DiscoverSubscriptionAgreements(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For client_subscriptions, filters are: subscription_id (string), client_id (string), product_id (string), subscription_type (enum: 'full_service', 'limited_service', 'trial', 'custom'), start_date (date YYYY-MM-DD), end_date (date YYYY-MM-DD), sla_tier (enum: 'premium', 'standard', 'basic'), rto_hours (integer), status (enum: 'active', 'expired', 'cancelled', 'suspended'), created_at (timestamp), updated_at (timestamp). For sla_agreements, filters are: sla_id (string), subscription_id (string), severity_level (enum: 'P1', 'P2', 'P3', 'P4'), response_time_minutes (integer), resolution_time_hours (integer), availability_percentage (decimal), created_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
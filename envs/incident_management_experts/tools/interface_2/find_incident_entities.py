@@ -1,11 +1,19 @@
 import json
 from typing import Any, Dict, List
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.entity_pages import paginate
 
 
 class FindIncidentEntities(Tool):
     @staticmethod
-    def invoke(data: Dict[str, Any], entity_type: str, filters: Dict[str, Any] = None) -> str:
+    def invoke(
+        data: Dict[str, Any],
+        entity_type: str,
+        filters: Dict[str, Any] = None,
+        limit: int = None,
+        offset: int = None,
+        cursor: str = None
+    ) -> str:
         """
         Discover incident-related entities.
         
@@ -50,11 +58,18 @@ class FindIncidentEntities(Tool):
             else:
                 results.append({**entity_data, id_field: str(entity_id)})
         
+        try:
+            page = paginate(results, limit, offset, cursor)
+        except ValueError as e:
+            return json.dumps({
+                "success": False,
+                "error": str(e)
+            })
+        
         return json.dumps({
             "success": True,
             "entity_type": entity_type,
-            "count": len(results),
-            "results": results
+            **page
         })
     
     @staticmethod
@@ -74,6 +89,18 @@ class FindIncidentEntities(Tool):
                         "filters": {
                             "type": "object",
                             "description": "Optional filters as JSON object with key-value pairs. SYNTAX: {\"key\": \"value\"} for single filter, {\"key1\": \"value1\", \"key2\": \"value2\"} for multiple filters (AND logic). RULES: Exact matches only, dates as YYYY-MM-DD and booleans as True/False. For incidents, filters are: incident_id (string), incident_code (string), title (string), reporter_id (string), assigned_manager_id (string), client_id (string), component_id (string), severity (enum: 'P1', 'P2', 'P3', 'P4'), status (enum: 'open', 'in_progress', 'resolved', 'closed'), impact (enum: 'critical', 'high', 'medium', 'low'), urgency (enum: 'critical', 'high', 'medium', 'low'), category (enum: 'system_outage', 'performance_degradation', 'security_incident', 'data_corruption', 'integration_failure', 'network_issue', 'hardware_failure', 'software_bug', 'configuration_error', 'capacity_issue', 'backup_failure', 'authentication_failure', 'api_error', 'database_issue', 'service_unavailable'), detection_source (enum: 'client_reported', 'internally_detected', 'monitoring_alert', 'vendor_reported', 'scheduled_maintenance', 'emergency_maintenance'), detected_at (timestamp), resolved_at (timestamp), closed_at (timestamp), rto_breach (boolean: True/False), sla_breach (boolean: True/False), is_recurring (boolean: True/False), downtime_minutes (int), created_at (timestamp), updated_at (timestamp). For incident_reports, filters are: report_id (string), incident_id (string), report_type (enum: 'executive_summary', 'technical_details', 'business_impact', 'compliance_report', 'post_mortem'), generated_by_id (string), generated_at (timestamp), status (enum: 'draft', 'completed', 'distributed'), created_at (timestamp). For post_incident_reviews, filters are: pir_id (string), incident_id (string), scheduled_date (timestamp), facilitator_id (string), timeline_accuracy_rating (int), communication_effectiveness_rating (int), technical_response_rating (int), status (enum: 'scheduled', 'completed', 'cancelled'), created_at (timestamp)"
+                        },
+                        "limit": {
+                            "type": "integer",
+                            "description": "Optional: maximum number of results to return. When limit, offset or cursor is given, the response also includes total_count, offset and next_cursor."
+                        },
+                        "offset": {
+                            "type": "integer",
+                            "description": "Optional: number of matching results to skip before the first returned result. Defaults to 0. Cannot be combined with cursor."
+                        },
+                        "cursor": {
+                            "type": "string",
+                            "description": "Optional: next_cursor value from a previous response, to fetch the following page."
                         }
                     },
                     "required": ["entity_type"]
@@ -1,7 +1,9 @@
 import json
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional
 from datetime import datetime, timezone
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.incident_joins import get_incident_joins
+from tau_bench.envs.timestamp_columns import get_table_timestamps
 
 class AcquireSlaBreachIncidents(Tool):
     @staticmethod
@@ -109,8 +111,6 @@ class AcquireSlaBreachIncidents(Tool):
         incidents_data = data.get("incidents", {})
         sla_agreements_data = data.get("sla_agreements", {})
         users_data = data.get("users", {})
-        incident_cis_data = data.get("incident_configuration_items", {})
-        ci_assignments_data = data.get("ci_client_assignments", {})
         
         # Build client_id to active SLA mapping for efficient lookup
         client_sla_map = {}
@@ -128,47 +128,10 @@ class AcquireSlaBreachIncidents(Tool):
         
         breach_incidents = []
         
-        # Helper function to parse ISO datetime with timezone handling
-        def parse_datetime(dt_str: Optional[str]) -> Optional[datetime]:
-            if not dt_str:
-                return None
-            try:
-                # Handle 'Z' UTC indicator
-                if dt_str.endswith('Z'):
-                    dt_str = dt_str[:-1] + '+00:00'
-                dt = datetime.fromisoformat(dt_str)
-                # Ensure timezone aware
-                if dt.tzinfo is None:
-                    dt = dt.replace(tzinfo=timezone.utc)
-                return dt
-            except (ValueError, AttributeError):
-                return None
-        
-        # Helper function to get all client IDs affected by an incident
-        # Uses the proper relationship chain: incident → incident_cis → ci_assignments → clients
-        def get_incident_client_ids(incident_id: str) -> Set[str]:
-            """
-            Get all client IDs affected by this incident through CI assignments.
-            Relationship: incidents → incident_configuration_items → ci_client_assignments → clients
-            """
-            client_ids = set()
-            
-            # Find all CIs linked to this incident
-            incident_ci_ids = set()
-            for ici_id, ici in incident_cis_data.items():
-                if ici.get("incident_id") == incident_id:
-                    ci_id = ici.get("ci_id")
-                    if ci_id:
-                        incident_ci_ids.add(ci_id)
-            
-            # Find all clients assigned to these CIs
-            for assignment_id, assignment in ci_assignments_data.items():
-                if assignment.get("ci_id") in incident_ci_ids:
-                    client_id_value = assignment.get("client_id")
-                    if client_id_value:
-                        client_ids.add(client_id_value)
-            
-            return client_ids
+        # Incident -> client mappings and parsed timestamps, shared across calls
+        # Relationship: incidents → incident_configuration_items → ci_client_assignments → clients
+        joins = get_incident_joins(data)
+        timestamps = get_table_timestamps(data, "incidents")
         
         # Process each incident
         for incident_id, incident in incidents_data.items():
@@ -181,7 +144,7 @@ class AcquireSlaBreachIncidents(Tool):
             if not detection_time_str:
                 continue  # Skip incidents without detection_time
             
-            incident_detection_dt = parse_datetime(detection_time_str)
+            incident_detection_dt = timestamps.get(incident_id, "detection_time")
             if not incident_detection_dt:
                 continue  # Skip invalid datetime format
             
@@ -192,7 +155,7 @@ class AcquireSlaBreachIncidents(Tool):
                 continue
             
             # Get all client IDs affected by this incident through CI assignments
-            incident_client_ids = get_incident_client_ids(incident_id)
+            incident_client_ids = joins.client_ids(incident_id)
             if not incident_client_ids:
                 continue  # Skip incidents with no client assignments
             
@@ -231,7 +194,7 @@ class AcquireSlaBreachIncidents(Tool):
                 acknowledged_at_str = incident.get("acknowledged_at")
                 
                 if acknowledged_at_str:
-                    acknowledged_at_dt = parse_datetime(acknowledged_at_str)
+                    acknowledged_at_dt = timestamps.get(incident_id, "acknowledged_at")
                     if acknowledged_at_dt:
                         actual_response_minutes = (acknowledged_at_dt - incident_detection_dt).total_seconds() / 60
                         if actual_response_minutes > expected_response_minutes:
@@ -243,7 +206,9 @@ class AcquireSlaBreachIncidents(Tool):
                 resolved_at_str = incident.get("resolved_at") or incident.get("closed_at")
                 
                 if resolved_at_str:
-                    resolved_at_dt = parse_datetime(resolved_at_str)
+                    resolved_at_dt = timestamps.get(
+                        incident_id, "resolved_at" if incident.get("resolved_at") else "closed_at"
+                    )
                     if resolved_at_dt:
                         actual_resolution_minutes = (resolved_at_dt - incident_detection_dt).total_seconds() / 60
                         if actual_resolution_minutes > expected_resolution_minutes:
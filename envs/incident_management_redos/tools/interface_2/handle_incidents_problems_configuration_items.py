@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.incident_joins import incident_links_changed
 
 
 class HandleIncidentsProblemsConfigurationItems(Tool):
@@ -211,6 +212,7 @@ class HandleIncidentsProblemsConfigurationItems(Tool):
                 updated_association[key] = value
             
             associations[association_id] = updated_association
+            incident_links_changed(data)
             return json.dumps({
                 "success": True,
                 "action": "update",
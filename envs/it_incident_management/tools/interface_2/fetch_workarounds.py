@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime, timezone
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class FetchWorkarounds(Tool):
     @staticmethod
@@ -25,7 +26,7 @@ class FetchWorkarounds(Tool):
                 s = ts.strip()
                 if s.endswith("Z"):
                     s = s[:-1] + "+00:00"
-                dt = datetime.fromisoformat(s)
+                dt = cached_fromisoformat(s)
                 if dt.tzinfo is None:
                     return dt.replace(tzinfo=timezone.utc)
                 return dt.astimezone(timezone.utc)
@@ -1,7 +1,7 @@
 import json
 from typing import Any, Dict
-from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class ModifyClientSubscription(Tool):
     @staticmethod
@@ -21,7 +21,7 @@ class ModifyClientSubscription(Tool):
             # Helper kept inside invoke per requirement
             def is_iso_date(d: str) -> bool:
                 try:
-                    datetime.fromisoformat(d)
+                    cached_fromisoformat(d)
                     return True
                 except Exception:
                     return False
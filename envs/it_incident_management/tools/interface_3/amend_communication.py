@@ -1,7 +1,7 @@
 import json
 from typing import Any, Dict
-from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class AmendCommunication(Tool):
     @staticmethod
@@ -20,7 +20,7 @@ class AmendCommunication(Tool):
             # Helper inside invoke per requirement
             def is_iso(ts: str) -> bool:
                 try:
-                    datetime.fromisoformat(ts.replace("Z", "+00:00"))
+                    cached_fromisoformat(ts.replace("Z", "+00:00"))
                     return True
                 except Exception:
                     return False
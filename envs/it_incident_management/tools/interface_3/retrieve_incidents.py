@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class RetrieveIncidents(Tool):
     @staticmethod
@@ -39,7 +40,7 @@ class RetrieveIncidents(Tool):
                 if not ts:
                     return None
                 s = ts.strip().replace("Z", "+00:00")
-                return datetime.fromisoformat(s)
+                return cached_fromisoformat(s)
 
             # Pre-parse time bounds
             ds = parse_iso(detected_since)
@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional, List
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class QueryCommunications(Tool):
     @staticmethod
@@ -22,7 +23,7 @@ class QueryCommunications(Tool):
                 if not ts:
                     return None
                 ts_local = ts.replace("Z", "+00:00")
-                return datetime.fromisoformat(ts_local)
+                return cached_fromisoformat(ts_local)
 
             comms: Dict[str, Any] = data.get("communications", {})
             results: List[Dict[str, Any]] = []
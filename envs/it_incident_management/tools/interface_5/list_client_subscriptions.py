@@ -1,7 +1,7 @@
 import json
 from typing import Any, Dict
-from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class ListClientSubscriptions(Tool):
     @staticmethod
@@ -22,7 +22,7 @@ class ListClientSubscriptions(Tool):
         # Local, strict YYYY-MM-DD parser (no ISO datetimes)
         def parse_ymd(s: str):
             try:
-                return datetime.strptime(s.strip(), "%Y-%m-%d").date()
+                return cached_strptime(s.strip(), "%Y-%m-%d").date()
             except Exception:
                 raise ValueError(f"Expected YYYY-MM-DD, got {s!r}")
 
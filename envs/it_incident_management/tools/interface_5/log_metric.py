@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, Optional
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class LogMetric(Tool):
     @staticmethod
@@ -17,7 +18,7 @@ class LogMetric(Tool):
             if not ts:
                 return None
             ts_local = ts.replace("Z", "+00:00")
-            return datetime.fromisoformat(ts_local)
+            return cached_fromisoformat(ts_local)
 
         def generate_id(table: Dict[str, Any]) -> str:
             if not table:
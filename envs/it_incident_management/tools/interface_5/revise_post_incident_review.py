@@ -1,7 +1,7 @@
 import json
 from typing import Any, Dict
-from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_fromisoformat
 
 class RevisePostIncidentReview(Tool):
     @staticmethod
@@ -20,7 +20,7 @@ class RevisePostIncidentReview(Tool):
             # Local ISO validator (accepts trailing 'Z')
             def is_iso(ts: str) -> bool:
                 try:
-                    datetime.fromisoformat(ts.strip().replace("Z", "+00:00"))
+                    cached_fromisoformat(ts.strip().replace("Z", "+00:00"))
                     return True
                 except Exception:
                     return False
@@ -0,0 +1,219 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Maintained parent -> children index over the "pages" table shared by the wiki
+# environments. Hierarchy tools read it instead of rescanning every page, and
+# tools that create, move or delete pages keep it current through page_added(),
+# page_moved() and page_removed().
+
+# id(pages table) -> (pages table, PageHierarchy). The table itself is kept in
+# the entry so its id cannot be reused while the entry is alive. Trials run in
+# thread pools share the cache, so every lookup and update holds _INDEXES_LOCK.
+_INDEXES: "OrderedDict[int, Any]" = OrderedDict()
+_INDEXES_LOCK = threading.Lock()
+MAX_INDEXES = 32
+
+
+def _parent_key(page: Any) -> Optional[str]:
+    if not isinstance(page, dict):
+        return None
+    parent_id = page.get("parent_page_id")
+    return str(parent_id) if parent_id is not None else None
+
+
+class PageHierarchy:
+    def __init__(self, pages: Dict[str, Any]) -> None:
+        self.pages = pages
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        self.parent: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        # Position of each page in table order; child lists are kept sorted by
+        # it so traversals return pages in the same order as a table scan.
+        self.rank: Dict[str, int] = {}
+        self.next_rank = 0
+        self.ancestor_cache: Dict[str, List[str]] = {}
+        for page_id in self.pages:
+            self._insert(page_id)
+
+    @property
+    def size(self) -> int:
+        return len(self.parent)
+
+    def _insert(self, page_id: str) -> None:
+        self.rank[page_id] = self.next_rank
+        self.next_rank += 1
+        parent_id = _parent_key(self.pages.get(page_id))
+        self.parent[page_id] = parent_id
+        if parent_id is not None:
+            self.children.setdefault(parent_id, []).append(page_id)
+
+    def _detach(self, page_id: str) -> None:
+        parent_id = self.parent.get(page_id)
+        siblings = self.children.get(parent_id) if parent_id is not None else None
+        if siblings and page_id in siblings:
+            siblings.remove(page_id)
+
+    def _attach(self, page_id: str, parent_id: Optional[str]) -> None:
+        self.parent[page_id] = parent_id
+        if parent_id is None:
+            return
+        siblings = self.children.setdefault(parent_id, [])
+        rank = self.rank[page_id]
+        position = len(siblings)
+        while position > 0 and self.rank[siblings[position - 1]] > rank:
+            position -= 1
+        siblings.insert(position, page_id)
+
+    def add(self, page_id: str) -> None:
+        page_id = str(page_id)
+        if page_id in self.parent:
+            self.move(page_id)
+        else:
+            self._insert(page_id)
+
+    def move(self, page_id: str) -> None:
+        """Re-read the parent of a page after its parent_page_id was changed."""
+        page_id = str(page_id)
+        if page_id not in self.parent:
+            self.add(page_id)
+            return
+        parent_id = _parent_key(self.pages.get(page_id))
+        if parent_id != self.parent[page_id]:
+            self._detach(page_id)
+            self._attach(page_id, parent_id)
+            self.ancestor_cache.clear()
+
+    def remove(self, page_id: str) -> None:
+        page_id = str(page_id)
+        if page_id not in self.parent:
+            return
+        self._detach(page_id)
+        del self.parent[page_id]
+        del self.rank[page_id]
+        self.ancestor_cache.clear()
+
+    def is_current(self) -> bool:
+        return len(self.pages) == self.size
+
+    def _verified_children(self, page_id: str) -> List[str]:
+        """
+        Children of page_id, rebuilding the index first if one of them was
+        moved away or deleted without going through the hooks.
+        """
+        children = self.children.get(page_id, ())
+        for child_id in children:
+            if _parent_key(self.pages.get(child_id)) != page_id:
+                self.rebuild()
+                return list(self.children.get(page_id, ()))
+        return list(children)
+
+    def child_ids(self, page_id: str) -> List[str]:
+        """Direct children of page_id (which need not exist), in table order."""
+        return self._verified_children(str(page_id))
+
+    def has_children(self, page_id: str) -> bool:
+        return bool(self._verified_children(str(page_id)))
+
+    def descendant_ids(self, page_id: str) -> List[str]:
+        """All descendants of page_id in depth-first, table order; each page appears once."""
+        result: List[str] = []
+        visited = set()
+        stack = [iter(self._verified_children(str(page_id)))]
+        while stack:
+            child_id = next(stack[-1], None)
+            if child_id is None:
+                stack.pop()
+                continue
+            if child_id in visited:
+                continue
+            visited.add(child_id)
+            result.append(child_id)
+            stack.append(iter(self._verified_children(child_id)))
+        return result
+
+    def _walk_ancestors(self, page_id: str) -> List[str]:
+        chain: List[str] = []
+        visited = {page_id}
+        parent_id = self.parent.get(page_id)
+        while parent_id is not None and parent_id not in visited and isinstance(self.pages.get(parent_id), dict):
+            chain.append(parent_id)
+            visited.add(parent_id)
+            parent_id = self.parent.get(parent_id)
+        return chain
+
+    def _chain_is_current(self, page_id: str, chain: List[str]) -> bool:
+        for child_id in [page_id] + chain:
+            if _parent_key(self.pages.get(child_id)) != self.parent.get(child_id):
+                return False
+        return True
+
+    def ancestor_ids(self, page_id: str) -> List[str]:
+        """Existing ancestors of page_id from its parent up to the root (cached)."""
+        page_id = str(page_id)
+        chain = self.ancestor_cache.get(page_id)
+        if chain is not None and self._chain_is_current(page_id, chain):
+            return list(chain)
+        chain = self._walk_ancestors(page_id)
+        if not self._chain_is_current(page_id, chain):
+            # A page on the chain was moved without page_moved()
+            self.rebuild()
+            chain = self._walk_ancestors(page_id)
+        self.ancestor_cache[page_id] = chain
+        return list(chain)
+
+
+def _lookup(pages: Any) -> Optional[PageHierarchy]:
+    with _INDEXES_LOCK:
+        entry = _INDEXES.get(id(pages))
+    if entry is None or entry[0] is not pages:
+        return None
+    return entry[1]
+
+
+def get_page_hierarchy(data: Dict[str, Any]) -> PageHierarchy:
+    """
+    Return the hierarchy index of data["pages"], building it on first use.
+
+    The index is rebuilt if the table size no longer matches, which covers
+    pages inserted or deleted by tools that do not call the hooks below.
+    """
+    pages = data.get("pages")
+    if not isinstance(pages, dict):
+        return PageHierarchy({})
+    index = _lookup(pages)
+    if index is None or not index.is_current():
+        # Built outside the lock; only the cache update is serialized
+        index = PageHierarchy(pages)
+        with _INDEXES_LOCK:
+            _INDEXES[id(pages)] = (pages, index)
+            while len(_INDEXES) > MAX_INDEXES:
+                _INDEXES.popitem(last=False)
+        return index
+    with _INDEXES_LOCK:
+        if id(pages) in _INDEXES:
+            _INDEXES.move_to_end(id(pages))
+    return index
+
+
+def page_added(data: Dict[str, Any], page_id: str) -> None:
+    """Call after inserting data["pages"][page_id]."""
+    index = _lookup(data.get("pages"))
+    if index is not None:
+        index.add(page_id)
+
+
+def page_moved(data: Dict[str, Any], page_id: str) -> None:
+    """Call after changing the parent_page_id of data["pages"][page_id]."""
+    index = _lookup(data.get("pages"))
+    if index is not None:
+        index.move(page_id)
+
+
+def page_removed(data: Dict[str, Any], page_id: str) -> None:
+    """Call after deleting data["pages"][page_id]."""
+    index = _lookup(data.get("pages"))
+    if index is not None:
+        index.remove(page_id)
@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional
 from datetime import datetime
 import calendar
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class FetchHistoricalEnergyConsumptionByHome(Tool):
     @staticmethod
@@ -44,7 +45,7 @@ class FetchHistoricalEnergyConsumptionByHome(Tool):
 
                 for r in filtered:
                     try:
-                        r_date = datetime.strptime(r["date"], "%Y-%m-%d")
+                        r_date = cached_strptime(r["date"], "%Y-%m-%d")
                         if r_date.month == month and r_date.year == year:
                             device_id = r["device_id"]
                             if device_id not in device_map:
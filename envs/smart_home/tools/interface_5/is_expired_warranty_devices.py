@@ -2,6 +2,7 @@ import json
 from typing import Any, Dict, List, Optional
 from datetime import datetime
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 
 class IsExpiredWarrantyDevices(Tool):
@@ -36,7 +37,7 @@ class IsExpiredWarrantyDevices(Tool):
 
             insurance_str = device.get("insurance_expiry_date")
             try:
-                insurance_date = datetime.strptime(insurance_str, "%Y-%m-%d").date()
+                insurance_date = cached_strptime(insurance_str, "%Y-%m-%d").date()
                 is_expired = insurance_date < current_date_obj
             except Exception:
                 is_expired = True  # treat invalid date as expired
@@ -3,6 +3,7 @@ from typing import Any, Dict, Optional
 from datetime import datetime
 import calendar
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 
 class RetrieveHistoricalEnergyConsumptionByDevice(Tool):
     @staticmethod
@@ -49,7 +50,7 @@ class RetrieveHistoricalEnergyConsumptionByDevice(Tool):
 
                 for r in filtered:
                     try:
-                        r_date = datetime.strptime(r["date"], "%Y-%m-%d")
+                        r_date = cached_strptime(r["date"], "%Y-%m-%d")
                         if r_date.month == month and r_date.year == year:
                             if r_date.day == 1:
                                 first_val = r["power_used_kWh"]
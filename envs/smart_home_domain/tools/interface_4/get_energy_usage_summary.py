@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.timestamp_columns import cached_strptime
 from datetime import datetime
 
 class GetEnergyUsageSummary(Tool):
@@ -159,7 +160,7 @@ class GetEnergyUsageSummary(Tool):
             effective_until = tariff.get("effective_until")
 
             try:
-                effective_from_obj = datetime.strptime(effective_from, "%Y-%m-%d")
+                effective_from_obj = cached_strptime(effective_from, "%Y-%m-%d")
 
                 # Check if target_date is within the tariff's validity period
                 if target_date_obj >= effective_from_obj:
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Parsed timestamp columns shared by the tools. Rows keep their raw strings;
+# parsing goes through cached_fromisoformat() / cached_strptime(), so the same
+# value is parsed once per process no matter how many rows, calls or
+# replayed actions see it. TableTimestamps adds a per-record view of a
+# column for tools that walk a whole table by id.
+
+TIMESTAMP_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def cached_fromisoformat(value: str) -> datetime:
+    """datetime.fromisoformat(value), memoized. Raises the same errors."""
+    return datetime.fromisoformat(value)
+
+
+@lru_cache(maxsize=TIMESTAMP_CACHE_SIZE)
+def cached_strptime(value: str, fmt: str) -> datetime:
+    """datetime.strptime(value, fmt), memoized. Raises the same errors."""
+    return datetime.strptime(value, fmt)
+
+
+def parse_timestamp(value: Any) -> Optional[datetime]:
+    """Parse an ISO timestamp ('Z' allowed) as an aware datetime; naive values are taken as UTC."""
+    if not value:
+        return None
+    try:
+        if value.endswith('Z'):
+            value = value[:-1] + '+00:00'
+        parsed = cached_fromisoformat(value)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+    except (ValueError, AttributeError, TypeError):
+        return None
+
+
+def to_epoch(value: Optional[datetime]) -> Optional[int]:
+    """Whole seconds since the epoch; naive datetimes are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+class TableTimestamps:
+    """
+    Lazily parsed timestamp columns of one table.
+
+    Each cached value remembers the raw string it was parsed from and is
+    re-parsed when the row changes, so updates made by other tools are
+    always picked up.
+    """
+
+    def __init__(self, table: Dict[str, Any], parser: Callable[[Any], Any]) -> None:
+        self.table = table
+        self.parser = parser
+        # field -> {record_id: (raw value, parsed value)}
+        self.columns: Dict[str, Dict[Any, Tuple[Any, Any]]] = {}
+
+    def get(self, record_id: Any, field: str) -> Any:
+        record = self.table.get(record_id)
+        raw = record.get(field) if isinstance(record, dict) else None
+        column = self.columns.setdefault(field, {})
+        cached = column.get(record_id)
+        if cached is not None and cached[0] == raw:
+            return cached[1]
+        parsed = self.parser(raw)
+        column[record_id] = (raw, parsed)
+        return parsed
+
+    def epoch(self, record_id: Any, field: str) -> Optional[int]:
+        return to_epoch(self.get(record_id, field))
+
+
+# (id(table), parser) -> (table, TableTimestamps). The table is kept in the
+# entry so its id cannot be reused while the entry is alive. Trials run in
+# thread pools share the cache, so it is only touched under _TABLES_LOCK.
+_TABLES: "OrderedDict[Tuple[int, Any], Any]" = OrderedDict()
+_TABLES_LOCK = threading.Lock()
+MAX_TABLES = 64
+
+
+def get_table_timestamps(
+    data: Dict[str, Any], table_name: str, parser: Callable[[Any], Any] = parse_timestamp
+) -> TableTimestamps:
+    """Return the parsed timestamp view of data[table_name]."""
+    table = data.get(table_name)
+    if not isinstance(table, dict):
+        return TableTimestamps({}, parser)
+    key = (id(table), parser)
+    with _TABLES_LOCK:
+        entry = _TABLES.get(key)
+        if entry is None or entry[0] is not table:
+            entry = (table, TableTimestamps(table, parser))
+            _TABLES[key] = entry
+            while len(_TABLES) > MAX_TABLES:
+                _TABLES.popitem(last=False)
+        _TABLES.move_to_end(key)
+    return entry[1]
@@ -2,9 +2,14 @@
 
 import abc
 import enum
-from litellm import completion
+import json
+import asyncio
+import hashlib
+import threading
+import weakref
+from litellm import completion, acompletion
 
-from typing import Optional, List, Dict, Any, Union
+from typing import Optional, List, Dict, Any, Tuple, Union
 
 
 class BaseUserSimulationEnv(abc.ABC):
@@ -34,23 +39,145 @@ class HumanUserSimulationEnv(BaseUserSimulationEnv):
         return 0
 
 
+# Providers that only reuse a cached prompt prefix when it is marked. OpenAI
+# style providers cache a repeated prefix on their own; the simulators keep
+# it byte-identical by building the system prompt once per episode and only
+# ever appending to the history.
+PROMPT_CACHE_PROVIDERS = {"anthropic", "bedrock", "vertex_ai"}
+
+
+def with_prompt_cache_hint(
+    messages: List[Dict[str, Any]], provider: Optional[str]
+) -> List[Dict[str, Any]]:
+    if (
+        provider not in PROMPT_CACHE_PROVIDERS
+        or not messages
+        or messages[0].get("role") != "system"
+        or not isinstance(messages[0].get("content"), str)
+    ):
+        return messages
+    system = {
+        "role": "system",
+        "content": [
+            {
+                "type": "text",
+                "text": messages[0]["content"],
+                "cache_control": {"type": "ephemeral"},
+            }
+        ],
+    }
+    return [system] + messages[1:]
+
+
+class UserResponseCache(object):
+    """
+    Simulated user replies keyed on the model, provider and full message
+    history, so replaying an evaluation with the same agent turns sends no
+    requests. With a path, entries are appended to a JSONL file and loaded
+    again by the next run.
+    """
+
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        if path is not None:
+            try:
+                with open(path, "r") as file:
+                    for line in file:
+                        if line.strip():
+                            entry = json.loads(line)
+                            self.entries[entry["key"]] = entry["message"]
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def key(model: str, provider: Optional[str], messages: List[Dict[str, Any]]) -> str:
+        history = json.dumps([model, provider, messages], sort_keys=True, default=str)
+        return hashlib.sha256(history.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self.lock:
+            return self.entries.get(key)
+
+    def put(self, key: str, message: Dict[str, Any]) -> None:
+        with self.lock:
+            self.entries[key] = message
+            if self.path is not None:
+                with open(self.path, "a") as file:
+                    file.write(json.dumps({"key": key, "message": message}, default=str) + "\n")
+
+
 class LLMUserSimulationEnv(BaseUserSimulationEnv):
-    def __init__(self, model: str, provider: str) -> None:
+    response_cache: Optional[UserResponseCache] = None
+
+    def __init__(
+        self,
+        model: str,
+        provider: str,
+        response_cache: Optional[UserResponseCache] = None,
+    ) -> None:
         super().__init__()
         self.messages: List[Dict[str, Any]] = []
         self.model = model
         self.provider = provider
-        self.total_cost = 0.0
+        self.response_cache = response_cache
         self.reset()
 
-    def generate_next_message(self, messages: List[Dict[str, Any]]) -> str:
+    def start_episode(self) -> None:
+        """Zero the episode's cost and token counts; called by every reset."""
+        self.total_cost = 0.0
+        self.usage = {
+            "requests": 0,
+            "cache_hits": 0,
+            "prompt_tokens": 0,
+            "cached_prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def cached_message(
+        self, messages: List[Dict[str, Any]]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        if self.response_cache is None:
+            return None, None
+        key = self.response_cache.key(self.model, self.provider, messages)
+        message = self.response_cache.get(key)
+        if message is not None:
+            self.usage["cache_hits"] += 1
+        return key, message
+
+    def record_response(self, res: Any, key: Optional[str]) -> Dict[str, Any]:
+        message = res.choices[0].message.model_dump()
+        self.usage["requests"] += 1
+        usage = getattr(res, "usage", None)
+        if usage is not None:
+            self.usage["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            self.usage["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+            details = getattr(usage, "prompt_tokens_details", None)
+            cached = getattr(details, "cached_tokens", None) or getattr(
+                usage, "cache_read_input_tokens", 0
+            )
+            self.usage["cached_prompt_tokens"] += cached or 0
+        self.total_cost += res._hidden_params.get("response_cost") or 0.0
+        if key is not None:
+            self.response_cache.put(key, message)
+        return message
+
+    def complete(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        key, message = self.cached_message(messages)
+        if message is not None:
+            return message
         res = completion(
-            model=self.model, custom_llm_provider=self.provider, messages=messages
+            model=self.model,
+            custom_llm_provider=self.provider,
+            messages=with_prompt_cache_hint(messages, self.provider),
         )
-        message = res.choices[0].message
-        self.messages.append(message.model_dump())
-        self.total_cost = res._hidden_params["response_cost"]
-        return message.content
+        return self.record_response(res, key)
+
+    def generate_next_message(self, messages: List[Dict[str, Any]]) -> str:
+        message = self.complete(messages)
+        self.messages.append(message)
+        return message["content"]
 
     def build_system_prompt(self, instruction: Optional[str]) -> str:
         instruction_display = (
@@ -68,6 +195,7 @@ Rules:
 - Try to make the conversation as natural as possible, and stick to the personalities in the instruction."""
 
     def reset(self, instruction: Optional[str] = None) -> str:
+        self.start_episode()
         self.messages = [
             {
                 "role": "system",
@@ -84,10 +212,18 @@ Rules:
     def get_total_cost(self) -> float:
         return self.total_cost
 
+    def get_usage(self) -> Dict[str, Any]:
+        return dict(self.usage, cost=self.total_cost)
+
 
 class ReactUserSimulationEnv(LLMUserSimulationEnv):
-    def __init__(self, model: str, provider: str) -> None:
-        super().__init__(model=model, provider=provider)
+    def __init__(
+        self,
+        model: str,
+        provider: str,
+        response_cache: Optional[UserResponseCache] = None,
+    ) -> None:
+        super().__init__(model=model, provider=provider, response_cache=response_cache)
         self.reset()
 
     def build_system_prompt(self, instruction: Optional[str]) -> str:
@@ -115,15 +251,12 @@ User Response:
 <the user response (this will be parsed and sent to the agent)>"""
 
     def generate_next_message(self, messages: List[Dict[str, Any]]) -> str:
-        res = completion(
-            model=self.model, custom_llm_provider=self.provider, messages=messages
-        )
-        message = res.choices[0].message
-        self.messages.append(message.model_dump())
-        self.total_cost = res._hidden_params["response_cost"]
-        return self.parse_response(message.content)
+        message = self.complete(messages)
+        self.messages.append(message)
+        return self.parse_response(message["content"])
 
     def reset(self, instruction: Optional[str] = None) -> str:
+        self.start_episode()
         self.messages = [
             {
                 "role": "system",
@@ -154,29 +287,39 @@ User Response:
 
 
 class VerifyUserSimulationEnv(LLMUserSimulationEnv):
-    def __init__(self, model: str, provider: str, max_attempts: int = 3) -> None:
+    def __init__(
+        self,
+        model: str,
+        provider: str,
+        max_attempts: int = 3,
+        response_cache: Optional[UserResponseCache] = None,
+    ) -> None:
         self.model = model
         self.provider = provider
         self.max_attempts = max_attempts
+        self.response_cache = response_cache
         self.reset()
 
     def generate_next_message(self, messages: List[Dict[str, Any]]) -> str:
         attempts = 0
         cur_message = None
         while attempts < self.max_attempts:
+            # Retries have to sample again, so they bypass the response cache
             res = completion(
-                model=self.model, custom_llm_provider=self.provider, messages=messages
+                model=self.model,
+                custom_llm_provider=self.provider,
+                messages=with_prompt_cache_hint(messages, self.provider),
             )
-            cur_message = res.choices[0].message
-            self.total_cost = res._hidden_params["response_cost"]
-            if verify(self.model, self.provider, cur_message, messages):
-                self.messages.append(cur_message.model_dump())
-                return cur_message.content
+            cur_message = self.record_response(res, None)
+            if verify(self.model, self.provider, cur_message["content"], messages):
+                self.messages.append(cur_message)
+                return cur_message["content"]
             attempts += 1
         assert cur_message is not None
-        return cur_message.content
+        return cur_message["content"]
 
     def reset(self, instruction: Optional[str] = None) -> str:
+        self.start_episode()
         self.messages = [
             {
                 "role": "system",
@@ -268,10 +411,17 @@ Response:
 
 
 class ReflectionUserSimulationEnv(LLMUserSimulationEnv):
-    def __init__(self, model: str, provider: str, max_attempts: int = 2) -> None:
+    def __init__(
+        self,
+        model: str,
+        provider: str,
+        max_attempts: int = 2,
+        response_cache: Optional[UserResponseCache] = None,
+    ) -> None:
         self.model = model
         self.provider = provider
         self.max_attempts = max_attempts
+        self.response_cache = response_cache
         self.reset()
 
     def generate_next_message(self, messages: List[Dict[str, Any]]) -> str:
@@ -292,6 +442,7 @@ class ReflectionUserSimulationEnv(LLMUserSimulationEnv):
         return initial_response
 
     def reset(self, instruction: Optional[str] = None) -> str:
+        self.start_episode()
         self.messages = [
             {
                 "role": "system",
@@ -309,6 +460,109 @@ class ReflectionUserSimulationEnv(LLMUserSimulationEnv):
         return self.total_cost
 
 
+class UserRequestPool(object):
+    """
+    Connection settings and concurrency limit shared by async user simulators.
+
+    litellm keeps one HTTP client per set of connection parameters, so every
+    simulator sending its requests through the same pool reuses the same
+    connections. At most max_concurrency requests are in flight at once per
+    event loop. api_base points the pool at an OpenAI-compatible server,
+    e.g. a local stub.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 64,
+        api_base: Optional[str] = None,
+        api_key: Optional[str] = None,
+    ) -> None:
+        self.max_concurrency = max_concurrency
+        self.api_base = api_base
+        self.api_key = api_key
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def completion(
+        self, model: str, provider: Optional[str], messages: List[Dict[str, Any]]
+    ) -> Any:
+        kwargs = {}
+        if self.api_base is not None:
+            kwargs["api_base"] = self.api_base
+        if self.api_key is not None:
+            kwargs["api_key"] = self.api_key
+        async with self.semaphore():
+            return await acompletion(
+                model=model, custom_llm_provider=provider, messages=messages, **kwargs
+            )
+
+
+DEFAULT_USER_REQUEST_POOL = UserRequestPool()
+
+
+class AsyncLLMUserSimulationEnv(LLMUserSimulationEnv):
+    """
+    LLMUserSimulationEnv with awaitable reset and step, for driving many
+    episodes from one event loop. Nothing is requested until reset is awaited.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        provider: str,
+        pool: Optional[UserRequestPool] = None,
+        response_cache: Optional[UserResponseCache] = None,
+    ) -> None:
+        self.messages: List[Dict[str, Any]] = []
+        self.model = model
+        self.provider = provider
+        self.pool = pool or DEFAULT_USER_REQUEST_POOL
+        self.response_cache = response_cache
+        self.start_episode()
+
+    async def agenerate_next_message(self, messages: List[Dict[str, Any]]) -> str:
+        key, message = self.cached_message(messages)
+        if message is None:
+            res = await self.pool.completion(
+                self.model, self.provider, with_prompt_cache_hint(messages, self.provider)
+            )
+            message = self.record_response(res, key)
+        self.messages.append(message)
+        return self.parse_response(message["content"])
+
+    def parse_response(self, response: str) -> str:
+        return response
+
+    async def reset(self, instruction: Optional[str] = None) -> str:
+        self.start_episode()
+        self.messages = [
+            {
+                "role": "system",
+                "content": self.build_system_prompt(instruction=instruction),
+            },
+            {"role": "user", "content": "Hi! How can I help you today?"},
+        ]
+        return await self.agenerate_next_message(self.messages)
+
+    async def step(self, content: str) -> str:
+        self.messages.append({"role": "user", "content": content})
+        return await self.agenerate_next_message(self.messages)
+
+
+class AsyncReactUserSimulationEnv(AsyncLLMUserSimulationEnv):
+    build_system_prompt = ReactUserSimulationEnv.build_system_prompt
+    parse_response = ReactUserSimulationEnv.parse_response
+
+
 class UserStrategy(enum.Enum):
     HUMAN = "human"
     LLM = "llm"
@@ -321,6 +575,7 @@ def load_user(
     user_strategy: Union[str, UserStrategy],
     model: Optional[str] = "gpt-4o",
     provider: Optional[str] = None,
+    response_cache: Optional[UserResponseCache] = None,
 ) -> BaseUserSimulationEnv:
     if isinstance(user_strategy, str):
         user_strategy = UserStrategy(user_strategy)
@@ -331,23 +586,55 @@ def load_user(
             raise ValueError("LLM user strategy requires a model")
         if provider is None:
             raise ValueError("LLM user strategy requires a model provider")
-        return LLMUserSimulationEnv(model=model, provider=provider)
+        return LLMUserSimulationEnv(
+            model=model, provider=provider, response_cache=response_cache
+        )
     elif user_strategy == UserStrategy.REACT:
         if model is None:
             raise ValueError("React user strategy requires a model")
         if provider is None:
             raise ValueError("React user strategy requires a model provider")
-        return ReactUserSimulationEnv(model=model, provider=provider)
+        return ReactUserSimulationEnv(
+            model=model, provider=provider, response_cache=response_cache
+        )
     elif user_strategy == UserStrategy.VERIFY:
         if model is None:
             raise ValueError("Verify user strategy requires a model")
         if provider is None:
             raise ValueError("Verify user strategy requires a model provider")
-        return VerifyUserSimulationEnv(model=model, provider=provider)
+        return VerifyUserSimulationEnv(
+            model=model, provider=provider, response_cache=response_cache
+        )
     elif user_strategy == UserStrategy.REFLECTION:
         if model is None:
             raise ValueError("Reflection user strategy requires a model")
         if provider is None:
             raise ValueError("Reflection user strategy requires a model provider")
-        return ReflectionUserSimulationEnv(model=model, provider=provider)
+        return ReflectionUserSimulationEnv(
+            model=model, provider=provider, response_cache=response_cache
+        )
     raise ValueError(f"Unknown user strategy {user_strategy}")
+
+
+def load_async_user(
+    user_strategy: Union[str, UserStrategy],
+    model: Optional[str] = "gpt-4o",
+    provider: Optional[str] = None,
+    pool: Optional[UserRequestPool] = None,
+    response_cache: Optional[UserResponseCache] = None,
+) -> AsyncLLMUserSimulationEnv:
+    if isinstance(user_strategy, str):
+        user_strategy = UserStrategy(user_strategy)
+    if model is None:
+        raise ValueError("Async user strategies require a model")
+    if provider is None:
+        raise ValueError("Async user strategies require a model provider")
+    if user_strategy == UserStrategy.LLM:
+        return AsyncLLMUserSimulationEnv(
+            model=model, provider=provider, pool=pool, response_cache=response_cache
+        )
+    elif user_strategy == UserStrategy.REACT:
+        return AsyncReactUserSimulationEnv(
+            model=model, provider=provider, pool=pool, response_cache=response_cache
+        )
+    raise ValueError(f"User strategy {user_strategy} has no async simulator")
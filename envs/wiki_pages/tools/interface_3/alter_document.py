@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import page_moved
 
 class AlterDocument(Tool):
     @staticmethod
@@ -66,6 +67,7 @@ class AlterDocument(Tool):
             page["title"] = title
         if parent_document_id is not None:
             page["parent_page_id"] = parent_document_id if parent_document_id != "" else None
+            page_moved(data, document_id)
         if body_storage is not None:
             page["body_storage"] = body_storage
         if status is not None:
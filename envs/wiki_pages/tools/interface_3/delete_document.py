@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy, page_removed
 
 class DeleteDocument(Tool):
     @staticmethod
@@ -44,15 +45,15 @@ class DeleteDocument(Tool):
 
         if hard_delete:
             # Check if document has children
-            for pid, p in pages.items():
-                if p.get("parent_page_id") == document_id:
-                    return json.dumps({
-                        "error": f"Cannot hard delete document with ID '{document_id}' because it has child documents. "
-                        "Delete or reassign child documents first."
-                    })
+            if get_page_hierarchy(data).has_children(document_id):
+                return json.dumps({
+                    "error": f"Cannot hard delete document with ID '{document_id}' because it has child documents. "
+                    "Delete or reassign child documents first."
+                })
 
             # Remove from data
             deleted_page = pages.pop(document_id)
+            page_removed(data, document_id)
             
             # Return with Fibery naming
             output_document = {
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy
 
 class DiscoverDirectChildren(Tool):
     @staticmethod
@@ -34,26 +35,26 @@ class DiscoverDirectChildren(Tool):
                 })
 
         results = []
-        for pid, page in pages.items():
-            if page.get("parent_page_id") == document_id:
-                # Apply status filter if provided
-                if status is not None and page.get("status") != status:
-                    continue
+        for pid in get_page_hierarchy(data).child_ids(document_id):
+            page = pages[pid]
+            # Apply status filter if provided
+            if status is not None and page.get("status") != status:
+                continue
 
-                # Map to Fibery naming
-                doc_record = {
-                    "document_id": page.get("page_id", str(pid)),
-                    "title": page.get("title"),
-                    "workspace_id": page.get("space_id"),
-                    "parent_document_id": page.get("parent_page_id"),
-                    "body_storage": page.get("body_storage"),
-                    "status": page.get("status"),
-                    "created_by": page.get("created_by"),
-                    "created_at": page.get("created_at"),
-                    "updated_by": page.get("updated_by"),
-                    "updated_at": page.get("updated_at"),
-                }
-                results.append(doc_record)
+            # Map to Fibery naming
+            doc_record = {
+                "document_id": page.get("page_id", str(pid)),
+                "title": page.get("title"),
+                "workspace_id": page.get("space_id"),
+                "parent_document_id": page.get("parent_page_id"),
+                "body_storage": page.get("body_storage"),
+                "status": page.get("status"),
+                "created_by": page.get("created_by"),
+                "created_at": page.get("created_at"),
+                "updated_by": page.get("updated_by"),
+                "updated_at": page.get("updated_at"),
+            }
+            results.append(doc_record)
 
         return json.dumps({
             "entity_type": "documents",
@@ -1,6 +1,7 @@
 import json
-from typing import Any, Dict, List
+from typing import Any, Dict
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import get_page_hierarchy
 
 
 class FetchDescendantDocument(Tool):
@@ -26,28 +27,6 @@ class FetchDescendantDocument(Tool):
         if document_id not in pages:
             return json.dumps({"error": f"Document with ID '{document_id}' not found"})
 
-        def get_descendants(parent_id: str, all_pages: Dict[str, Any]) -> List[Dict[str, Any]]:
-            descendants = []
-            for pid, page in all_pages.items():
-                if page.get("parent_page_id") == parent_id:
-                    # Map to Fibery naming
-                    doc_record = {
-                        "document_id": page.get("page_id", str(pid)),
-                        "title": page.get("title"),
-                        "workspace_id": page.get("space_id"),
-                        "parent_document_id": page.get("parent_page_id"),
-                        "body_storage": page.get("body_storage"),
-                        "status": page.get("status"),
-                        "created_by": page.get("created_by"),
-                        "created_at": page.get("created_at"),
-                        "updated_by": page.get("updated_by"),
-                        "updated_at": page.get("updated_at"),
-                    }
-                    descendants.append(doc_record)
-                    # Recursively get descendants of this document
-                    descendants.extend(get_descendants(str(pid), all_pages))
-            return descendants
-
         results = []
 
         if include_root:
@@ -66,7 +45,21 @@ class FetchDescendantDocument(Tool):
             }
             results.append(root_record)
 
-        results.extend(get_descendants(document_id, pages))
+        for pid in get_page_hierarchy(data).descendant_ids(document_id):
+            page = pages[pid]
+            # Map to Fibery naming
+            results.append({
+                "document_id": page.get("page_id", str(pid)),
+                "title": page.get("title"),
+                "workspace_id": page.get("space_id"),
+                "parent_document_id": page.get("parent_page_id"),
+                "body_storage": page.get("body_storage"),
+                "status": page.get("status"),
+                "created_by": page.get("created_by"),
+                "created_at": page.get("created_at"),
+                "updated_by": page.get("updated_by"),
+                "updated_at": page.get("updated_at"),
+            })
 
         return json.dumps({
             "entity_type": "documents",
@@ -1,6 +1,7 @@
 import json
 from typing import Any, Dict, Optional
 from tau_bench.envs.tool import Tool
+from tau_bench.envs.page_hierarchy import page_added
 
 class InsertDocument(Tool):
     @staticmethod
@@ -115,6 +116,7 @@ class InsertDocument(Tool):
         }
 
         pages[new_page_id] = new_page
+        page_added(data, new_page_id)
 
         # Return with ONLY Fibery terminology - no internal Confluence DB fields exposed
         return json.dumps(
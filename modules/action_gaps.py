@@ -0,0 +1,223 @@
+import json
+import hashlib
+from flask import Blueprint, request, jsonify
+
+# Ground truth vs model action comparison of trials, shown by the trajectory
+# viewer's "Action Difference" box. A call is identified by its signature,
+# the tool name and its arguments as JSON with sorted keys (the same string
+# getActionSignature builds in the browser), hashed once per call.
+#
+# Expected and made calls are aligned with a longest common subsequence:
+# calls on it are matched in order, remaining calls with the same hash on
+# both sides are matched out of order, and whatever is left is missing
+# (expected, never made) or extra (made, not expected). Repeated calls
+# count as often as they occur.
+
+action_gaps_bp = Blueprint('action_gaps', __name__)
+
+# Bumped whenever action_signature changes, so signatures and gaps stored by
+# the trajectory archive can be recomputed. 2: integral floats written as ints.
+SIGNATURE_VERSION = 2
+
+
+def parse_arguments(arguments):
+    """Arguments as an object; model tool calls carry them as a JSON string."""
+    if isinstance(arguments, str):
+        try:
+            return json.loads(arguments)
+        except ValueError:
+            return arguments
+    return arguments
+
+
+def normalize_numbers(value):
+    """Integral floats as ints, recursively, as JSON.stringify writes 500000.0 as 500000."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: normalize_numbers(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [normalize_numbers(item) for item in value]
+    return value
+
+
+def action_signature(name, arguments):
+    normalized = json.dumps(normalize_numbers(parse_arguments(arguments)), sort_keys=True, separators=(",", ":"),
+                            ensure_ascii=False)
+    return f"{name}({normalized})"
+
+
+def action_hash(name, arguments):
+    return hashlib.blake2b(action_signature(name, arguments).encode("utf-8"), digest_size=8).hexdigest()
+
+
+def ground_truth_actions(trial):
+    """[(name, arguments)] expected by the trial's task."""
+    info = trial.get("info") or {}
+    actions = (info.get("task") or {}).get("actions") or info.get("actions") or trial.get("actions") or []
+    return [(action.get("name"), action.get("kwargs", action.get("arguments"))) for action in actions]
+
+
+def model_actions(trial):
+    """[(name, arguments)] of the assistant tool calls in the trial's traj."""
+    actions = []
+    for turn in trial.get("traj") or []:
+        for tool_call in turn.get("tool_calls") or []:
+            function = tool_call.get("function") or {}
+            actions.append((function.get("name"), function.get("arguments")))
+    return actions
+
+
+def load_trials(results):
+    """Trials of a result file in any of the shapes the trajectory viewer accepts."""
+    if isinstance(results, dict) and "response_data" in results:
+        return results["response_data"]["results"]
+    if isinstance(results, list):
+        return results
+    return [results]
+
+
+def is_passed(reward):
+    """Same rule as isPassed in the trajectory viewer."""
+    if reward is True:
+        return True
+    if reward in (False, 0, "fail", "failed") or reward is None:
+        return False
+    if isinstance(reward, (int, float)):
+        return reward > 0
+    return bool(reward)
+
+
+def lcs_pairs(expected, made):
+    """Index pairs of a longest common subsequence of two hash lists."""
+    rows, columns = len(expected), len(made)
+    lengths = [[0] * (columns + 1) for _ in range(rows + 1)]
+    for i in range(rows - 1, -1, -1):
+        for j in range(columns - 1, -1, -1):
+            if expected[i] == made[j]:
+                lengths[i][j] = lengths[i + 1][j + 1] + 1
+            else:
+                lengths[i][j] = max(lengths[i + 1][j], lengths[i][j + 1])
+    pairs = []
+    i = j = 0
+    while i < rows and j < columns:
+        if expected[i] == made[j]:
+            pairs.append((i, j))
+            i += 1
+            j += 1
+        elif lengths[i + 1][j] >= lengths[i][j + 1]:
+            i += 1
+        else:
+            j += 1
+    return pairs
+
+
+def align_actions(expected, made):
+    """
+    Align two [(name, arguments)] lists.
+
+    Returns:
+        dict: matched (count in order), out_of_order, missing and extra,
+        each a list of {name, arguments, hash} with the call's position
+    """
+    expected_hashes = [action_hash(name, arguments) for name, arguments in expected]
+    made_hashes = [action_hash(name, arguments) for name, arguments in made]
+    pairs = lcs_pairs(expected_hashes, made_hashes)
+    matched_expected = {i for i, _ in pairs}
+    matched_made = {j for _, j in pairs}
+
+    unmatched_made = {}
+    for j, made_hash in enumerate(made_hashes):
+        if j not in matched_made:
+            unmatched_made.setdefault(made_hash, []).append(j)
+    out_of_order, missing = [], []
+    for i, expected_hash in enumerate(expected_hashes):
+        if i in matched_expected:
+            continue
+        name, arguments = expected[i]
+        entry = {"name": name, "arguments": parse_arguments(arguments), "hash": expected_hash, "expected_index": i}
+        if unmatched_made.get(expected_hash):
+            entry["made_index"] = unmatched_made[expected_hash].pop(0)
+            out_of_order.append(entry)
+        else:
+            missing.append(entry)
+    extra = [
+        {"name": made[j][0], "arguments": parse_arguments(made[j][1]), "hash": made_hashes[j], "made_index": j}
+        for indexes in unmatched_made.values() for j in indexes
+    ]
+    extra.sort(key=lambda entry: entry["made_index"])
+    return {"matched": len(pairs), "out_of_order": out_of_order, "missing": missing, "extra": extra}
+
+
+def trial_gaps(trial):
+    """Alignment of a trial's calls against its ground truth, or None without ground truth."""
+    expected = ground_truth_actions(trial)
+    if not expected:
+        return None
+    made = model_actions(trial)
+    gaps = align_actions(expected, made)
+    gaps["expected"] = len(expected)
+    gaps["made"] = len(made)
+    gaps["exact"] = not (gaps["missing"] or gaps["extra"] or gaps["out_of_order"])
+    return gaps
+
+
+def aggregate_gaps(trial_results):
+    """
+    Gap statistics over the trials of a task.
+
+    trial_results is a list of (gaps, passed) with gaps as returned by
+    trial_gaps. Per action hash, "trials" counts the trials it appears in
+    and "failed_trials" those of them that did not pass.
+    """
+    summary = {"trials": len(trial_results), "with_ground_truth": 0, "passed": 0, "exact": 0,
+               "mean_missing": None, "mean_extra": None, "mean_out_of_order": None}
+    totals = {"missing": 0, "extra": 0, "out_of_order": 0}
+    actions = {"missing": {}, "extra": {}, "out_of_order": {}}
+    tools = {}
+    for gaps, passed in trial_results:
+        summary["passed"] += int(bool(passed))
+        if not gaps:
+            continue
+        summary["with_ground_truth"] += 1
+        summary["exact"] += int(gaps.get("exact", not (gaps["missing"] or gaps["extra"])))
+        for kind, by_hash in actions.items():
+            entries = gaps.get(kind) or []
+            totals[kind] += len(entries)
+            seen = set()
+            for entry in entries:
+                entry_hash = entry.get("hash") or action_hash(entry["name"], entry["arguments"])
+                action = by_hash.setdefault(entry_hash, {
+                    "hash": entry_hash, "name": entry["name"], "arguments": entry["arguments"],
+                    "occurrences": 0, "trials": 0, "failed_trials": 0,
+                })
+                action["occurrences"] += 1
+                if entry_hash not in seen:
+                    seen.add(entry_hash)
+                    action["trials"] += 1
+                    action["failed_trials"] += int(not passed)
+                tool = tools.setdefault(entry["name"], {"missing": 0, "extra": 0, "out_of_order": 0})
+                tool[kind] += 1
+    if summary["with_ground_truth"]:
+        for kind, total in totals.items():
+            summary[f"mean_{kind}"] = round(total / summary["with_ground_truth"], 3)
+    for kind, by_hash in actions.items():
+        summary[f"{kind}_actions"] = sorted(by_hash.values(), key=lambda action: (-action["trials"], action["name"] or ""))
+    summary["tools"] = tools
+    return summary
+
+
+@action_gaps_bp.route('/action_gaps', strict_slashes=False, methods=["POST"])
+def action_gaps():
+    """ Per trial gaps and their aggregate for posted results (any trajectory viewer shape) """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({'status': 'error', 'message': 'A JSON body is required'}), 400
+    results = payload.get("results", payload) if isinstance(payload, dict) else payload
+    trials = [trial for trial in load_trials(results) if isinstance(trial, dict)]
+    gaps = [trial_gaps(trial) for trial in trials]
+    return jsonify({
+        'status': 'success',
+        'trials': gaps,
+        'summary': aggregate_gaps([(trial_gap, is_passed(trial.get("reward"))) for trial_gap, trial in zip(gaps, trials)]),
+    }), 200
@@ -0,0 +1,165 @@
+import ast
+import json
+import math
+import re
+import textwrap
+
+# Argument validation and coercion for execute_api, compiled once per tool from
+# the "parameters" schema of its get_info(). Values the page sends as text are
+# converted to the declared type (JSON objects/arrays, numbers, booleans), and
+# calls with unknown or missing arguments are rejected before any environment
+# data is loaded or replayed. Values that still do not match the declared
+# type are passed through unchanged with a warning: some get_info() schemas
+# declare the wrong type (an amount declared as a string) for values the
+# tool handles fine.
+#
+# Only the structure is checked (types, required and unknown top-level
+# arguments). Enums, formats and ranges stay with the tools, which report
+# them in their own error responses. None is accepted anywhere, as tools use
+# it for unset or cleared fields.
+
+INTEGER_PATTERN = re.compile(r'^[+-]?\d+$')
+
+
+def _schema_types(schema):
+    types = schema.get('type')
+    if types is None:
+        return None
+    types = set(types) if isinstance(types, list) else {types}
+    if 'float' in types:
+        # Non-standard spelling used by a few tools
+        types.discard('float')
+        types.add('number')
+    return types
+
+
+def _matches(value, types):
+    value_type = type(value)
+    if value_type is str:
+        return 'string' in types
+    if value_type is bool:
+        return 'boolean' in types
+    if value_type is int:
+        return 'integer' in types or 'number' in types
+    if value_type is float:
+        return 'number' in types or ('integer' in types and value.is_integer())
+    if value_type is dict:
+        return 'object' in types
+    if value_type is list:
+        return 'array' in types
+    return False
+
+
+def _coerce_text(value, types):
+    """Convert text to the declared type where the page could only send a string."""
+    text = value.strip()
+    if ('object' in types or 'array' in types) and text[:1] in ('{', '['):
+        try:
+            return json.loads(text)
+        except ValueError:
+            return value
+    if 'boolean' in types and text.lower() in ('true', 'false'):
+        return text.lower() == 'true'
+    if 'integer' in types and INTEGER_PATTERN.match(text):
+        return int(text)
+    if 'number' in types:
+        if INTEGER_PATTERN.match(text):
+            return int(text)
+        try:
+            number = float(text)
+        except ValueError:
+            return value
+        if math.isfinite(number):
+            return number
+    return value
+
+
+def _describe(types):
+    return ' or '.join(sorted(types))
+
+
+def compile_value_checker(schema):
+    """
+    Compile a JSON schema into check(value, path, warnings), which returns the
+    coerced value and appends a message to warnings for each type mismatch.
+    """
+    if not isinstance(schema, dict):
+        return lambda value, path, warnings: value
+    types = _schema_types(schema)
+    properties = {}
+    if isinstance(schema.get('properties'), dict):
+        for name, property_schema in schema['properties'].items():
+            properties[name] = compile_value_checker(property_schema)
+    items = compile_value_checker(schema['items']) if isinstance(schema.get('items'), dict) else None
+    coerce = types is not None and 'string' not in types
+
+    def check(value, path, warnings):
+        if value is None:
+            return value
+        if types is None:
+            if type(value) is str and value[:1] in ('{', '['):
+                # Untyped: parse JSON text like arguments_processing does
+                value = _coerce_text(value, {'object', 'array'})
+        else:
+            if coerce and type(value) is str:
+                value = _coerce_text(value, types)
+            if not _matches(value, types):
+                warnings.append(f"'{path}' should be {_describe(types)}, got {type(value).__name__}")
+                return value
+        if properties and type(value) is dict:
+            for name, check_property in properties.items():
+                if name in value:
+                    value[name] = check_property(value[name], f"{path}.{name}", warnings)
+        elif items is not None and type(value) is list:
+            for i, item in enumerate(value):
+                value[i] = items(item, f"{path}[{i}]", warnings)
+        return value
+
+    return check
+
+
+def invoke_accepts_extra(invoke_source):
+    """Whether an invoke method source takes **kwargs."""
+    try:
+        function = ast.parse(textwrap.dedent(invoke_source)).body[0]
+    except (SyntaxError, IndexError):
+        return False
+    return isinstance(function, ast.FunctionDef) and function.args.kwarg is not None
+
+
+def compile_argument_validator(function_info, accepts_extra=False):
+    """
+    Compile the parameters of a tool (as returned by extract_file_info) into
+    validate(arguments) -> (cleaned arguments, errors, warnings). Errors
+    (unknown or missing arguments) reject the call; warnings (type
+    mismatches) do not.
+    Empty strings are dropped as unset, like arguments_processing does.
+    Arguments missing from the schema are passed through unchecked when
+    accepts_extra is set (invoke takes **kwargs), otherwise rejected.
+    """
+    parameters = function_info.get('parameters') or {}
+    required = [name for name in function_info.get('required') or [] if name in parameters]
+    checkers = {name: compile_value_checker(schema) for name, schema in parameters.items()}
+
+    def validate(arguments):
+        if not isinstance(arguments, dict):
+            return {}, ["Arguments must be an object"], []
+        errors, warnings = [], []
+        cleaned = {}
+        for name, value in arguments.items():
+            if isinstance(value, str) and value == '':
+                continue
+            check = checkers.get(name)
+            if check is None:
+                if accepts_extra:
+                    cleaned[name] = value
+                else:
+                    errors.append(f"Unknown argument '{name}'")
+                continue
+            cleaned[name] = check(value, name, warnings)
+        for name in required:
+            if name not in cleaned:
+                errors.append(f"Missing required argument '{name}'")
+        return cleaned, errors, warnings
+
+    return validate
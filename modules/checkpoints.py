@@ -0,0 +1,219 @@
+import os
+import re
+import json
+import hashlib
+from datetime import datetime, timezone
+from flask import Blueprint, request, jsonify, session
+from modules.dataset_loader import load_environment_data, content_hash
+from modules.state_diff import data_digest, diff_tables, apply_diff
+from modules.task_framework import (
+    ENVS_BASE_PATH,
+    safe_join_path,
+    get_interface_manifest,
+    run_actions,
+)
+
+checkpoints_bp = Blueprint('checkpoints', __name__)
+
+# Server-side session checkpoints: the recorded actions, a digest of the state
+# they produce and a record-level diff against the environment baseline.
+CHECKPOINT_DIR = os.path.abspath(os.environ.get("CHECKPOINT_DIR", "checkpoints"))
+CHECKPOINT_ID_PATTERN = re.compile(r'^[0-9a-f]{16}$')
+CHECKPOINT_FORMAT_VERSION = 1
+
+
+def resolve_paths(environment, interface):
+    """Return (data_path, interface_path) for validated names, or None."""
+    data_path = safe_join_path(ENVS_BASE_PATH, environment, "data")
+    interface_path = safe_join_path(ENVS_BASE_PATH, environment, "tools", f"interface_{interface}")
+    if data_path is None or interface_path is None:
+        return None
+    if not os.path.isdir(data_path) or not os.path.isdir(interface_path):
+        return None
+    return data_path, interface_path
+
+
+def checkpoint_file(checkpoint_id):
+    if not checkpoint_id or not CHECKPOINT_ID_PATTERN.match(checkpoint_id):
+        return None
+    return os.path.join(CHECKPOINT_DIR, f"{checkpoint_id}.json")
+
+
+def read_checkpoint(checkpoint_id):
+    path = checkpoint_file(checkpoint_id)
+    if path is None or not os.path.isfile(path):
+        return None
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def exported_actions(actions):
+    """Session actions in the name/arguments format used by import and export."""
+    return [
+        {
+            'name': action.get('api_name', '').removesuffix('_invoke'),
+            'arguments': action.get('arguments', {}),
+        }
+        for action in actions
+    ]
+
+
+@checkpoints_bp.route('/checkpoints', strict_slashes=False, methods=["POST"])
+def save_checkpoint():
+    """ Save the current session (environment, interface and actions) as a checkpoint """
+    environment = session.get("environment")
+    interface = session.get("interface")
+    actions = session.get("actions", [])
+    paths = resolve_paths(environment, interface) if environment and interface else None
+    if paths is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Choose an environment and interface first'
+        }), 400
+    data_path, interface_path = paths
+
+    passed_data = request.get_json(silent=True) or {}
+    include_diff = passed_data.get('include_diff', True)
+
+    try:
+        manifest = get_interface_manifest(interface_path)
+        baseline = load_environment_data(data_path)
+        state = run_actions(
+            load_environment_data(data_path), actions,
+            manifest["imports_set"], manifest["invoke_methods"], manifest["argument_validators"]
+        )
+        checkpoint = {
+            'version': CHECKPOINT_FORMAT_VERSION,
+            'environment': environment,
+            'interface': interface,
+            'baseline_hash': content_hash(data_path),
+            'data_hash': data_digest(state),
+            'actions': actions,
+            'diff': diff_tables(baseline, state) if include_diff else None,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+        }
+        payload = json.dumps(checkpoint, sort_keys=True, separators=(',', ':'))
+        checkpoint_id = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+        os.makedirs(CHECKPOINT_DIR, exist_ok=True)
+        with open(checkpoint_file(checkpoint_id), "w") as file:
+            file.write(payload)
+    except Exception as e:
+        print(f"Error saving checkpoint: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Failed to save checkpoint'
+        }), 500
+
+    return jsonify({
+        'status': 'success',
+        'checkpoint_id': checkpoint_id,
+        'data_hash': checkpoint['data_hash'],
+        'actions_count': len(actions),
+        'size_bytes': len(payload),
+    }), 200
+
+
+@checkpoints_bp.route('/checkpoints/<checkpoint_id>', strict_slashes=False, methods=["GET"])
+def get_checkpoint(checkpoint_id):
+    """ Return checkpoint metadata and actions (without the state diff) """
+    checkpoint = read_checkpoint(checkpoint_id)
+    if checkpoint is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Checkpoint not found'
+        }), 404
+    return jsonify({
+        'status': 'success',
+        'checkpoint_id': checkpoint_id,
+        'environment': checkpoint.get('environment'),
+        'interface': checkpoint.get('interface'),
+        'baseline_hash': checkpoint.get('baseline_hash'),
+        'data_hash': checkpoint.get('data_hash'),
+        'created_at': checkpoint.get('created_at'),
+        'has_diff': checkpoint.get('diff') is not None,
+        'actions': exported_actions(checkpoint.get('actions', [])),
+    }), 200
+
+
+@checkpoints_bp.route('/checkpoints/<checkpoint_id>/restore', strict_slashes=False, methods=["POST"])
+def restore_checkpoint(checkpoint_id):
+    """
+    Restore a checkpoint into the current session.
+
+    mode "replay" (default) re-runs the actions against the baseline; mode
+    "diff" applies the stored state diff without running any tool. Either way
+    the resulting state must match the checkpoint's data hash.
+    """
+    checkpoint = read_checkpoint(checkpoint_id)
+    if checkpoint is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Checkpoint not found'
+        }), 404
+
+    passed_data = request.get_json(silent=True) or {}
+    mode = passed_data.get('mode', 'replay')
+    if mode not in ('replay', 'diff'):
+        return jsonify({
+            'status': 'error',
+            'message': "mode must be 'replay' or 'diff'"
+        }), 400
+    if mode == 'diff' and checkpoint.get('diff') is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Checkpoint was saved without a state diff'
+        }), 400
+
+    environment = checkpoint.get('environment')
+    interface = checkpoint.get('interface')
+    paths = resolve_paths(environment, interface)
+    if paths is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Environment or interface not found'
+        }), 404
+    data_path, interface_path = paths
+
+    if content_hash(data_path) != checkpoint.get('baseline_hash'):
+        return jsonify({
+            'status': 'error',
+            'message': 'Environment data changed since the checkpoint was saved'
+        }), 409
+
+    actions = checkpoint.get('actions', [])
+    try:
+        manifest = get_interface_manifest(interface_path)
+        state = load_environment_data(data_path)
+        if mode == 'diff':
+            apply_diff(state, checkpoint['diff'])
+        else:
+            run_actions(state, actions, manifest["imports_set"], manifest["invoke_methods"], manifest["argument_validators"])
+        data_hash = data_digest(state)
+    except Exception as e:
+        print(f"Error restoring checkpoint {checkpoint_id}: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Failed to restore checkpoint'
+        }), 500
+
+    if data_hash != checkpoint.get('data_hash'):
+        return jsonify({
+            'status': 'error',
+            'message': 'Restored state does not match the checkpoint data hash'
+        }), 409
+
+    session["environment"] = environment
+    session["interface"] = interface
+    session["imports_set"] = set(manifest["imports_set"])
+    session["invoke_methods"] = list(manifest["invoke_methods"])
+    session["actions"] = actions
+
+    return jsonify({
+        'status': 'success',
+        'environment': environment,
+        'interface': interface,
+        'data_hash': data_hash,
+        'functions_info': manifest["functions_info"],
+        'actions': exported_actions(actions),
+    }), 200
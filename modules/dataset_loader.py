@@ -0,0 +1,499 @@
+import os
+import sys
+import json
+import mmap
+import time
+import pickle
+import struct
+import hashlib
+import argparse
+import threading
+from collections.abc import Mapping
+
+# How environment datasets are loaded for each request:
+#   "json"    - parse every envs/<env>/data/*.json file on each request (default)
+#   "compact"  - keep one interned, tuple-backed baseline per environment in the
+#                worker and materialize a fresh mutable copy for each request
+#   "compiled" - unpickle the envs/<env>/data/dataset.compiled artifact built by
+#                `python -m modules.dataset_loader`, falling back to JSON when
+#                the artifact is missing or stale
+#   "shared"   - mmap the compiled artifact once per worker (compiling it if
+#                needed) and decode each request's private copy straight from
+#                the mapping; the baseline bytes live in the OS page cache and
+#                are shared by every worker instead of being parsed per worker
+DATASET_LOADER_MODE = os.environ.get("DATASET_LOADER_MODE", "json")
+
+COMPILED_DATASET_NAME = "dataset.compiled"
+COMPILED_MAGIC = b"TFDATA01"
+COMPILED_FORMAT_VERSION = 1
+
+# Strings up to this length are deduplicated while compacting. Longer values
+# (descriptions, page bodies) are almost always unique and not worth pooling.
+INTERN_MAX_LENGTH = 64
+
+
+def is_data_file(filename):
+    """Return True for a plain *.json file name with no path components."""
+    if not filename or not isinstance(filename, str):
+        return False
+    if '..' in filename or '/' in filename or '\\' in filename or '\x00' in filename:
+        return False
+    return filename.endswith(".json")
+
+
+def list_data_files(data_path):
+    """
+    List the JSON tables of a data directory.
+
+    Returns:
+        list: (table_name, absolute_path) pairs sorted by table name
+    """
+    abs_data_path = os.path.abspath(data_path)
+    tables = []
+    for filename in sorted(os.listdir(abs_data_path)):
+        if not is_data_file(filename):
+            continue
+        abs_file_path = os.path.abspath(os.path.join(abs_data_path, filename))
+        # Verify the path stays within the data directory
+        if not abs_file_path.startswith(abs_data_path + os.sep):
+            continue
+        tables.append((filename.split('.')[0], abs_file_path))
+    return tables
+
+
+def data_fingerprint(data_path):
+    """Cheap freshness key for a data directory: table names, sizes and mtimes."""
+    fingerprint = []
+    for table_name, file_path in list_data_files(data_path):
+        stat = os.stat(file_path)
+        fingerprint.append((table_name, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+def load_json_tables(data_path):
+    """Parse every JSON table of a data directory into plain Python objects."""
+    tables = {}
+    for table_name, file_path in list_data_files(data_path):
+        with open(file_path, "r") as file:
+            tables[table_name] = json.load(file)
+    return tables
+
+
+######################## COMPACT RECORDS ##################################
+class RecordLayout:
+    """Field names shared by every record with the same keys, in the same order."""
+    __slots__ = ("keys", "index", "nested")
+
+    def __init__(self, keys, nested):
+        self.keys = keys
+        self.index = {key: position for position, key in enumerate(keys, 1)}
+        self.nested = nested
+
+
+class CompactRecord(tuple, Mapping):
+    """
+    Read-only, tuple-backed stand-in for a JSON object.
+
+    The first slot holds a RecordLayout shared by all records with the same
+    fields and the remaining slots hold the values, so a table of N rows keeps
+    a single copy of its keys and no per-row hash table. Nested objects are
+    CompactRecords and nested arrays are tuples; materialize() turns them back
+    into dicts and lists.
+    """
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        return tuple.__getitem__(self, tuple.__getitem__(self, 0).index[key])
+
+    def __iter__(self):
+        return iter(tuple.__getitem__(self, 0).keys)
+
+    def __len__(self):
+        return tuple.__len__(self) - 1
+
+    def __contains__(self, key):
+        return key in tuple.__getitem__(self, 0).index
+
+    def __eq__(self, other):
+        return Mapping.__eq__(self, other)
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"CompactRecord({dict(self.items())!r})"
+
+    def keys(self):
+        return tuple.__getitem__(self, 0).keys
+
+    def values(self):
+        return tuple.__getitem__(self, slice(1, None))
+
+    def items(self):
+        return zip(tuple.__getitem__(self, 0).keys, tuple.__getitem__(self, slice(1, None)))
+
+    def get(self, key, default=None):
+        position = tuple.__getitem__(self, 0).index.get(key)
+        return default if position is None else tuple.__getitem__(self, position)
+
+    def to_dict(self):
+        """Return a plain, mutable dict copy of this record."""
+        layout = tuple.__getitem__(self, 0)
+        values = tuple.__getitem__(self, slice(1, None))
+        if not layout.nested:
+            return dict(zip(layout.keys, values))
+        return {key: materialize(value) for key, value in zip(layout.keys, values)}
+
+
+class Compactor:
+    """Converts parsed JSON into CompactRecords, pooling keys, layouts and short strings."""
+
+    def __init__(self, max_length=INTERN_MAX_LENGTH):
+        self.max_length = max_length
+        self.strings = {}
+        self.layouts = {}
+
+    def layout(self, keys, nested):
+        layout = self.layouts.get((keys, nested))
+        if layout is None:
+            layout = RecordLayout(tuple(sys.intern(key) for key in keys), nested)
+            self.layouts[(keys, nested)] = layout
+        return layout
+
+    def string(self, value):
+        if len(value) <= self.max_length:
+            return self.strings.setdefault(value, value)
+        return value
+
+    def value(self, value):
+        value_type = type(value)
+        if value_type is str:
+            return self.string(value)
+        if value_type is dict:
+            return self.record(value)
+        if value_type is list:
+            return tuple(self.value(item) for item in value)
+        return value
+
+    def record(self, obj):
+        values = [self.value(item) for item in obj.values()]
+        nested = any(type(item) in (tuple, CompactRecord) for item in values)
+        values.insert(0, self.layout(tuple(obj.keys()), nested))
+        return CompactRecord(values)
+
+    def table(self, table):
+        """Compact a table while keeping its top level a dict keyed by record id."""
+        if type(table) is dict:
+            return {self.string(key): self.value(row) for key, row in table.items()}
+        return self.value(table)
+
+
+def compact_tables(tables):
+    """Return a compact, read-only copy of a {table_name: table} mapping."""
+    compactor = Compactor()
+    return {sys.intern(name): compactor.table(table) for name, table in tables.items()}
+
+
+def materialize(value):
+    """Turn a compact value back into the plain dicts and lists the tools expect."""
+    value_type = type(value)
+    if value_type is CompactRecord:
+        return value.to_dict()
+    if value_type is tuple:
+        return [materialize(item) for item in value]
+    if value_type is dict:
+        return {key: materialize(item) for key, item in value.items()}
+    return value
+######################## END COMPACT RECORDS ##############################
+
+
+######################## COMPILED DATASETS ################################
+# Layout of a compiled artifact:
+#   COMPILED_MAGIC | header length (8 bytes, little endian) | pickled header |
+#   one pickle (protocol 5) per table
+# The header records the source fingerprint, a sha256 content hash of the JSON
+# files and the (offset, length) of every table relative to the table region,
+# so single tables can be decoded without touching the others.
+
+def compiled_path(data_path):
+    return os.path.join(os.path.abspath(data_path), COMPILED_DATASET_NAME)
+
+
+def content_hash(data_path):
+    """sha256 over the table names and raw bytes of every JSON file."""
+    digest = hashlib.sha256()
+    for table_name, file_path in list_data_files(data_path):
+        digest.update(table_name.encode("utf-8") + b"\x00")
+        with open(file_path, "rb") as file:
+            digest.update(file.read())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+def pool_strings(value, pool):
+    """Deduplicate short strings so each one is pickled (and later loaded) once per table."""
+    value_type = type(value)
+    if value_type is str:
+        return pool.setdefault(value, value) if len(value) <= INTERN_MAX_LENGTH else value
+    if value_type is dict:
+        return {pool_strings(key, pool): pool_strings(item, pool) for key, item in value.items()}
+    if value_type is list:
+        return [pool_strings(item, pool) for item in value]
+    return value
+
+
+def compile_data_dir(data_path):
+    """
+    Compile a data directory into a single artifact next to its JSON files.
+
+    The artifact is written to a temporary file and renamed into place, so
+    workers reading it concurrently never see a partial file.
+
+    Returns:
+        dict: the artifact header
+    """
+    data_path = os.path.abspath(data_path)
+    fingerprint = data_fingerprint(data_path)
+    digest = content_hash(data_path)
+    tables = load_json_tables(data_path)
+
+    blobs = []
+    offsets = {}
+    position = 0
+    for table_name, table in tables.items():
+        blob = pickle.dumps(pool_strings(table, {}), protocol=5)
+        offsets[table_name] = (position, len(blob))
+        position += len(blob)
+        blobs.append(blob)
+
+    header = {
+        "version": COMPILED_FORMAT_VERSION,
+        "fingerprint": fingerprint,
+        "content_hash": digest,
+        "tables": offsets,
+    }
+    header_blob = pickle.dumps(header, protocol=5)
+
+    target = compiled_path(data_path)
+    temp_path = f"{target}.{os.getpid()}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(COMPILED_MAGIC)
+        file.write(struct.pack("<Q", len(header_blob)))
+        file.write(header_blob)
+        for blob in blobs:
+            file.write(blob)
+    os.replace(temp_path, target)
+    return header
+
+
+class CompiledDataset:
+    """A parsed artifact header plus the buffer (bytes or mmap) holding the tables."""
+
+    def __init__(self, header, buffer, tables_offset):
+        self.header = header
+        self.buffer = buffer
+        self.tables_offset = tables_offset
+
+    @property
+    def content_hash(self):
+        return self.header["content_hash"]
+
+    @property
+    def table_names(self):
+        return list(self.header["tables"])
+
+    def load_table(self, table_name):
+        offset, length = self.header["tables"][table_name]
+        start = self.tables_offset + offset
+        with memoryview(self.buffer) as view:
+            return pickle.loads(view[start:start + length])
+
+    def load_tables(self):
+        """Decode every table into fresh, mutable Python objects."""
+        return {table_name: self.load_table(table_name) for table_name in self.header["tables"]}
+
+
+def parse_compiled(buffer):
+    """Parse an artifact buffer. Returns a CompiledDataset, or None if the buffer is not a valid artifact."""
+    magic_length = len(COMPILED_MAGIC)
+    if len(buffer) < magic_length + 8 or bytes(buffer[:magic_length]) != COMPILED_MAGIC:
+        return None
+    (header_length,) = struct.unpack("<Q", bytes(buffer[magic_length:magic_length + 8]))
+    header_start = magic_length + 8
+    try:
+        with memoryview(buffer) as view:
+            header = pickle.loads(view[header_start:header_start + header_length])
+    except Exception:
+        return None
+    if not isinstance(header, dict) or header.get("version") != COMPILED_FORMAT_VERSION:
+        return None
+    return CompiledDataset(header, buffer, header_start + header_length)
+
+
+# (data_path, fingerprint) -> content hash, so a fingerprint mismatch caused only
+# by touched mtimes (e.g. after a fresh checkout) is hashed once per process
+_content_hashes = {}
+
+
+def is_fresh(dataset, data_path):
+    """True if the artifact still matches the JSON files it was compiled from."""
+    fingerprint = data_fingerprint(data_path)
+    if dataset.header["fingerprint"] == fingerprint:
+        return True
+    key = (os.path.abspath(data_path), fingerprint)
+    if key not in _content_hashes:
+        _content_hashes[key] = content_hash(data_path)
+    return _content_hashes[key] == dataset.content_hash
+
+
+def open_compiled(data_path):
+    """Read the artifact of a data directory. Returns None when it is missing, invalid or stale."""
+    path = compiled_path(data_path)
+    if not os.path.isfile(path):
+        return None
+    with open(path, "rb") as file:
+        dataset = parse_compiled(file.read())
+    if dataset is None or not is_fresh(dataset, data_path):
+        return None
+    return dataset
+
+
+def load_source_tables(data_path):
+    """Load plain tables from a fresh compiled artifact, or from the JSON files otherwise."""
+    dataset = open_compiled(data_path)
+    if dataset is not None:
+        return dataset.load_tables()
+    return load_json_tables(data_path)
+######################## END COMPILED DATASETS ############################
+
+
+class BaselineCache:
+    """
+    Per-process cache of compact environment baselines.
+
+    Entries are keyed by data directory and revalidated against
+    data_fingerprint() on every lookup, so edited JSON files are picked up
+    without restarting the worker.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, data_path):
+        data_path = os.path.abspath(data_path)
+        fingerprint = data_fingerprint(data_path)
+        entry = self._entries.get(data_path)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(data_path)
+            if entry is None or entry[0] != fingerprint:
+                entry = (fingerprint, compact_tables(load_source_tables(data_path)))
+                self._entries[data_path] = entry
+        return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+baseline_cache = BaselineCache()
+
+
+class SharedDatasetCache:
+    """
+    Per-process read-only mappings of compiled artifacts.
+
+    Only the artifact header and the mapping are kept between requests; table
+    pages are shared through the page cache by every process that maps the
+    same file. A stale or missing artifact is recompiled and the new file is
+    mapped, which is safe because compile_data_dir() replaces it atomically.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _map(self, path):
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        dataset = parse_compiled(buffer)
+        if dataset is None:
+            buffer.close()
+        return dataset
+
+    def get(self, data_path):
+        """Return a fresh CompiledDataset backed by a mapping, or None if one cannot be built."""
+        data_path = os.path.abspath(data_path)
+        path = compiled_path(data_path)
+        entry = self._entries.get(data_path)
+        if entry is not None and is_fresh(entry, data_path):
+            return entry
+        with self._lock:
+            entry = self._entries.get(data_path)
+            if entry is not None and is_fresh(entry, data_path):
+                return entry
+            try:
+                dataset = self._map(path) if os.path.isfile(path) else None
+                if dataset is None or not is_fresh(dataset, data_path):
+                    compile_data_dir(data_path)
+                    dataset = self._map(path)
+            except OSError:
+                return None
+            # The previous mapping is left to the garbage collector: requests
+            # that are still decoding from it keep it alive until they finish.
+            self._entries[data_path] = dataset
+        return dataset
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+shared_dataset_cache = SharedDatasetCache()
+
+
+def load_environment_data(data_path, mode=None):
+    """
+    Return a fresh, mutable {table_name: table} dict for one request.
+
+    Tools mutate the returned data in place, so every call hands out a new
+    copy regardless of the loader mode.
+    """
+    mode = mode or DATASET_LOADER_MODE
+    if mode == "compact":
+        return materialize(baseline_cache.get(data_path))
+    if mode == "compiled":
+        return load_source_tables(data_path)
+    if mode == "shared":
+        dataset = shared_dataset_cache.get(data_path)
+        if dataset is not None:
+            return dataset.load_tables()
+    return load_json_tables(data_path)
+
+
+def compile_environments(envs_path, environments=None):
+    """Compile the data directory of each environment (all of them by default)."""
+    if not environments:
+        environments = sorted(
+            name for name in os.listdir(envs_path)
+            if os.path.isdir(os.path.join(envs_path, name, "data"))
+        )
+    for environment in environments:
+        data_path = os.path.join(envs_path, environment, "data")
+        if not os.path.isdir(data_path):
+            print(f"Skipping {environment}: no data directory")
+            continue
+        start = time.perf_counter()
+        header = compile_data_dir(data_path)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        print(f"Compiled {environment}: {len(header['tables'])} tables, "
+              f"content hash {header['content_hash'][:12]}, {elapsed_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile envs/<env>/data directories into binary dataset artifacts")
+    parser.add_argument("environments", nargs="*", help="Environments to compile (default: all)")
+    parser.add_argument("--envs-path", default="envs", help="Path to the envs directory")
+    args = parser.parse_args()
+    compile_environments(args.envs_path, args.environments)
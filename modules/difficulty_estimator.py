@@ -0,0 +1,226 @@
+import os
+import json
+import math
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from modules.dataset_loader import content_hash
+from modules.preload import discover_environments, discover_interfaces
+from modules.task_framework import ENVS_BASE_PATH, get_interface_manifest
+from modules import trial_runner
+from modules.trial_runner import AGENT_BACKENDS, USER_BACKENDS, DEFAULT_MAX_NUM_STEPS, build_env, plain, run_trial
+
+# Batch task difficulty from pass@k. Every task of envs/<env>/interface_N_tasks.py
+# is run K times through the trial runner's agent and user backends, all
+# (task, trial) pairs in one worker pool. Outcomes are cached per trial under
+# a key made of the task itself, the version of the tools it exercises and
+# the run settings, so re-estimating after an edit only re-runs the tasks the
+# edit affects.
+#
+#   python -m modules.difficulty_estimator hr_experts --trials 16 --agent tool-calling \
+#       --model gpt-4o --model-provider openai --workers 16
+#
+# The tool version covers the interface's tool schemas (all tasks re-run when
+# the agent-visible tools change), the invoke source of the tools the task's
+# ground truth calls, and the environment data.
+
+REPORT_FORMAT_VERSION = 1
+DIFFICULTY_CACHE_PATH = os.environ.get("DIFFICULTY_CACHE_PATH", os.path.abspath("difficulty_cache.jsonl"))
+
+
+def complexity(pass_count):
+    """Same buckets as getComplexity in the trajectory viewer."""
+    if pass_count >= 10:
+        return "Medium"
+    if pass_count >= 6:
+        return "Hard"
+    if pass_count >= 1:
+        return "Expert"
+    return "Not Passed"
+
+
+def pass_at_k(trials, passed, k):
+    """Unbiased pass@k estimate from trials runs with passed successes."""
+    if k > trials:
+        return None
+    if trials - passed < k:
+        return 1.0
+    return round(1.0 - math.comb(trials - passed, k) / math.comb(trials, k), 4)
+
+
+def digest(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+class OutcomeCache:
+    """Append-only JSONL of trial outcomes: {key, trial, reward}."""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.outcomes = {}
+        if os.path.isfile(path):
+            with open(path, "r") as file:
+                for line in file:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self.outcomes[(entry["key"], entry["trial"])] = entry["reward"]
+
+    def get(self, key, trial):
+        return self.outcomes.get((key, trial))
+
+    def put(self, key, trial, reward):
+        with self.lock:
+            self.outcomes[(key, trial)] = reward
+            with open(self.path, "a") as file:
+                file.write(json.dumps({"key": key, "trial": trial, "reward": reward}) + "\n")
+
+
+def interface_versions(environment, interface_num, envs_path=ENVS_BASE_PATH):
+    """Schema version of an interface, invoke source per tool and data version."""
+    manifest = get_interface_manifest(os.path.join(envs_path, environment, "tools", f"interface_{interface_num}"))
+    schemas = digest(sorted(manifest["functions_info"], key=lambda info: info.get("name", "")))
+    sources = {
+        info.get("name"): hashlib.sha256(source.encode("utf-8")).hexdigest()
+        for info, source in zip(manifest["functions_info"], manifest["invoke_methods"])
+    }
+    return schemas, sources, content_hash(os.path.join(envs_path, environment, "data"))
+
+
+def task_outcome_key(task, versions, settings):
+    schemas, sources, data_version = versions
+    used_tools = sorted({action["name"] for action in task["actions"]})
+    tool_version = digest([schemas, data_version, [(name, sources.get(name)) for name in used_tools]])
+    return digest([task, tool_version, settings])
+
+
+def load_targets(environments, interfaces, envs_path, settings):
+    """(environment, interface number, [(task index, Task, cache key)]) per interface with tasks."""
+    targets = []
+    for environment in environments or discover_environments(envs_path):
+        for interface_dir in discover_interfaces(environment, envs_path):
+            interface_num = int(interface_dir[len("interface_"):])
+            if interfaces and interface_num not in interfaces:
+                continue
+            if not os.path.isfile(os.path.join(envs_path, environment, f"interface_{interface_num}_tasks.py")):
+                continue
+            env = build_env(environment, interface_num, settings)
+            versions = interface_versions(environment, interface_num, envs_path)
+            tasks = [
+                (index, task, task_outcome_key(plain(task), versions, settings))
+                for index, task in enumerate(env.tasks)
+            ]
+            targets.append((environment, interface_num, tasks))
+    return targets
+
+
+def estimate(targets, num_trials, settings, cache, workers=8):
+    """Run the uncached (task, trial) pairs and return the difficulty report."""
+    pending = []
+    for environment, interface_num, tasks in targets:
+        for index, task, key in tasks:
+            for trial in range(num_trials):
+                if cache.get(key, trial) is None:
+                    pending.append((environment, interface_num, task, key, trial))
+
+    errors = {}
+    ran = 0
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {
+            pool.submit(run_trial, trial, environment, interface_num, task, settings): (key, trial)
+            for environment, interface_num, task, key, trial in pending
+        }
+        for future in as_completed(futures):
+            key, trial = futures[future]
+            try:
+                reward = future.result().get("reward") or 0.0
+            except Exception as e:
+                # Failed runs are not cached, so the next estimate retries them
+                errors.setdefault(key, []).append(str(e))
+                continue
+            cache.put(key, trial, reward)
+            ran += 1
+            if ran % 25 == 0:
+                print(f"Ran {ran}/{len(pending)} trials", flush=True)
+
+    report = {
+        'version': REPORT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'trials_per_task': num_trials,
+        'settings': settings,
+        'trials_run': ran,
+        'trials_cached': sum(len(tasks) for _, _, tasks in targets) * num_trials - len(pending),
+        'interfaces': [],
+    }
+    ks = [k for k in (1, 3, 5, 10) if k <= num_trials]
+    for environment, interface_num, tasks in targets:
+        rows = []
+        for index, task, key in tasks:
+            rewards = [cache.get(key, trial) for trial in range(num_trials)]
+            completed = [reward for reward in rewards if reward is not None]
+            passed = sum(1 for reward in completed if reward > 0)
+            rows.append({
+                'task_index': index,
+                'instruction': task.instruction,
+                'trials': len(completed),
+                'passed': passed,
+                'pass_at_k': {str(k): pass_at_k(len(completed), passed, k) for k in ks},
+                'complexity': complexity(passed) if len(completed) == num_trials else None,
+                'errors': errors.get(key, []),
+            })
+        counts = {}
+        for row in rows:
+            counts[row['complexity']] = counts.get(row['complexity'], 0) + 1
+        report['interfaces'].append({
+            'environment': environment,
+            'interface': interface_num,
+            'complexity_counts': counts,
+            'tasks': rows,
+        })
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Estimate task difficulty from pass@k over repeated trials")
+    parser.add_argument("environments", nargs="*", help="Environments to estimate (default: all)")
+    parser.add_argument("--interfaces", type=int, nargs="*", help="Interface numbers (default: all with tasks)")
+    parser.add_argument("--envs-path", default="envs", help="Path to the envs directory")
+    parser.add_argument("--trials", type=int, default=16, help="Trials per task (K)")
+    parser.add_argument("--workers", type=int, default=8, help="Trials run concurrently")
+    parser.add_argument("--agent", choices=sorted(AGENT_BACKENDS), default="tool-calling")
+    parser.add_argument("--model")
+    parser.add_argument("--model-provider")
+    parser.add_argument("--temperature", type=float, default=0.0)
+    parser.add_argument("--user-strategy", choices=sorted(USER_BACKENDS), default="llm")
+    parser.add_argument("--user-model", default="gpt-4o")
+    parser.add_argument("--user-model-provider", default="openai")
+    parser.add_argument("--max-num-steps", type=int, default=DEFAULT_MAX_NUM_STEPS)
+    parser.add_argument("--cache", default=DIFFICULTY_CACHE_PATH, help="Trial outcome cache (JSONL)")
+    parser.add_argument("--output", default="difficulty_report.json", help="JSON report path")
+    args = parser.parse_args()
+
+    if trial_runner.tau_bench_envs is None:
+        raise SystemExit("The difficulty estimator requires the tau_bench package")
+    settings = {
+        'agent': args.agent,
+        'user': args.user_strategy,
+        'model': args.model,
+        'model_provider': args.model_provider,
+        'temperature': args.temperature,
+        'user_model': args.user_model,
+        'user_model_provider': args.user_model_provider,
+        'max_num_steps': args.max_num_steps,
+    }
+    envs_path = os.path.abspath(args.envs_path)
+    targets = load_targets(args.environments, args.interfaces, envs_path, settings)
+    report = estimate(targets, args.trials, settings, OutcomeCache(args.cache), args.workers)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+
+    print(f"{report['trials_run']} trials run, {report['trials_cached']} from cache")
+    for interface in report['interfaces']:
+        counts = ", ".join(f"{level}: {count}" for level, count in sorted(interface['complexity_counts'].items(),
+                                                                           key=lambda item: str(item[0])))
+        print(f"{interface['environment']}/interface_{interface['interface']}: {counts}")
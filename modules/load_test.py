@@ -0,0 +1,301 @@
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import threading
+from datetime import datetime, timezone
+import requests
+from modules.tool_benchmark import TASKS_FILE_PATTERN, load_task_actions
+
+# End-to-end load generator for the dashboard. Each virtual trainer runs
+# realistic sessions against the app:
+#   login -> choose_env_interface -> execute_api calls taken from the actions
+#   of the environment's tasks -> import (choose_env_interface again and
+#   replay every action) -> instruction validation and tracker requests.
+# By default the app is started in this process on a local port with
+# stand-ins for Google OAuth, Google Sheets and the LLM providers, so no
+# credentials or network access are needed. --url targets a running server
+# instead (stand-ins are then up to that server).
+#
+#   python -m modules.load_test hr_experts finance --users 8 --duration 60
+#
+# Latencies are reported per endpoint, overall and by how many actions the
+# session held when the request was made, to show how replay cost grows.
+
+REPORT_FORMAT_VERSION = 1
+
+
+######################## STAND-INS ########################
+
+class StandInCompletions:
+    def __init__(self, latency):
+        self.latency = latency
+
+    def create(self, **kwargs):
+        time.sleep(self.latency)
+        message = type("Message", (), {"content": "Stand-in completion"})()
+        choice = type("Choice", (), {"message": message})()
+        return type("Completion", (), {"choices": [choice]})()
+
+
+class StandInOpenAI:
+    """Replaces openai.OpenAI in the modules that create a client per request."""
+    latency = 0.0
+
+    def __init__(self, *args, **kwargs):
+        self.chat = type("Chat", (), {"completions": StandInCompletions(self.latency)})()
+
+
+def install_stand_ins(app_module, llm_latency=0.2, sheet_rows=200):
+    """
+    Patch the loaded app so OAuth discovery, Google Sheets and LLM calls are
+    answered locally. llm_latency (seconds) simulates the provider round trip.
+    """
+    from modules import task_tracker
+
+    os.environ.setdefault("GOOGLE_CLIENT_ID_2", "load-test-client")
+    os.environ.setdefault("GOOGLE_CLIENT_SECRET_2", "load-test-secret")
+    app_module.get_google_provider_cfg = lambda: {
+        "authorization_endpoint": "https://accounts.example.invalid/o/oauth2/auth",
+        "token_endpoint": "https://accounts.example.invalid/token",
+        "userinfo_endpoint": "https://accounts.example.invalid/userinfo",
+    }
+
+    def get_sheet_data(sheet_name, worksheet_name):
+        headers = ["Task ID", "Trainer", "Email", "Status", "Team"]
+        return [headers] + [
+            [str(i), f"trainer_{i % 25}", f"trainer_{i % 25}@example.com", "Completed", f"team_{i % 5}"]
+            for i in range(sheet_rows)
+        ]
+    task_tracker.get_sheet_data = get_sheet_data
+
+    def call_claude(prompt, model=None, max_tokens=4000, temperature=0.1):
+        time.sleep(llm_latency)
+        return "Stand-in validation result"
+    StandInOpenAI.latency = llm_latency
+    for name, module in list(sys.modules.items()):
+        if not name.startswith("modules.") or module is None:
+            continue
+        if hasattr(module, "call_claude"):
+            module.call_claude = call_claude
+        if hasattr(module, "OpenAI"):
+            module.OpenAI = StandInOpenAI
+
+
+def start_local_app(llm_latency=0.2, port=0):
+    """Import app.py, install the stand-ins and serve it on a background thread."""
+    os.environ.setdefault("FLASK_SECRET_KEY", "load-test-secret-key")
+    from werkzeug.serving import make_server
+    import app as app_module
+
+    install_stand_ins(app_module, llm_latency)
+    server = make_server("127.0.0.1", port, app_module.app, threaded=True)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+######################## SESSIONS ########################
+
+def discover_targets(environments, envs_path):
+    """(environment, interface number, task action lists) for every interface with tasks."""
+    targets = []
+    for environment in environments:
+        environment_path = os.path.join(envs_path, environment)
+        if not os.path.isdir(environment_path):
+            continue
+        for file_name in sorted(os.listdir(environment_path)):
+            match = TASKS_FILE_PATTERN.match(file_name)
+            if not match:
+                continue
+            tasks = load_task_actions(os.path.join(environment_path, file_name))
+            if tasks:
+                targets.append((environment, match.group(1), tasks))
+    return targets
+
+
+class LatencyLog:
+    def __init__(self, bucket_size):
+        self.bucket_size = bucket_size
+        self.lock = threading.Lock()
+        # endpoint -> [(latency ms, session action count, ok)]
+        self.samples = {}
+
+    def add(self, endpoint, latency_ms, action_count, ok):
+        with self.lock:
+            self.samples.setdefault(endpoint, []).append((latency_ms, action_count, ok))
+
+
+class VirtualTrainer:
+    def __init__(self, base_url, targets, log, rng, actions_per_session, timeout):
+        self.base_url = base_url.rstrip("/")
+        self.targets = targets
+        self.log = log
+        self.rng = rng
+        self.actions_per_session = actions_per_session
+        self.timeout = timeout
+        self.http = requests.Session()
+        self.action_count = 0
+
+    def request(self, endpoint, method, path, payload=None):
+        start = time.perf_counter()
+        try:
+            response = self.http.request(method, self.base_url + path, json=payload,
+                                         timeout=self.timeout, allow_redirects=False)
+            # Redirects count as success: /login answers with one
+            ok = response.status_code < 400
+        except requests.RequestException:
+            ok = False
+        self.log.add(endpoint, (time.perf_counter() - start) * 1000, self.action_count, ok)
+        return ok
+
+    def choose(self, environment, interface):
+        self.action_count = 0
+        return self.request("choose_env_interface", "POST", "/clone/choose_env_interface",
+                            {"environment": environment, "interface": interface})
+
+    def execute(self, endpoint, environment, name, kwargs):
+        ok = self.request(endpoint, "POST", "/clone/execute_api",
+                          {"api_name": name, "parameters": kwargs, "environment": environment})
+        if ok:
+            self.action_count += 1
+        return ok
+
+    def run_session(self):
+        environment, interface, tasks = self.rng.choice(self.targets)
+        self.request("login", "GET", "/login")
+        if not self.choose(environment, interface):
+            return
+
+        # Work through tasks until the session holds enough actions
+        executed = []
+        task_order = self.rng.sample(range(len(tasks)), len(tasks))
+        while len(executed) < self.actions_per_session and task_order:
+            for name, kwargs in tasks[task_order.pop()]:
+                if len(executed) >= self.actions_per_session:
+                    break
+                self.execute("execute_api", environment, name, kwargs)
+                executed.append((name, kwargs))
+
+        # Import: reselect the interface and replay the action list
+        if self.choose(environment, interface):
+            for name, kwargs in executed:
+                self.execute("execute_api (import)", environment, name, kwargs)
+
+        self.request("instruction_validation", "POST", "/clone/instruction_validation", {
+            "action": "validate_instruction",
+            "initial_prompt": "Policy: {policy}\nInstruction: {instruction}\n{examples}",
+            "policy": "Load test policy",
+            "instruction": "Load test instruction",
+            "model": "stand-in",
+        })
+        self.request("tracker", "POST", "/clone/tracker")
+
+
+def percentile(ordered, fraction):
+    if not ordered:
+        return None
+    return round(ordered[min(len(ordered) - 1, int(len(ordered) * fraction))], 3)
+
+
+def latency_stats(samples, elapsed):
+    ordered = sorted(latency for latency, _, _ in samples)
+    return {
+        'requests': len(samples),
+        'errors': sum(1 for _, _, ok in samples if not ok),
+        'throughput_rps': round(len(samples) / elapsed, 3) if elapsed else None,
+        'p50_ms': percentile(ordered, 0.50),
+        'p95_ms': percentile(ordered, 0.95),
+        'p99_ms': percentile(ordered, 0.99),
+        'max_ms': round(ordered[-1], 3) if ordered else None,
+    }
+
+
+def build_report(log, elapsed, settings):
+    endpoints = {}
+    for endpoint, samples in sorted(log.samples.items()):
+        by_count = {}
+        for sample in samples:
+            bucket = sample[1] // log.bucket_size * log.bucket_size
+            by_count.setdefault(bucket, []).append(sample)
+        endpoints[endpoint] = latency_stats(samples, elapsed)
+        endpoints[endpoint]['by_action_count'] = {
+            f"{bucket}-{bucket + log.bucket_size - 1}": latency_stats(bucket_samples, elapsed)
+            for bucket, bucket_samples in sorted(by_count.items())
+        }
+    total = [sample for samples in log.samples.values() for sample in samples]
+    return {
+        'version': REPORT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'settings': settings,
+        'elapsed_s': round(elapsed, 3),
+        'overall': latency_stats(total, elapsed),
+        'endpoints': endpoints,
+    }
+
+
+def run_load_test(base_url, targets, users=4, duration=30.0, actions_per_session=20,
+                  bucket_size=5, timeout=120.0, seed=0):
+    """Run users virtual trainers for duration seconds and return the latency report."""
+    log = LatencyLog(bucket_size)
+    deadline = time.monotonic() + duration
+
+    def worker(index):
+        trainer = VirtualTrainer(base_url, targets, log, random.Random(seed + index),
+                                 actions_per_session, timeout)
+        while time.monotonic() < deadline:
+            trainer.run_session()
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(index,), daemon=True) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    settings = {
+        'users': users,
+        'duration_s': duration,
+        'actions_per_session': actions_per_session,
+        'environments': sorted({environment for environment, _, _ in targets}),
+    }
+    return build_report(log, time.perf_counter() - start, settings)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Drive concurrent task framework sessions against the dashboard")
+    parser.add_argument("environments", nargs="+", help="Environments whose tasks provide the sessions' actions")
+    parser.add_argument("--envs-path", default="envs", help="Path to the envs directory")
+    parser.add_argument("--url", help="Base URL of a running server (default: start the app locally with stand-ins)")
+    parser.add_argument("--users", type=int, default=4, help="Concurrent virtual trainers")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    parser.add_argument("--actions-per-session", type=int, default=20, help="execute_api calls before the import")
+    parser.add_argument("--bucket-size", type=int, default=5, help="Session action count bucket width")
+    parser.add_argument("--llm-latency-ms", type=float, default=200.0, help="Simulated LLM stand-in latency")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="load_test.json", help="JSON report path")
+    args = parser.parse_args()
+
+    targets = discover_targets(args.environments, args.envs_path)
+    if not targets:
+        raise SystemExit("No interface_N_tasks.py files found for the given environments")
+
+    server = None
+    base_url = args.url
+    if not base_url:
+        server, base_url = start_local_app(args.llm_latency_ms / 1000)
+        print(f"Started app at {base_url} with OAuth, Sheets and LLM stand-ins", flush=True)
+    try:
+        report = run_load_test(base_url, targets, args.users, args.duration,
+                               args.actions_per_session, args.bucket_size, seed=args.seed)
+    finally:
+        if server is not None:
+            server.shutdown()
+
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    for endpoint, stats in report['endpoints'].items():
+        print(f"{endpoint:28s} {stats['requests']:6d} req {stats['throughput_rps']:8.2f} req/s  "
+              f"p50 {stats['p50_ms']:9.2f}  p95 {stats['p95_ms']:9.2f}  p99 {stats['p99_ms']:9.2f} ms"
+              + (f"  {stats['errors']} errors" if stats['errors'] else ""))
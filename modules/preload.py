@@ -0,0 +1,109 @@
+import gc
+import os
+import time
+from modules.dataset_loader import (
+    DATASET_LOADER_MODE,
+    baseline_cache,
+    shared_dataset_cache,
+    compile_data_dir,
+    open_compiled,
+)
+from modules.task_framework import (
+    ENVS_BASE_PATH,
+    get_interface_manifest,
+    get_tools_class,
+    validate_path_component,
+)
+
+# Comma-separated environments to warm in the gunicorn master before workers
+# are forked, or "all". Empty disables preloading.
+PRELOAD_ENVIRONMENTS = os.environ.get("PRELOAD_ENVIRONMENTS", "")
+
+
+def discover_environments(envs_path=ENVS_BASE_PATH):
+    """Environments that have at least one tools/interface_N directory."""
+    environments = []
+    for environment in sorted(os.listdir(envs_path)):
+        tools_path = os.path.join(envs_path, environment, "tools")
+        if validate_path_component(environment) and os.path.isdir(tools_path):
+            environments.append(environment)
+    return environments
+
+
+def discover_interfaces(environment, envs_path=ENVS_BASE_PATH):
+    tools_path = os.path.join(envs_path, environment, "tools")
+    return sorted(
+        name for name in os.listdir(tools_path)
+        if name.startswith("interface_") and os.path.isdir(os.path.join(tools_path, name))
+    )
+
+
+def warm_baseline(data_path, mode=DATASET_LOADER_MODE):
+    """Bring an environment baseline into the form the loader mode reads on each request."""
+    if mode == "compact":
+        baseline_cache.get(data_path)
+    elif mode == "shared":
+        shared_dataset_cache.get(data_path)
+    elif mode == "compiled" and open_compiled(data_path) is None:
+        compile_data_dir(data_path)
+
+
+def warm_up(environments=None, envs_path=ENVS_BASE_PATH):
+    """
+    Parse interface manifests, compile Tools classes and load baselines.
+
+    Meant to run once in the gunicorn master (--preload): everything built
+    here is inherited by the forked workers through copy-on-write pages.
+
+    Returns:
+        dict: per environment timings in milliseconds
+    """
+    if not environments:
+        environments = discover_environments(envs_path)
+
+    report = {}
+    total_start = time.perf_counter()
+    for environment in environments:
+        timings = {"interfaces": 0, "manifests_ms": 0.0, "tool_classes_ms": 0.0, "baseline_ms": 0.0}
+        try:
+            for interface_dir in discover_interfaces(environment, envs_path):
+                start = time.perf_counter()
+                manifest = get_interface_manifest(os.path.join(envs_path, environment, "tools", interface_dir))
+                timings["manifests_ms"] += (time.perf_counter() - start) * 1000
+
+                start = time.perf_counter()
+                get_tools_class(manifest["imports_set"], manifest["invoke_methods"])
+                timings["tool_classes_ms"] += (time.perf_counter() - start) * 1000
+                timings["interfaces"] += 1
+
+            data_path = os.path.join(envs_path, environment, "data")
+            if os.path.isdir(data_path):
+                start = time.perf_counter()
+                warm_baseline(data_path)
+                timings["baseline_ms"] = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            timings["error"] = str(e)
+        report[environment] = timings
+        print(f"Preloaded {environment}: {timings['interfaces']} interfaces, "
+              f"manifests {timings['manifests_ms']:.0f} ms, "
+              f"tool classes {timings['tool_classes_ms']:.0f} ms, "
+              f"baseline ({DATASET_LOADER_MODE}) {timings['baseline_ms']:.0f} ms"
+              + (f", error: {timings['error']}" if "error" in timings else ""), flush=True)
+
+    # Keep the warmed objects out of future collections so the workers' GC
+    # passes do not touch (and un-share) the pages inherited from the master.
+    gc.collect()
+    gc.freeze()
+    print(f"Preload finished: {len(report)} environments in "
+          f"{(time.perf_counter() - total_start) * 1000:.0f} ms", flush=True)
+    return report
+
+
+def preload_from_environment():
+    """Run warm_up() for PRELOAD_ENVIRONMENTS, if it is set."""
+    if not PRELOAD_ENVIRONMENTS:
+        return None
+    if PRELOAD_ENVIRONMENTS.strip().lower() == "all":
+        return warm_up()
+    environments = [name.strip() for name in PRELOAD_ENVIRONMENTS.split(",") if name.strip()]
+    return warm_up([name for name in environments if validate_path_component(name)])
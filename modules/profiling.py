@@ -0,0 +1,200 @@
+import os
+import io
+import time
+import cProfile
+import pstats
+import threading
+from contextlib import contextmanager
+from flask import Blueprint, request, jsonify
+
+profiling_bp = Blueprint('profiling', __name__)
+
+# Opt-in timing of execute_api calls. TOOL_PROFILING=on records the phase
+# breakdown of every call, "cprofile" also captures the hot spots of each
+# tool invoke; a request can opt in on its own with "profile": true or
+# "cprofile". Aggregates are per worker process and served at /clone/metrics.
+TOOL_PROFILING = os.environ.get("TOOL_PROFILING", "off")
+PROFILE_HOTSPOTS = int(os.environ.get("PROFILE_HOTSPOTS", 15))
+
+# Hot spot file names are reported relative to the application directory
+APP_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class CallProfile:
+    """Wall time of one execute_api call split into named phases."""
+
+    enabled = True
+
+    def __init__(self, environment, api_name, capture_hotspots=False):
+        self.environment = environment
+        self.api_name = api_name
+        self.capture_hotspots = capture_hotspots
+        self.phases = {}
+        self.hotspots = None
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = self.phases.get(name, 0.0) + (time.perf_counter() - start) * 1000
+
+    @contextmanager
+    def tool(self):
+        """Time the tool invoke, under cProfile when hot spots are captured."""
+        if not self.capture_hotspots:
+            with self.phase("tool"):
+                yield
+            return
+        profiler = cProfile.Profile()
+        with self.phase("tool"):
+            profiler.enable()
+            try:
+                yield
+            finally:
+                profiler.disable()
+        self.hotspots = hotspots(profiler)
+
+    def finish(self, status="ok"):
+        """
+        Record the call in the metrics and return its breakdown in milliseconds.
+        status is "ok", or what failed ("invalid_arguments", "error").
+        """
+        summary = {
+            'status': status,
+            'wall_ms': round((time.perf_counter() - self.started) * 1000, 3),
+            'phases_ms': {name: round(value, 3) for name, value in self.phases.items()},
+        }
+        if self.hotspots is not None:
+            summary['hotspots'] = self.hotspots
+        metrics.record(self.environment, self.api_name, summary)
+        return summary
+
+
+def hotspots(profiler, limit=PROFILE_HOTSPOTS):
+    """Top functions of a profile by cumulative time."""
+    stats = pstats.Stats(profiler, stream=io.StringIO())
+    rows = []
+    for (filename, line, function), (_, calls, tottime, cumtime, _) in stats.stats.items():
+        if filename.startswith(APP_ROOT + os.sep):
+            filename = os.path.relpath(filename, APP_ROOT)
+        rows.append({
+            'function': f"{filename}:{line}({function})",
+            'calls': calls,
+            'tottime_ms': round(tottime * 1000, 3),
+            'cumtime_ms': round(cumtime * 1000, 3),
+        })
+    rows.sort(key=lambda row: row['cumtime_ms'], reverse=True)
+    return rows[:limit]
+
+
+class DisabledProfile:
+    """Stand-in for CallProfile when profiling is off: times nothing."""
+
+    enabled = False
+
+    @contextmanager
+    def phase(self, name):
+        yield
+
+    @contextmanager
+    def tool(self):
+        yield
+
+    def finish(self, status="ok"):
+        return None
+
+
+def start_profile(environment, api_name, requested=None):
+    """
+    Profile for an execute_api call; a DisabledProfile when profiling is
+    off for it. requested is the "profile" value of the request.
+    """
+    mode = requested if requested in (True, "cprofile") else TOOL_PROFILING
+    if mode not in (True, "on", "cprofile"):
+        return DisabledProfile()
+    return CallProfile(environment, api_name, capture_hotspots=(mode == "cprofile"))
+
+
+class ToolMetrics:
+    """Per (environment, tool) aggregates of profiled calls."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tools = {}
+
+    def record(self, environment, api_name, summary):
+        with self.lock:
+            entry = self.tools.setdefault((environment, api_name), {
+                'calls': 0,
+                'statuses': {},
+                'wall_ms': {'total': 0.0, 'max': 0.0},
+                'phases_ms': {},
+                'hotspots': None,
+            })
+            entry['calls'] += 1
+            status = summary.get('status', 'ok')
+            entry['statuses'][status] = entry['statuses'].get(status, 0) + 1
+            entry['wall_ms']['total'] += summary['wall_ms']
+            entry['wall_ms']['max'] = max(entry['wall_ms']['max'], summary['wall_ms'])
+            for name, value in summary['phases_ms'].items():
+                phase = entry['phases_ms'].setdefault(name, {'total': 0.0, 'max': 0.0})
+                phase['total'] += value
+                phase['max'] = max(phase['max'], value)
+            if 'hotspots' in summary:
+                # Hot spots of the slowest profiled call
+                if entry['hotspots'] is None or summary['wall_ms'] >= entry['hotspots']['wall_ms']:
+                    entry['hotspots'] = {'wall_ms': summary['wall_ms'], 'functions': summary['hotspots']}
+
+    def snapshot(self, environment=None):
+        """Aggregates sorted by total wall time, slowest tool first."""
+        with self.lock:
+            rows = []
+            for (tool_environment, api_name), entry in self.tools.items():
+                if environment and tool_environment != environment:
+                    continue
+                calls = entry['calls']
+                row = {
+                    'environment': tool_environment,
+                    'api_name': api_name,
+                    'calls': calls,
+                    'statuses': dict(entry['statuses']),
+                    'wall_ms': _stats(entry['wall_ms'], calls),
+                    'phases_ms': {name: _stats(phase, calls) for name, phase in entry['phases_ms'].items()},
+                }
+                if entry['hotspots'] is not None:
+                    row['hotspots'] = entry['hotspots']
+                rows.append(row)
+        rows.sort(key=lambda row: row['wall_ms']['total'], reverse=True)
+        return rows
+
+    def reset(self):
+        with self.lock:
+            self.tools.clear()
+
+
+def _stats(values, calls):
+    return {
+        'total': round(values['total'], 3),
+        'mean': round(values['total'] / calls, 3) if calls else 0.0,
+        'max': round(values['max'], 3),
+    }
+
+
+metrics = ToolMetrics()
+
+
+@profiling_bp.route('/metrics', strict_slashes=False, methods=["GET", "DELETE"])
+def tool_metrics():
+    """ Profiled execute_api timings per tool (GET), or reset them (DELETE) """
+    if request.method == "DELETE":
+        metrics.reset()
+        return jsonify({'status': 'success', 'message': 'Metrics cleared'}), 200
+    return jsonify({
+        'status': 'success',
+        'profiling': TOOL_PROFILING,
+        'pid': os.getpid(),
+        'tools': metrics.snapshot(request.args.get('environment')),
+    }), 200
@@ -0,0 +1,180 @@
+import os
+import json
+
+# Parsing and encoding of tool outputs for execute_api. orjson is optional:
+# when installed it parses tool outputs and encodes responses, otherwise the
+# standard library json module is used.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# auto | json | orjson ("orjson" falls back to json if it is not installed)
+JSON_BACKEND = os.environ.get("JSON_BACKEND", "auto")
+
+STREAM_CHUNK_SIZE = 64 * 1024
+STREAM_MAX_DEPTH = 2
+
+
+def use_orjson():
+    return orjson is not None and JSON_BACKEND in ("auto", "orjson")
+
+
+def find_float_fields(obj, parent_key='', float_fields=None):
+    """
+    Names of float-typed fields in a JSON-decoded structure.
+
+    Same result as task_framework.detect_float_fields (a key counts if its
+    value is a float, or a list holding floats at any list nesting level),
+    walked iteratively with exact type checks, which only holds for the
+    plain dict/list/float values a JSON parser produces.
+    """
+    if float_fields is None:
+        float_fields = set()
+    add = float_fields.add
+    stack = [(obj, parent_key)]
+    while stack:
+        node, parent_key = stack.pop()
+        if type(node) is dict:
+            for key, value in node.items():
+                value_type = type(value)
+                if value_type is float:
+                    add(key)
+                elif value_type is dict or value_type is list:
+                    stack.append((value, key))
+        elif type(node) is list:
+            for item in node:
+                item_type = type(item)
+                if item_type is dict or item_type is list:
+                    stack.append((item, parent_key))
+                elif item_type is float and parent_key:
+                    add(parent_key)
+    return float_fields
+
+
+def loads(text):
+    if use_orjson():
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # Out of range integers, NaN and the like: let json handle them
+            pass
+    return json.loads(text)
+
+
+def parse_tool_output(text):
+    """
+    Parse a tool's JSON output and collect its float field names.
+
+    With the json backend the parser reports whether it met any float
+    literal, and outputs without one (most lookups and mutations) skip the
+    walk over the parsed result entirely.
+
+    Returns:
+        tuple: (parsed output, set of float field names)
+    """
+    if use_orjson():
+        parsed = loads(text)
+        return parsed, find_float_fields(parsed)
+
+    floats_seen = []
+
+    def parse_float(literal):
+        floats_seen.append(True)
+        return float(literal)
+
+    parsed = json.loads(text, parse_float=parse_float)
+    return parsed, (find_float_fields(parsed) if floats_seen else set())
+
+
+def dumps_response(payload):
+    """
+    Encode a response body with sorted keys, like jsonify, using orjson.
+    Returns None if orjson is not in use or cannot encode payload.
+    """
+    if not use_orjson():
+        return None
+    try:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS | orjson.OPT_APPEND_NEWLINE)
+    except TypeError:
+        return None
+
+
+def append_response_field(body, key, value):
+    """
+    Add key to an encoded response body (bytes or str ending in "}\n").
+    key must sort after the keys already in body to keep them sorted.
+    """
+    field = (',' + json.dumps(key) + ':' + dumps_compact(value) + '}\n')
+    if isinstance(body, bytes):
+        return body.rstrip()[:-1] + field.encode("utf-8")
+    return body.rstrip()[:-1] + field
+
+
+def dumps_compact(obj):
+    """JSON text of obj with sorted keys and compact separators."""
+    if use_orjson():
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode("utf-8")
+        except TypeError:
+            pass
+    return json.dumps(obj, sort_keys=True, separators=(',', ':'))
+
+
+def iter_json(obj, float_fields, parent_key='', depth=0):
+    """
+    Encode obj as JSON piece by piece (sorted keys, compact separators, like
+    jsonify) while adding its float field names to float_fields. Containers
+    are expanded down to STREAM_MAX_DEPTH levels so large result lists are
+    encoded one record at a time.
+    """
+    if depth < STREAM_MAX_DEPTH and type(obj) is dict and obj:
+        separator = '{'
+        for key in sorted(obj):
+            value = obj[key]
+            if type(value) is float:
+                float_fields.add(key)
+            yield separator + json.dumps(key) + ':'
+            yield from iter_json(value, float_fields, key, depth + 1)
+            separator = ','
+        yield '}'
+    elif depth < STREAM_MAX_DEPTH and type(obj) is list and obj:
+        separator = '['
+        for item in obj:
+            if type(item) is float and parent_key:
+                float_fields.add(parent_key)
+            yield separator
+            yield from iter_json(item, float_fields, parent_key, depth + 1)
+            separator = ','
+        yield ']'
+    else:
+        if type(obj) is dict or type(obj) is list:
+            find_float_fields(obj, parent_key, float_fields)
+        yield dumps_compact(obj)
+
+
+def iter_response_chunks(output, chunk_size=STREAM_CHUNK_SIZE, trailing_fields=None):
+    """
+    Stream {"output": output, "float_fields": [...]} in chunks of about
+    chunk_size characters. Float fields are collected while output is
+    encoded, so the result is traversed once; float_fields therefore comes
+    after output in the body. trailing_fields, if given, is called once the
+    output is encoded and its {name: value} fields are appended last.
+    """
+    float_fields = set()
+    buffer = ['{"output":']
+    size = 0
+    for piece in iter_json(output, float_fields):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield ''.join(buffer)
+            buffer = []
+            size = 0
+    buffer.append(',"float_fields":' + json.dumps(sorted(float_fields)))
+    if trailing_fields is not None:
+        for name, value in trailing_fields().items():
+            if value is not None:
+                buffer.append(',' + json.dumps(name) + ':' + json.dumps(value))
+    buffer.append('}\n')
+    yield ''.join(buffer)
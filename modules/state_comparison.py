@@ -0,0 +1,205 @@
+import json
+import threading
+from flask import Blueprint, request, jsonify, session
+from modules.checkpoints import resolve_paths
+from modules.dataset_loader import data_fingerprint, load_environment_data
+from modules.state_diff import table_digest, combine_digests, record_digests, diff_fields
+from modules.task_framework import get_interface_manifest, get_tools_class, prepare_arguments
+from modules.trajectory_store import TrackedData
+
+state_comparison_bp = Blueprint('state_comparison', __name__)
+
+# Database states produced by two action lists of the same environment
+# interface, compared table by table and record by record. Both lists run
+# on fresh copies of the same baseline. Tables neither list looked up are
+# skipped outright; touched tables are compared by digest first and only
+# tables whose digests differ are compared per record. Digests of untouched
+# (baseline) tables and their records are cached per dataset version, so a
+# table that only one side touched is hashed on that side alone.
+
+
+class BaselineDigests:
+    """Per-process cache of baseline table and record digests, computed on first use."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries = {}
+
+    def get(self, data_path):
+        fingerprint = data_fingerprint(data_path)
+        with self.lock:
+            entry = self.entries.get(data_path)
+            if entry is None or entry["fingerprint"] != fingerprint:
+                entry = {"fingerprint": fingerprint, "tables": {}, "records": {}}
+                self.entries[data_path] = entry
+            return entry
+
+    def table(self, entry, table_name, table):
+        with self.lock:
+            if table_name not in entry["tables"]:
+                entry["tables"][table_name] = table_digest(table)
+            return entry["tables"][table_name]
+
+    def records(self, entry, table_name, table):
+        with self.lock:
+            if table_name not in entry["records"]:
+                entry["records"][table_name] = record_digests(table)
+            return entry["records"][table_name]
+
+
+baseline_digests = BaselineDigests()
+
+
+def action_name(action):
+    """Tool name of a session action ({'api_name'}) or an exported one ({'name'})."""
+    name = action.get('api_name') or action.get('name') or ''
+    return name[:-len("_invoke")] if name.endswith("_invoke") else name
+
+
+def run_side(data, actions, tools_instance, validators):
+    """Replay actions on data in place and return the errors they raised."""
+    errors = []
+    for index, action in enumerate(actions):
+        name = action_name(action)
+        method = getattr(tools_instance, name + "_invoke", None)
+        if method is None:
+            errors.append({'index': index, 'name': name, 'error': f"Unknown action {name}"})
+            continue
+        try:
+            arguments = prepare_arguments(name + "_invoke", json.loads(json.dumps(action.get('arguments') or {})),
+                                          validators)
+            method(data=data, **arguments)
+        except Exception as e:
+            errors.append({'index': index, 'name': name, 'error': str(e)})
+    return errors
+
+
+def compare_tables(old, new, old_records=None, new_records=None):
+    """
+    Record-level diff of one table, or None when it is unchanged.
+
+    old_records/new_records are the record digests of a side when already
+    known (the cached baseline digests of an untouched side).
+    """
+    if not isinstance(old, dict) or not isinstance(new, dict):
+        return None if old == new else {'replaced': diff_fields(old, new)}
+    old_records = old_records if old_records is not None else record_digests(old)
+    new_records = new_records if new_records is not None else record_digests(new)
+    added = {record_id: new[record_id] for record_id in new if record_id not in old}
+    removed = {record_id: old[record_id] for record_id in old if record_id not in new}
+    changed = {
+        record_id: diff_fields(old[record_id], new[record_id])
+        for record_id, digest in old_records.items()
+        if record_id in new_records and new_records[record_id] != digest
+    }
+    if not (added or removed or changed):
+        return None
+    return {'added': added, 'removed': removed, 'changed': changed}
+
+
+def compare_states(data_path, interface_path, actions_a, actions_b):
+    manifest = get_interface_manifest(interface_path)
+    tools_instance = get_tools_class(manifest["imports_set"], manifest["invoke_methods"])
+    validators = manifest["argument_validators"]
+    cached = baseline_digests.get(data_path)
+    sides = []
+    for actions in (actions_a, actions_b):
+        data = TrackedData(load_environment_data(data_path))
+        errors = run_side(data, actions, tools_instance, validators)
+        sides.append((data, errors))
+    (data_a, errors_a), (data_b, errors_b) = sides
+
+    # Table digests of each side, rehashing only the tables it touched. A
+    # table no action looked up is still the baseline table.
+    digests_a, digests_b = {}, {}
+    for data, digests in ((data_a, digests_a), (data_b, digests_b)):
+        for table_name in dict.keys(data):
+            table = dict.__getitem__(data, table_name)
+            if table_name in data.touched:
+                digests[table_name] = table_digest(table)
+            else:
+                digests[table_name] = baseline_digests.table(cached, table_name, table)
+
+    tables = {}
+    compared = 0
+    for table_name in sorted(set(digests_a) | set(digests_b)):
+        if table_name not in digests_a or table_name not in digests_b:
+            tables[table_name] = {
+                'table_added' if table_name in digests_b else 'table_removed': True,
+            }
+            continue
+        if digests_a[table_name] == digests_b[table_name]:
+            continue
+        compared += 1
+        old = dict.__getitem__(data_a, table_name)
+        new = dict.__getitem__(data_b, table_name)
+        old_records = new_records = None
+        if isinstance(old, dict) and table_name not in data_a.touched:
+            old_records = baseline_digests.records(cached, table_name, old)
+        if isinstance(new, dict) and table_name not in data_b.touched:
+            new_records = baseline_digests.records(cached, table_name, new)
+        change = compare_tables(old, new, old_records, new_records)
+        if change is not None:
+            tables[table_name] = change
+
+    summary = {'added': 0, 'removed': 0, 'changed': 0}
+    for change in tables.values():
+        for kind in summary:
+            summary[kind] += len(change.get(kind) or {})
+    return {
+        'data_hash_a': combine_digests(digests_a),
+        'data_hash_b': combine_digests(digests_b),
+        'identical': not tables,
+        'errors_a': errors_a,
+        'errors_b': errors_b,
+        'tables_total': len(set(digests_a) | set(digests_b)),
+        'tables_compared': compared,
+        'summary': summary,
+        'tables': tables,
+    }
+
+
+@state_comparison_bp.route('/state_comparison', strict_slashes=False, methods=["POST"])
+def state_comparison():
+    """
+    Replay two action lists against the same baseline and diff the resulting
+    databases. Environment and interface default to the current session.
+    """
+    passed_data = request.get_json(silent=True) or {}
+    environment = passed_data.get('environment') or session.get("environment")
+    interface = passed_data.get('interface') or session.get("interface")
+    actions_a = passed_data.get('actions_a')
+    actions_b = passed_data.get('actions_b')
+    if not isinstance(actions_a, list) or not isinstance(actions_b, list):
+        return jsonify({
+            'status': 'error',
+            'message': 'actions_a and actions_b must be lists of actions'
+        }), 400
+    if not all(isinstance(action, dict) for action in actions_a + actions_b):
+        return jsonify({
+            'status': 'error',
+            'message': 'Every action must be an object with a name and arguments'
+        }), 400
+    paths = resolve_paths(environment, interface) if environment and interface else None
+    if paths is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Choose an environment and interface first'
+        }), 400
+    data_path, interface_path = paths
+
+    try:
+        result = compare_states(data_path, interface_path, actions_a, actions_b)
+    except Exception as e:
+        print(f"Error comparing states: {e}")
+        return jsonify({
+            'status': 'error',
+            'message': 'Failed to compare database states'
+        }), 500
+
+    return jsonify({
+        'status': 'success',
+        'environment': environment,
+        'interface': interface,
+        **result,
+    }), 200
@@ -0,0 +1,117 @@
+from hashlib import sha256
+
+# Same hashing scheme as envs/base.py (Env.get_data_hash), so digests computed
+# here can be compared with the ones produced by tau_bench runs.
+
+
+def to_hashable(item):
+    if isinstance(item, dict):
+        return tuple((key, to_hashable(value)) for key, value in sorted(item.items()))
+    elif isinstance(item, list):
+        return tuple(to_hashable(element) for element in item)
+    elif isinstance(item, set):
+        return tuple(sorted(to_hashable(element) for element in item))
+    else:
+        return item
+
+
+def consistent_hash(value):
+    return sha256(str(value).encode("utf-8")).hexdigest()
+
+
+def data_digest(data):
+    """Digest of a whole {table_name: table} state."""
+    return consistent_hash(to_hashable(data))
+
+
+def table_digest(table):
+    """Digest of a single table, so unchanged tables need not be rehashed."""
+    return consistent_hash(to_hashable(table))
+
+
+def combine_digests(table_digests):
+    """Digest of a state from its {table_name: table_digest} map."""
+    return consistent_hash(tuple(sorted(table_digests.items())))
+
+
+def diff_tables(baseline, current):
+    """
+    Record-level changes that turn baseline into current.
+
+    Returns:
+        dict: {table_name: change} for changed tables only, where change is
+        {"upserted": {record_id: record}, "removed": [record_id, ...]} for
+        dict tables and {"replaced": table} for anything else or for tables
+        that were added. Tables missing from current are listed under the
+        "__removed_tables__" key.
+    """
+    diff = {}
+    for table_name, table in current.items():
+        base_table = baseline.get(table_name)
+        if base_table is table:
+            continue
+        if not isinstance(table, dict) or not isinstance(base_table, dict):
+            if table != base_table:
+                diff[table_name] = {"replaced": table}
+            continue
+        upserted = {
+            record_id: record for record_id, record in table.items()
+            if record_id not in base_table or base_table[record_id] != record
+        }
+        removed = [record_id for record_id in base_table if record_id not in table]
+        if upserted or removed:
+            diff[table_name] = {"upserted": upserted, "removed": removed}
+    removed_tables = [table_name for table_name in baseline if table_name not in current]
+    if removed_tables:
+        diff["__removed_tables__"] = removed_tables
+    return diff
+
+
+def apply_diff(data, diff):
+    """Apply a diff produced by diff_tables() to data in place and return it."""
+    for table_name, change in diff.items():
+        if table_name == "__removed_tables__":
+            for removed_table in change:
+                data.pop(removed_table, None)
+            continue
+        if "replaced" in change:
+            data[table_name] = change["replaced"]
+            continue
+        table = data.setdefault(table_name, {})
+        for record_id in change.get("removed", []):
+            table.pop(record_id, None)
+        table.update(change.get("upserted", {}))
+    return data
+
+
+def record_digests(table):
+    """{record_id: digest} of a dict table, to find changed records without comparing them."""
+    return {record_id: consistent_hash(to_hashable(record)) for record_id, record in table.items()}
+
+
+def diff_fields(old, new, path="", changes=None):
+    """
+    Field-level changes between two records.
+
+    Nested objects are compared key by key and reported under dotted paths;
+    lists and scalars are compared as a whole.
+
+    Returns:
+        dict: {"added": {path: value}, "removed": {path: value},
+        "changed": {path: {"old": value, "new": value}}}
+    """
+    if changes is None:
+        changes = {"added": {}, "removed": {}, "changed": {}}
+    if isinstance(old, dict) and isinstance(new, dict):
+        for key in old:
+            field_path = f"{path}.{key}" if path else str(key)
+            if key not in new:
+                changes["removed"][field_path] = old[key]
+            elif old[key] != new[key]:
+                diff_fields(old[key], new[key], field_path, changes)
+        for key in new:
+            if key not in old:
+                changes["added"][f"{path}.{key}" if path else str(key)] = new[key]
+    elif old != new:
+        changes["changed"][path] = {"old": old, "new": new}
+    return changes
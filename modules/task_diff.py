@@ -0,0 +1,374 @@
+import os
+import re
+import json
+from flask import Blueprint, request, jsonify
+from modules.action_gaps import action_hash, parse_arguments
+
+# Server-side diff for the task framework's "Task Difference Analyzer".
+#
+# Lines are matched with a patience diff: lines that occur exactly once on
+# both sides anchor the alignment and the gaps between anchors are diffed
+# with Myers' O(ND) algorithm, so large task exports with few changes cost
+# roughly their length instead of the n*m matrix the page used to build.
+# JSON input is compared structurally (re-serialized with sorted keys, so
+# key order and formatting do not show up as changes) and the task's actions
+# are aligned by name and arguments. Word-level changes are computed only for
+# lines inside changed hunks.
+
+task_diff_bp = Blueprint('task_diff', __name__)
+
+DIFF_CONTEXT_LINES = 3
+# Past this many edits a gap is reported as a plain replacement
+MAX_EDIT_DISTANCE = int(os.environ.get("TASK_DIFF_MAX_EDIT_DISTANCE", "2000"))
+MAX_WORD_DIFF_TOKENS = 2000
+WORD_PATTERN = re.compile(r'\s+|\w+|[^\w\s]')
+
+
+def myers_ops(a, b, alo, ahi, blo, bhi):
+    """
+    Shortest edit script between a[alo:ahi] and b[blo:bhi].
+
+    Returns:
+        list: ("=", i, j), ("-", i, None) and ("+", None, j) in order
+    """
+    n, m = ahi - alo, bhi - blo
+    max_d = min(n + m, MAX_EDIT_DISTANCE)
+    offset = max_d + 1
+    v = [0] * (2 * max_d + 3)
+    trace = []
+    for d in range(max_d + 1):
+        # Only diagonals -d-1..d+1 are read when backtracking through step d
+        trace.append(v[offset - d - 1:offset + d + 2])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[alo + x] == b[blo + y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                return backtrack(trace, alo, blo, n, m)
+    return [("-", alo + i, None) for i in range(n)] + [("+", None, blo + j) for j in range(m)]
+
+
+def backtrack(trace, alo, blo, x, y):
+    ops = []
+    for d in range(len(trace) - 1, -1, -1):
+        v = trace[d]
+        k = x - y
+        # trace[d] holds diagonals -d-1..d+1, so diagonal k is at k + d + 1
+        if k == -d or (k != d and v[k - 1 + d + 1] < v[k + 1 + d + 1]):
+            prev_k = k + 1
+        else:
+            prev_k = k - 1
+        prev_x = v[prev_k + d + 1]
+        prev_y = prev_x - prev_k
+        while x > prev_x and y > prev_y:
+            x -= 1
+            y -= 1
+            ops.append(("=", alo + x, blo + y))
+        if d > 0:
+            if x == prev_x:
+                ops.append(("+", None, blo + prev_y))
+            else:
+                ops.append(("-", alo + prev_x, None))
+        x, y = prev_x, prev_y
+    ops.reverse()
+    return ops
+
+
+def unique_anchors(a, b, alo, ahi, blo, bhi):
+    """Longest increasing run of (i, j) pairs of lines unique on both sides."""
+    counts = {}
+    for i in range(alo, ahi):
+        entry = counts.setdefault(a[i], [0, i, 0, None])
+        entry[0] += 1
+    for j in range(blo, bhi):
+        entry = counts.get(b[j])
+        if entry is not None:
+            entry[2] += 1
+            entry[3] = j
+    pairs = sorted((entry[1], entry[3]) for entry in counts.values() if entry[0] == 1 and entry[2] == 1)
+    if not pairs:
+        return []
+    # Patience sorting over the b positions
+    tails, tail_indexes, previous = [], [], [None] * len(pairs)
+    for index, (_, j) in enumerate(pairs):
+        low, high = 0, len(tails)
+        while low < high:
+            middle = (low + high) // 2
+            if tails[middle] < j:
+                low = middle + 1
+            else:
+                high = middle
+        if low > 0:
+            previous[index] = tail_indexes[low - 1]
+        if low == len(tails):
+            tails.append(j)
+            tail_indexes.append(index)
+        else:
+            tails[low] = j
+            tail_indexes[low] = index
+    anchors = []
+    index = tail_indexes[-1]
+    while index is not None:
+        anchors.append(pairs[index])
+        index = previous[index]
+    anchors.reverse()
+    return anchors
+
+
+def diff_lines(a, b):
+    """Line edit script of a to b, see myers_ops for its format."""
+    ops = []
+    # Explicit stack instead of recursion, so deep anchor nesting is fine
+    stack = [("range", 0, len(a), 0, len(b))]
+    while stack:
+        item = stack.pop()
+        if item[0] == "op":
+            ops.append(item[1])
+            continue
+        _, alo, ahi, blo, bhi = item
+        prefix = []
+        while alo < ahi and blo < bhi and a[alo] == b[blo]:
+            prefix.append(("=", alo, blo))
+            alo += 1
+            blo += 1
+        suffix = []
+        while ahi > alo and bhi > blo and a[ahi - 1] == b[bhi - 1]:
+            ahi -= 1
+            bhi -= 1
+            suffix.append(("=", ahi, bhi))
+        ops.extend(prefix)
+        anchors = unique_anchors(a, b, alo, ahi, blo, bhi) if alo < ahi and blo < bhi else []
+        pending = [("op", op) for op in reversed(suffix)]
+        if anchors:
+            parts = []
+            for i, j in anchors:
+                parts.append(("range", alo, i, blo, j))
+                parts.append(("op", ("=", i, j)))
+                alo, blo = i + 1, j + 1
+            parts.append(("range", alo, ahi, blo, bhi))
+            pending = parts + pending
+        else:
+            ops.extend(myers_ops(a, b, alo, ahi, blo, bhi))
+        stack.extend(reversed(pending))
+    return ops
+
+
+def diff_words(old_line, new_line):
+    """([[op, text]] for the old line, [[op, text]] for the new line), or None for very long lines."""
+    old_tokens = WORD_PATTERN.findall(old_line)
+    new_tokens = WORD_PATTERN.findall(new_line)
+    if len(old_tokens) + len(new_tokens) > MAX_WORD_DIFF_TOKENS:
+        return None
+    old_words, new_words = [], []
+
+    def push(words, op, text):
+        if words and words[-1][0] == op:
+            words[-1][1] += text
+        else:
+            words.append([op, text])
+
+    for op, i, j in myers_ops(old_tokens, new_tokens, 0, len(old_tokens), 0, len(new_tokens)):
+        if op == "=":
+            push(old_words, "=", old_tokens[i])
+            push(new_words, "=", new_tokens[j])
+        elif op == "-":
+            push(old_words, "-", old_tokens[i])
+        else:
+            push(new_words, "+", new_tokens[j])
+    return old_words, new_words
+
+
+def refine_hunk(lines):
+    """Attach word diffs to the removed/added line pairs of a hunk in place."""
+    index = 0
+    while index < len(lines):
+        if lines[index][0] != "-":
+            index += 1
+            continue
+        removed_start = index
+        while index < len(lines) and lines[index][0] == "-":
+            index += 1
+        added_start = index
+        while index < len(lines) and lines[index][0] == "+":
+            index += 1
+        for offset in range(min(added_start - removed_start, index - added_start)):
+            old_line, new_line = lines[removed_start + offset], lines[added_start + offset]
+            words = diff_words(old_line[1], new_line[1])
+            if words is not None:
+                old_line.append(words[0])
+                new_line.append(words[1])
+
+
+def build_hunks(a, b, ops, context=DIFF_CONTEXT_LINES):
+    """
+    Group an edit script into hunks with context lines.
+
+    Each hunk is {old_start, new_start, skipped, lines} where skipped is the
+    number of unchanged lines left out before it and lines are [op, text]
+    (plus [[op, text]] word segments on refined changed lines).
+    """
+    changed = [index for index, op in enumerate(ops) if op[0] != "="]
+    hunks = []
+    if not changed:
+        return hunks
+    ranges = []
+    for index in changed:
+        start, end = max(0, index - context), min(len(ops), index + context + 1)
+        if ranges and start <= ranges[-1][1]:
+            ranges[-1][1] = end
+        else:
+            ranges.append([start, end])
+    # Line numbers on both sides where each op starts
+    old_positions, new_positions = [], []
+    old_position = new_position = 0
+    for op in ops:
+        old_positions.append(old_position)
+        new_positions.append(new_position)
+        old_position += op[1] is not None
+        new_position += op[2] is not None
+    previous_end = 0
+    for start, end in ranges:
+        lines = [[op, a[i] if op != "+" else b[j]] for op, i, j in ops[start:end]]
+        refine_hunk(lines)
+        hunks.append({
+            'old_start': old_positions[start],
+            'new_start': new_positions[start],
+            'skipped': start - previous_end,
+            'lines': lines,
+        })
+        previous_end = end
+    return hunks
+
+
+def normalize(text):
+    """(lines, parsed JSON or None); JSON is re-serialized with sorted keys."""
+    try:
+        value = json.loads(text)
+    except ValueError:
+        return text.split("\n"), None
+    if not isinstance(value, (dict, list)):
+        return text.split("\n"), None
+    return json.dumps(value, indent=2, sort_keys=True, ensure_ascii=False).split("\n"), value
+
+
+def task_actions(value):
+    """[(name, arguments)] of a task export, a task or a bare action list, or None."""
+    if isinstance(value, dict):
+        task = value.get("task") if isinstance(value.get("task"), dict) else value
+        value = task.get("actions")
+    if not isinstance(value, list) or not all(isinstance(action, dict) and "name" in action for action in value):
+        return None
+    return [(action["name"], action.get("arguments", action.get("kwargs"))) for action in value]
+
+
+def argument_changes(old_arguments, new_arguments):
+    """{argument: {old, new}} for the arguments that differ."""
+    old_arguments, new_arguments = parse_arguments(old_arguments), parse_arguments(new_arguments)
+    if not isinstance(old_arguments, dict) or not isinstance(new_arguments, dict):
+        return {"": {"old": old_arguments, "new": new_arguments}}
+    changes = {}
+    for key in sorted(set(old_arguments) | set(new_arguments)):
+        if old_arguments.get(key) != new_arguments.get(key) or (key in old_arguments) != (key in new_arguments):
+            changes[key] = {"old": old_arguments.get(key), "new": new_arguments.get(key)}
+    return changes
+
+
+def diff_actions(old_actions, new_actions):
+    """
+    Action-level changes between two action lists.
+
+    Calls are compared by action_hash (tool name and arguments) and aligned
+    with diff_lines, the quadratic LCS of align_actions being too slow for
+    long action lists. Aligned calls are unchanged; remaining calls with the
+    same hash on both sides are moved. A removed and an added call to the
+    same tool are paired, in order, as one changed call with the arguments
+    that differ.
+    """
+    old_hashes = [action_hash(name, arguments) for name, arguments in old_actions]
+    new_hashes = [action_hash(name, arguments) for name, arguments in new_actions]
+    ops = diff_lines(old_hashes, new_hashes)
+    unmatched_new = {}
+    for op, _, j in ops:
+        if op == "+":
+            unmatched_new.setdefault(new_hashes[j], []).append(j)
+    moved, removed = [], []
+    for op, i, _ in ops:
+        if op != "-":
+            continue
+        if unmatched_new.get(old_hashes[i]):
+            moved.append({'name': old_actions[i][0], 'old_index': i, 'new_index': unmatched_new[old_hashes[i]].pop(0)})
+        else:
+            removed.append(i)
+    added = sorted(j for indexes in unmatched_new.values() for j in indexes)
+    changed = []
+    for i in list(removed):
+        j = next((j for j in added if new_actions[j][0] == old_actions[i][0]), None)
+        if j is None:
+            continue
+        removed.remove(i)
+        added.remove(j)
+        changed.append({
+            'name': old_actions[i][0],
+            'old_index': i,
+            'new_index': j,
+            'arguments': argument_changes(old_actions[i][1], new_actions[j][1]),
+        })
+    return {
+        'unchanged': sum(1 for op in ops if op[0] == "="),
+        'moved': moved,
+        'changed': changed,
+        'removed': [{'name': old_actions[i][0], 'old_index': i, 'arguments': parse_arguments(old_actions[i][1])}
+                    for i in removed],
+        'added': [{'name': new_actions[j][0], 'new_index': j, 'arguments': parse_arguments(new_actions[j][1])}
+                  for j in added],
+    }
+
+
+def diff_texts(old_text, new_text, context=DIFF_CONTEXT_LINES):
+    old_lines, old_value = normalize(old_text)
+    new_lines, new_value = normalize(new_text)
+    structural = old_value is not None and new_value is not None
+    if not structural:
+        old_lines, new_lines = old_text.split("\n"), new_text.split("\n")
+    ops = diff_lines(old_lines, new_lines)
+    stats = {"added": 0, "removed": 0, "unchanged": 0}
+    for op in ops:
+        stats[{"=": "unchanged", "-": "removed", "+": "added"}[op[0]]] += 1
+    result = {
+        'format': 'json' if structural else 'text',
+        'old_lines': len(old_lines),
+        'new_lines': len(new_lines),
+        'stats': stats,
+        'hunks': build_hunks(old_lines, new_lines, ops, context),
+        'actions': None,
+    }
+    if structural:
+        old_actions, new_actions = task_actions(old_value), task_actions(new_value)
+        if old_actions is not None and new_actions is not None:
+            result['actions'] = diff_actions(old_actions, new_actions)
+    return result
+
+
+@task_diff_bp.route('/task_diff', strict_slashes=False, methods=["POST"])
+def task_diff():
+    """ Hunks between two texts (or task exports) posted as {old, new} """
+    payload = request.get_json(silent=True) or {}
+    old_text, new_text = payload.get("old"), payload.get("new")
+    if not isinstance(old_text, str) or not isinstance(new_text, str):
+        return jsonify({'status': 'error', 'message': 'Both old and new texts are required'}), 400
+    try:
+        context = max(0, int(payload.get("context", DIFF_CONTEXT_LINES)))
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'context must be an integer'}), 400
+    try:
+        result = diff_texts(old_text, new_text, context)
+    except Exception as e:
+        print(f"Error computing task diff: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to compute task diff'}), 500
+    return jsonify({'status': 'success', **result}), 200
@@ -2,14 +2,32 @@ import os
 import json
 import ast
 import re
+import sys
+import importlib.util
+from functools import lru_cache
 from typing import Dict, Any
 from flask import Blueprint, render_template, request, jsonify, session, g, Response
+from modules.dataset_loader import load_environment_data
+from modules.result_encoding import (
+    loads,
+    parse_tool_output,
+    dumps_compact,
+    dumps_response,
+    append_response_field,
+    iter_response_chunks,
+)
+from modules.argument_validation import compile_argument_validator, invoke_accepts_extra
+from modules.profiling import start_profile
 
 task_framework_bp = Blueprint('task_framework', __name__)
 
 # Base path for environments - resolved at module load time (safe, no user input)
 ENVS_BASE_PATH = os.path.abspath("envs")
 
+# Tool outputs at least this large (characters of JSON) are streamed back by
+# execute_api instead of being encoded into a single response body.
+STREAM_RESPONSE_THRESHOLD = int(os.environ.get("STREAM_RESPONSE_THRESHOLD", 1024 * 1024))
+
 
 def validate_path_component(component):
     """
@@ -207,7 +225,32 @@ def extract_file_info(file_path: str) -> Dict[str, Any]:
 ######################## END UTILITY FUNCTIONS ##############################
 
 
+SHARED_ENV_MODULE_PATTERN = re.compile(r'^\s*from\s+tau_bench\.envs\.(\w+)\s+import\b')
+
+
+def register_shared_env_modules(imports_set):
+    """
+    Make helper modules that live directly under envs/ (e.g. envs/page_hierarchy.py)
+    importable as tau_bench.envs.<name> for the tool code executed below.
+    """
+    for import_line in imports_set:
+        match = SHARED_ENV_MODULE_PATTERN.match(import_line)
+        if not match or match.group(1) == "tool":
+            continue
+        module_name = f"tau_bench.envs.{match.group(1)}"
+        if module_name in sys.modules:
+            continue
+        module_path = safe_join_path(ENVS_BASE_PATH, match.group(1))
+        if module_path is None or not os.path.isfile(module_path + ".py"):
+            continue
+        spec = importlib.util.spec_from_file_location(module_name, module_path + ".py")
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[module_name] = module
+
+
 def create_tools_class(imports_set, invoke_methods):
+    register_shared_env_modules(imports_set)
     # Create the class dynamically in memory
     imports_code = '\n'.join(sorted(imports_set))
     
@@ -226,6 +269,99 @@ class Tools:
     # session["tools_class_code"] = class_code 
     return namespace['Tools']
 
+@lru_cache(maxsize=64)
+def _compile_tools_class(imports, invoke_methods):
+    return create_tools_class(imports, invoke_methods)
+
+
+def get_tools_class(imports_set, invoke_methods):
+    """Return the Tools class for the given imports and invoke methods, compiled once per process."""
+    return _compile_tools_class(tuple(sorted(imports_set)), tuple(invoke_methods))
+
+
+def build_interface_manifest(interface_path):
+    """
+    Parse every tool file of an interface directory.
+    The interface_path should be an absolute path that has already been validated.
+
+    Returns:
+        dict: functions_info (schemas sent to the page), invoke_methods (renamed
+        invoke sources used to build the Tools class), imports_set,
+        float_paths (API name -> float path trie of its arguments) and
+        argument_validators (API name -> compiled argument validator)
+    """
+    API_files = os.listdir(interface_path)
+    invoke_methods = []
+    functionsInfo = []
+    importsSet = set()
+    floatPaths = {}
+    argumentValidators = {}
+    for api_file in API_files:
+        # Validate filename before using it
+        if not validate_filename(api_file):
+            continue
+        if api_file.endswith(".py") and not api_file.startswith("__"):
+            # Construct path and verify it stays within base directory
+            file_path = os.path.join(interface_path, api_file)
+            abs_interface = os.path.abspath(interface_path)
+            abs_file = os.path.abspath(file_path)
+            if not abs_file.startswith(abs_interface + os.sep):
+                continue  # Skip files that would escape the directory
+            try:
+                function_info, invoke_method, imports = extract_file_info(abs_file)
+                importsSet.update(imports)
+                invoke_method = invoke_method.replace("invoke", function_info.get('name', 'invoke')+"_invoke")
+                invoke_methods.append(invoke_method)
+                functionsInfo.append(function_info)
+                floatPaths[function_info.get('name', '')] = compile_argument_float_paths(function_info.get('parameters', {}))
+                argumentValidators[function_info.get('name', '')] = compile_argument_validator(
+                    function_info, accepts_extra=invoke_accepts_extra(invoke_method)
+                )
+
+            except SyntaxError as e:
+                print(f"Syntax error in {api_file}: {e}")
+            except Exception as e:
+                print(f"Error processing {api_file}: {e}")
+
+    return {
+        'functions_info': functionsInfo,
+        'invoke_methods': invoke_methods,
+        'imports_set': importsSet,
+        'float_paths': floatPaths,
+        'argument_validators': argumentValidators,
+    }
+
+
+def interface_fingerprint(interface_path):
+    """Names, sizes and mtimes of the tool files of an interface directory."""
+    fingerprint = []
+    for api_file in sorted(os.listdir(interface_path)):
+        if api_file.endswith(".py"):
+            stat = os.stat(os.path.join(interface_path, api_file))
+            fingerprint.append((api_file, stat.st_size, stat.st_mtime_ns))
+    return tuple(fingerprint)
+
+
+# interface path -> (fingerprint, manifest)
+_interface_manifests = {}
+
+
+def get_interface_manifest(interface_path):
+    """
+    Return the parsed manifest of an interface directory, re-parsing only when
+    one of its tool files changed. The returned manifest is shared: copy it
+    before modifying it.
+    """
+    interface_path = os.path.abspath(interface_path)
+    fingerprint = interface_fingerprint(interface_path)
+    cached = _interface_manifests.get(interface_path)
+    if cached is not None and cached[0] == fingerprint:
+        return cached[1]
+    manifest = build_interface_manifest(interface_path)
+    _interface_manifests[interface_path] = (fingerprint, manifest)
+    return manifest
+
+
 def arguments_processing(arguments):
     cleaned_arguments = {}
     for argument, argument_value in arguments.items():
@@ -310,46 +446,11 @@ def env_interface():
                         'message': 'Environment or interface not found'
                     }), 404
 
-                API_files = os.listdir(INTERFACE_PATH)
-                invoke_methods = []
-                functionsInfo = []
-                importsSet = set()
-                for api_file in API_files:
-                    # Validate filename before using it
-                    if not validate_filename(api_file):
-                        continue
-                    if api_file.endswith(".py") and not api_file.startswith("__"):
-                        # Construct path and verify it stays within base directory
-                        file_path = os.path.join(INTERFACE_PATH, api_file)
-                        abs_interface = os.path.abspath(INTERFACE_PATH)
-                        abs_file = os.path.abspath(file_path)
-                        if not abs_file.startswith(abs_interface + os.sep):
-                            continue  # Skip files that would escape the directory
-                        try:
-                            function_info, invoke_method, imports = extract_file_info(abs_file)
-                            # print(f"Extracted function info: {function_info}")
-                            # if not function_info:
-                            #     print(f"No function info found in {api_file}, skipping.")
-                            #     continue
-                            importsSet.update(imports)
-                            invoke_method = invoke_method.replace("invoke", function_info.get('name', 'invoke')+"_invoke")
-                            invoke_methods.append(invoke_method)
-                            functionsInfo.append(function_info)
-
-                        except SyntaxError as e:
-                            print(f"Syntax error in {api_file}: {e}")
-                        except Exception as e:
-                            print(f"Error processing {api_file}: {e}")
-                
-                # temp_dir = "/tmp"
-                # tools_file_path = os.path.join(temp_dir, "tools.py")
-                # with open(tools_file_path, "w") as new_file:
-                #     new_file.write('\n'.join(sorted(importsSet)) + "\n\n")
-                #     new_file.write("class Tools:\n")
-                #     for invoke_method in invoke_methods:
-                #         new_file.write("    @staticmethod\n" + invoke_method + "\n\n")
-                session["imports_set"] = importsSet
-                session["invoke_methods"] = invoke_methods
+                manifest = get_interface_manifest(INTERFACE_PATH)
+                functionsInfo = manifest["functions_info"]
+                session["interface"] = interface
+                session["imports_set"] = set(manifest["imports_set"])
+                session["invoke_methods"] = list(manifest["invoke_methods"])
                 session["actions"] = []
                 # print("Imports set:", session["imports_set"])
                 return jsonify({
@@ -376,10 +477,11 @@ def env_interface():
             'message': 'Choose environment and interface endpoint is working'
         })
 
-def execute_api_utility(api_name, arguments):
-    tools_instance = create_tools_class(session.get("imports_set", []), session.get("invoke_methods", []))
+def execute_api_utility(api_name, arguments, validated=False):
+    tools_instance = get_tools_class(session.get("imports_set", []), session.get("invoke_methods", []))
     # print('executing ...')
-    arguments = arguments_processing(arguments)
+    if not validated:
+        arguments = arguments_processing(arguments)
     if hasattr(tools_instance, api_name):
         # try:
             # print(g.data)
@@ -406,6 +508,32 @@ def execute_api_utility(api_name, arguments):
     #         'message': f'API {api_name} not found'
     #     }), 404
 
+def prepare_arguments(api_name, arguments, validators=None):
+    """
+    Arguments of a recorded action ready to call invoke_method api_name with:
+    coerced by the tool's validator when one is given, otherwise cleaned by
+    arguments_processing.
+    """
+    name = api_name[:-len("_invoke")] if api_name.endswith("_invoke") else api_name
+    validate = validators.get(name) if validators else None
+    if validate is None:
+        return arguments_processing(arguments)
+    return validate(arguments)[0]
+
+
+def run_actions(data, actions, imports_set, invoke_methods, validators=None):
+    """
+    Replay recorded session actions ({'api_name', 'arguments'}) against data in place.
+    validators are the argument_validators of the interface manifest, if known.
+    """
+    tools_instance = get_tools_class(imports_set, invoke_methods)
+    for action in actions:
+        api_name = action.get('api_name')
+        if hasattr(tools_instance, api_name):
+            arguments = prepare_arguments(api_name, action.get('arguments', {}), validators)
+            getattr(tools_instance, api_name)(data=data, **arguments)
+    return data
+
 # def convert_floats_to_strings(obj):
 #     """Recursively convert all float values to strings with .0 preserved"""
 #     if isinstance(obj, dict):
@@ -462,56 +590,102 @@ def detect_float_fields(obj, parent_key='', float_fields=None):
     
     return float_fields
 
-def apply_float_fields(obj, float_fields, current_path=''):
+def compile_float_paths(schema):
     """
-    Recursively convert integers to floats for fields specified in float_fields.
-    
+    Compile the number-typed fields of a JSON schema into a path trie.
+
+    Each node is a dict with 'float' (convert integers found here), 'fields'
+    (property name -> node) and 'items' (node for array items). Branches
+    without any number-typed field are left out.
+
+    Returns:
+        dict or None: the trie, or None if nothing under schema is a number
+    """
+    if not isinstance(schema, dict):
+        return None
+    types = schema.get('type')
+    types = types if isinstance(types, list) else [types]
+    fields = {}
+    properties = schema.get('properties')
+    if isinstance(properties, dict):
+        for name, property_schema in properties.items():
+            child = compile_float_paths(property_schema)
+            if child is not None:
+                fields[name] = child
+    items = compile_float_paths(schema.get('items'))
+    # An integer is already valid where the schema also allows "integer"
+    is_float = ('number' in types or 'float' in types) and 'integer' not in types
+    if not is_float and not fields and items is None:
+        return None
+    return {'float': is_float, 'fields': fields, 'items': items}
+
+
+def compile_argument_float_paths(parameters):
+    """Float path trie of a get_info 'parameters' properties dict (see compile_float_paths)."""
+    return compile_float_paths({'type': 'object', 'properties': parameters})
+
+
+@lru_cache(maxsize=256)
+def compile_float_field_list(float_fields):
+    """
+    Float path trie of dotted field paths like ('holding_data.quantity',), as
+    sent by the frontend in argument_float_fields.
+    """
+    root = {'float': False, 'fields': {}, 'items': None}
+    for float_field in float_fields:
+        node = root
+        for key in float_field.split('.'):
+            node = node['fields'].setdefault(key, {'float': False, 'fields': {}, 'items': None})
+        node['float'] = True
+    return root
+
+
+def apply_float_paths(value, node):
+    """
+    Convert integers to floats at the positions marked in a float path trie.
+    Dicts and lists are updated in place; only paths in the trie are visited.
+
+    Returns:
+        The converted value
+    """
+    if node is None:
+        return value
+    if node['float'] and type(value) is int:
+        return float(value)
+    if node['fields'] and isinstance(value, dict):
+        for key, child in node['fields'].items():
+            if key in value:
+                value[key] = apply_float_paths(value[key], child)
+    elif node['items'] is not None and isinstance(value, list):
+        for i, item in enumerate(value):
+            value[i] = apply_float_paths(item, node['items'])
+    return value
+
+
+def apply_float_fields(obj, float_fields):
+    """
+    Convert integers to floats for the dotted field paths in float_fields.
+
     Args:
-        obj: The object to process (dict or list)
+        obj: The arguments dict to process
         float_fields: List of field paths like ['holding_data.quantity']
-        current_path: Current path in the object hierarchy (used internally)
-    
+
     Returns:
         Modified object with integers converted to floats
     """
-    if isinstance(obj, dict):
-        for key, value in obj.items():
-            # Build the full path for this key
-            full_path = f"{current_path}.{key}" if current_path else key
-            
-            # Check if this field should be converted to float
-            should_be_float = False
-            for float_field in float_fields:
-                # Match full path or check if the field name matches at the end of path
-                if full_path == float_field:
-                    should_be_float = True
-                    break
-                # Also check if current path + key matches the float_field
-                elif float_field.endswith(f".{key}"):
-                    parent_path = '.'.join(float_field.split('.')[:-1])
-                    if current_path == parent_path:
-                        should_be_float = True
-                        break
-            
-            # Convert to float if needed
-            if should_be_float and isinstance(value, int):
-                obj[key] = float(value)
-                # print(f"  ✓ Converted {full_path}: {value} (int) -> {float(value)} (float)")
-            
-            # Recursively process nested structures
-            if isinstance(value, dict):
-                apply_float_fields(value, float_fields, full_path)
-            elif isinstance(value, list):
-                for i, item in enumerate(value):
-                    if isinstance(item, dict):
-                        apply_float_fields(item, float_fields, f"{full_path}[{i}]")
-    
-    elif isinstance(obj, list):
-        for i, item in enumerate(obj):
-            if isinstance(item, dict):
-                apply_float_fields(item, float_fields, f"{current_path}[{i}]")
-    
-    return obj
+    return apply_float_paths(obj, compile_float_field_list(tuple(float_fields)))
+
+
+def get_session_manifest():
+    """Cached manifest of the interface chosen in the session, or None."""
+    environment = session.get("environment")
+    interface = session.get("interface")
+    if not environment or not interface or not validate_path_component(interface):
+        return None
+    interface_path = safe_join_path(ENVS_BASE_PATH, environment, "tools", f"interface_{interface}")
+    if interface_path is None or not os.path.isdir(interface_path):
+        return None
+    return get_interface_manifest(interface_path)
 
 
 @task_framework_bp.route('/execute_api', strict_slashes=False, methods=["GET", "POST"])
@@ -550,53 +724,65 @@ def execute_api():
             'message': 'Data directory not found'
         }), 404
 
-    data_files = os.listdir(DATA_PATH)
-    # print("Loaded data:")
-    abs_data_path = os.path.abspath(DATA_PATH)
-    for data_file in data_files:
-        # Validate filename before using it
-        if not validate_filename(data_file):
-            continue
-        if data_file.endswith(".json"):
-            data_file_path = os.path.join(DATA_PATH, data_file)
-            # Verify the path stays within the data directory
-            abs_file_path = os.path.abspath(data_file_path)
-            if not abs_file_path.startswith(abs_data_path + os.sep):
-                continue  # Skip files that would escape the directory
-            with open(abs_file_path, "r") as file:
-                g.data[data_file.split('.')[0]] = json.load(file)
-    
-    for action in session.get("actions", []):
-        # print('session:', session.get("actions"))
-        api_name = action.get('api_name')
-        execute_api_utility(api_name, action.get('arguments', {}))
-    
     api_name = passed_data.get('api_name')
-    api_name = api_name + "_invoke" if api_name else None
     if not api_name:
         return jsonify({
             'status': 'error',
             'message': 'API name is required'
         }), 400
 
-    
+    profile = start_profile(environment, api_name, passed_data.get('profile'))
+    manifest = get_session_manifest()
+    validators = manifest["argument_validators"] if manifest is not None else None
     arguments = passed_data.get('parameters', {})
     argument_float_fields = passed_data.get('argument_float_fields', [])  # Get float fields from frontend
-    cleaned_arguments = (arguments)
-    arguments = cleaned_arguments
-    
-    # Convert integers to floats based on argument_float_fields
+
+    # Check and coerce the arguments against the tool's schema before any
+    # data is loaded or replayed
+    validate = validators.get(api_name) if validators else None
+    argument_warnings = []
+    if validate is not None:
+        with profile.phase("validate"):
+            arguments, errors, argument_warnings = validate(arguments)
+        if errors:
+            response = {
+                'status': 'error',
+                'message': f"Invalid arguments for {api_name}: " + '; '.join(errors),
+                'errors': errors
+            }
+            summary = profile.finish(status="invalid_arguments")
+            if summary is not None:
+                response['profile'] = summary
+            return jsonify(response), 400
+
+    # Convert integers to floats for number-typed parameters of the API's
+    # schema, plus any extra fields flagged by the frontend
+    float_paths = manifest["float_paths"].get(api_name) if manifest is not None else None
+    if float_paths is not None and isinstance(arguments, dict):
+        arguments = apply_float_paths(arguments, float_paths)
     if argument_float_fields:
         # print(f"Float fields to apply: {argument_float_fields}")
         # print(f"Arguments BEFORE float conversion: {arguments}")
         arguments = apply_float_fields(arguments, argument_float_fields)
         # print(f"Arguments AFTER float conversion: {arguments}")
-    
-    
+
+    # print("Loaded data:")
+    with profile.phase("load"):
+        g.data.update(load_environment_data(DATA_PATH))
+
+    with profile.phase("compile"):
+        get_tools_class(session.get("imports_set", []), session.get("invoke_methods", []))
+
+    with profile.phase("replay"):
+        run_actions(g.data, session.get("actions", []), session.get("imports_set", []), session.get("invoke_methods", []), validators)
+
+    api_name = api_name + "_invoke"
+
     # tools_instance = create_tools_class(session.get("imports_set", []), session.get("invoke_methods", []))
     # if hasattr(tools_instance, api_name):
     try:
-        result = execute_api_utility(api_name, arguments)
+        with profile.tool():
+            result = execute_api_utility(api_name, arguments, validated=validate is not None)
         # print(g.data)
         # Dynamically call the method with the provided arguments
         # print("Executing API:", api_name, "with arguments:", arguments)
@@ -606,12 +792,41 @@ def execute_api():
             'api_name': api_name,
             'arguments': arguments
         })
-        parsed_result = json.loads(result) if isinstance(result, str) else result
-        float_fields = list(detect_float_fields(parsed_result))
+        if isinstance(result, str) and len(result) >= STREAM_RESPONSE_THRESHOLD:
+            # Large outputs (e.g. unpaged discover_* results) are encoded
+            # record by record, collecting float fields on the way, instead
+            # of into one more full-size copy. The profile is finished once
+            # the output is encoded and sent as the body's last field, so
+            # its wall time includes streaming the response.
+            with profile.phase("serialize"):
+                output = loads(result)
+            return Response(iter_response_chunks(output, trailing_fields=lambda: {
+                                'profile': profile.finish(),
+                                'warnings': argument_warnings or None,
+                            }), status=200, mimetype='application/json')
+        with profile.phase("serialize"):
+            if isinstance(result, str):
+                parsed_result, float_fields = parse_tool_output(result)
+            else:
+                parsed_result, float_fields = result, detect_float_fields(result)
+            float_fields = list(float_fields)
         # parsed_result = convert_floats_to_strings(parsed_result)
         # print("parsed_res:" , (parsed_result))
         # print(type(result))
-        return jsonify({'output': parsed_result, 'float_fields': float_fields}), 200
+        payload = {'output': parsed_result, 'float_fields': float_fields}
+        if argument_warnings:
+            # Type mismatches against the tool's schema, not enforced
+            payload['warnings'] = argument_warnings
+        with profile.phase("serialize"):
+            body = dumps_response(payload)
+            if body is None and profile.enabled:
+                body = dumps_compact(payload) + '\n'
+        summary = profile.finish()
+        if summary is not None:
+            body = append_response_field(body, 'profile', summary)
+        if body is not None:
+            return Response(body, status=200, mimetype='application/json')
+        return jsonify(payload), 200
         
         # return jsonify({
         #     'output': json.loads(result) if isinstance(result, str) else result
@@ -622,10 +837,14 @@ def execute_api():
             return_message = "Click on GO to reload the session"
         else:
             return_message = "An error occurred"
-        return jsonify({
+        response = {
             'status': 'error',
             'message': f'Failed to execute API: {return_message}'
-        }), 500
+        }
+        summary = profile.finish(status="error")
+        if summary is not None:
+            response['profile'] = summary
+        return jsonify(response), 500
 # else:
 #     return jsonify({
 #         'status': 'error',
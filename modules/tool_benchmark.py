@@ -0,0 +1,211 @@
+import os
+import re
+import ast
+import csv
+import json
+import time
+import argparse
+import statistics
+from datetime import datetime, timezone
+from modules.dataset_loader import load_environment_data
+from modules.preload import discover_environments, discover_interfaces
+from modules.task_framework import (
+    ENVS_BASE_PATH,
+    get_interface_manifest,
+    get_tools_class,
+    prepare_arguments,
+)
+
+# Micro-benchmark of the envs/*/tools/interface_N tools. Calls come from the
+# actions of the tasks in envs/<env>/interface_N_tasks.py: each task is
+# replayed in order on a fresh copy of the real dataset, so every call sees
+# the state the task expects, and each tool call is timed on its own.
+#
+#   python -m modules.tool_benchmark [env ...] --repeat 5 --output bench.json
+#   python -m modules.tool_benchmark --baseline bench.json --threshold 1.5
+#
+# With --baseline the run exits with status 1 if a tool's median time grew
+# by more than --threshold times (and by more than --min-delta-ms).
+
+REPORT_FORMAT_VERSION = 1
+TASKS_FILE_PATTERN = re.compile(r'^interface_(\d+)_tasks\.py$')
+
+
+def load_task_actions(tasks_path):
+    """
+    Action lists of the tasks in an interface_N_tasks.py file, read from the
+    source so tau_bench does not need to be importable.
+
+    Returns:
+        list: one [(tool name, kwargs), ...] list per task
+    """
+    with open(tasks_path, "r") as file:
+        tree = ast.parse(file.read())
+    tasks = []
+    for node in ast.walk(tree):
+        if not (isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'Task'):
+            continue
+        actions_node = next((keyword.value for keyword in node.keywords if keyword.arg == 'actions'), None)
+        if not isinstance(actions_node, ast.List):
+            continue
+        actions = []
+        for element in actions_node.elts:
+            if not (isinstance(element, ast.Call) and getattr(element.func, 'id', None) == 'Action'):
+                continue
+            keywords = {keyword.arg: keyword.value for keyword in element.keywords}
+            try:
+                name = ast.literal_eval(keywords['name'])
+                kwargs = ast.literal_eval(keywords['kwargs']) if 'kwargs' in keywords else {}
+            except (KeyError, ValueError, SyntaxError):
+                continue
+            actions.append((name, kwargs))
+        if actions:
+            tasks.append(actions)
+    return tasks
+
+
+def benchmark_interface(environment, interface_dir, repeat=3, envs_path=ENVS_BASE_PATH):
+    """
+    Time every task action of one interface.
+
+    Returns:
+        dict: tool name -> {'samples': [ms, ...], 'errors': n}, plus the
+        names of the interface tools no task calls under None
+    """
+    interface_number = interface_dir[len("interface_"):]
+    tasks_path = os.path.join(envs_path, environment, f"interface_{interface_number}_tasks.py")
+    data_path = os.path.join(envs_path, environment, "data")
+    manifest = get_interface_manifest(os.path.join(envs_path, environment, "tools", interface_dir))
+    tools_instance = get_tools_class(manifest["imports_set"], manifest["invoke_methods"])
+    tasks = load_task_actions(tasks_path) if os.path.isfile(tasks_path) else []
+
+    results = {}
+    for _ in range(repeat):
+        for actions in tasks:
+            data = load_environment_data(data_path)
+            for name, kwargs in actions:
+                method = getattr(tools_instance, name + "_invoke", None)
+                if method is None:
+                    continue
+                entry = results.setdefault(name, {'samples': [], 'errors': 0})
+                arguments = prepare_arguments(name + "_invoke", json.loads(json.dumps(kwargs)),
+                                              manifest["argument_validators"])
+                start = time.perf_counter()
+                try:
+                    method(data=data, **arguments)
+                except Exception:
+                    entry['errors'] += 1
+                    continue
+                entry['samples'].append((time.perf_counter() - start) * 1000)
+
+    covered = set(results)
+    results[None] = sorted(info['name'] for info in manifest["functions_info"] if info['name'] not in covered)
+    return results
+
+
+def summarize(samples):
+    ordered = sorted(samples)
+    return {
+        'calls': len(ordered),
+        'median_ms': round(statistics.median(ordered), 4),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 4),
+        'max_ms': round(ordered[-1], 4),
+        'total_ms': round(sum(ordered), 4),
+    }
+
+
+def run_benchmark(environments=None, repeat=3, envs_path=ENVS_BASE_PATH):
+    """Benchmark the given environments (all of them by default) and return the report."""
+    report = {
+        'version': REPORT_FORMAT_VERSION,
+        'created_at': datetime.now(timezone.utc).isoformat(),
+        'repeat': repeat,
+        'tools': [],
+        'uncovered': {},
+    }
+    for environment in environments or discover_environments(envs_path):
+        for interface_dir in discover_interfaces(environment, envs_path):
+            try:
+                results = benchmark_interface(environment, interface_dir, repeat, envs_path)
+            except Exception as e:
+                print(f"Skipping {environment}/{interface_dir}: {e}")
+                continue
+            uncovered = results.pop(None)
+            if uncovered:
+                report['uncovered'][f"{environment}/{interface_dir}"] = uncovered
+            for name, entry in sorted(results.items()):
+                if not entry['samples']:
+                    continue
+                row = {'environment': environment, 'interface': interface_dir, 'tool': name, 'errors': entry['errors']}
+                row.update(summarize(entry['samples']))
+                report['tools'].append(row)
+            print(f"Benchmarked {environment}/{interface_dir}: {len(results)} tools, "
+                  f"{len(uncovered)} without task calls", flush=True)
+    report['tools'].sort(key=lambda row: row['median_ms'], reverse=True)
+    return report
+
+
+def tool_key(row):
+    return (row['environment'], row['interface'], row['tool'])
+
+
+def find_regressions(report, baseline, threshold=1.5, min_delta_ms=0.5):
+    """Tools whose median grew by more than threshold times and min_delta_ms since baseline."""
+    previous = {tool_key(row): row for row in baseline.get('tools', [])}
+    regressions = []
+    for row in report['tools']:
+        before = previous.get(tool_key(row))
+        if before is None:
+            continue
+        delta = row['median_ms'] - before['median_ms']
+        if delta > min_delta_ms and row['median_ms'] > before['median_ms'] * threshold:
+            regressions.append({
+                'environment': row['environment'],
+                'interface': row['interface'],
+                'tool': row['tool'],
+                'baseline_median_ms': before['median_ms'],
+                'median_ms': row['median_ms'],
+                'ratio': round(row['median_ms'] / before['median_ms'], 2) if before['median_ms'] else None,
+            })
+    return regressions
+
+
+def write_csv(report, csv_path):
+    fields = ['environment', 'interface', 'tool', 'calls', 'errors', 'median_ms', 'p95_ms', 'max_ms', 'total_ms']
+    with open(csv_path, "w", newline="") as file:
+        writer = csv.DictWriter(file, fieldnames=fields)
+        writer.writeheader()
+        for row in report['tools']:
+            writer.writerow({field: row[field] for field in fields})
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark envs/*/tools/interface_* tools on their task actions")
+    parser.add_argument("environments", nargs="*", help="Environments to benchmark (default: all)")
+    parser.add_argument("--envs-path", default="envs", help="Path to the envs directory")
+    parser.add_argument("--repeat", type=int, default=3, help="Times each task is replayed")
+    parser.add_argument("--output", default="tool_benchmark.json", help="JSON report path")
+    parser.add_argument("--csv", help="Also write the per tool rows to this CSV file")
+    parser.add_argument("--baseline", help="Earlier JSON report to compare against")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Median slowdown ratio counted as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=0.5, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--top", type=int, default=20, help="Slowest tools to print")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.environments, args.repeat, os.path.abspath(args.envs_path))
+    if args.baseline:
+        with open(args.baseline, "r") as file:
+            report['regressions'] = find_regressions(report, json.load(file), args.threshold, args.min_delta_ms)
+    with open(args.output, "w") as file:
+        json.dump(report, file, indent=2)
+    if args.csv:
+        write_csv(report, args.csv)
+
+    for row in report['tools'][:args.top]:
+        print(f"{row['median_ms']:10.3f} ms  p95 {row['p95_ms']:10.3f} ms  "
+              f"{row['environment']}/{row['interface']}/{row['tool']} ({row['calls']} calls)")
+    for regression in report.get('regressions', []):
+        print(f"REGRESSION {regression['environment']}/{regression['interface']}/{regression['tool']}: "
+              f"{regression['baseline_median_ms']:.3f} -> {regression['median_ms']:.3f} ms")
+    if report.get('regressions'):
+        raise SystemExit(1)
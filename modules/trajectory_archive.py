@@ -0,0 +1,413 @@
+import os
+import json
+import zlib
+import sqlite3
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from flask import Blueprint, request, jsonify
+from modules.action_gaps import (
+    SIGNATURE_VERSION,
+    action_hash,
+    aggregate_gaps,
+    ground_truth_actions,
+    is_passed,
+    load_trials,
+    model_actions,
+    trial_gaps,
+)
+
+# Server-side archive of trial results for the trajectory viewer. Result
+# files are ingested once: each trial is stored compressed next to a row of
+# indexed fields (environment, interface, task, reward, tools called) with
+# its action signatures and ground truth gaps computed up front. The viewer
+# pages through trial summaries and fetches a full trial only when it is
+# shown.
+#
+#   python -m modules.trajectory_archive ingest hr_experts 1 results.json
+#   python -m modules.trajectory_archive upgrade
+#
+# Each trial row records the action_gaps.SIGNATURE_VERSION its signatures
+# and gaps were computed with. Rows from an older version are recomputed
+# from the stored trial the first time the archive is opened by a process
+# (or with the upgrade command).
+
+trajectory_archive_bp = Blueprint('trajectory_archive', __name__)
+
+TRAJECTORY_ARCHIVE_PATH = os.environ.get("TRAJECTORY_ARCHIVE_PATH", os.path.abspath("trajectory_archive.sqlite3"))
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    name TEXT,
+    environment TEXT,
+    interface TEXT,
+    ingested_at TEXT,
+    trials INTEGER
+);
+CREATE TABLE IF NOT EXISTS trials (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    position INTEGER,
+    environment TEXT,
+    interface TEXT,
+    task_key TEXT,
+    task_id TEXT,
+    instruction TEXT,
+    reward REAL,
+    passed INTEGER,
+    complete INTEGER,
+    num_turns INTEGER,
+    num_tool_calls INTEGER,
+    missing INTEGER,
+    extra INTEGER,
+    signatures TEXT,
+    gaps TEXT,
+    body BLOB,
+    signature_version INTEGER
+);
+CREATE TABLE IF NOT EXISTS trial_tools (
+    trial_id INTEGER NOT NULL REFERENCES trials(id) ON DELETE CASCADE,
+    tool TEXT
+);
+CREATE INDEX IF NOT EXISTS trials_environment ON trials(environment, interface);
+CREATE INDEX IF NOT EXISTS trials_task ON trials(task_key);
+CREATE INDEX IF NOT EXISTS trials_run ON trials(run_id, position);
+CREATE INDEX IF NOT EXISTS trials_reward ON trials(passed, reward);
+CREATE INDEX IF NOT EXISTS trial_tools_tool ON trial_tools(tool, trial_id);
+"""
+
+SUMMARY_COLUMNS = (
+    "id", "run_id", "position", "environment", "interface", "task_key", "task_id",
+    "reward", "passed", "complete", "num_turns", "num_tool_calls", "missing", "extra",
+)
+
+
+# Archives already checked for stale signatures by this process
+_upgraded_archives = set()
+
+
+def connect(path=None):
+    path = path or TRAJECTORY_ARCHIVE_PATH
+    connection = sqlite3.connect(path, timeout=30)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA foreign_keys=ON")
+    connection.executescript(SCHEMA)
+    if path not in _upgraded_archives:
+        columns = {row["name"] for row in connection.execute("PRAGMA table_info(trials)")}
+        if "signature_version" not in columns:
+            # Archives created before rows were versioned
+            connection.execute("ALTER TABLE trials ADD COLUMN signature_version INTEGER")
+        upgraded = upgrade_trials(connection)
+        if upgraded:
+            print(f"Recomputed gaps of {upgraded} archived trials for signature version {SIGNATURE_VERSION}")
+        _upgraded_archives.add(path)
+    return connection
+
+
+def upgrade_trials(connection):
+    """Recompute signatures and gaps of rows stored with an older SIGNATURE_VERSION; returns the count."""
+    rows = connection.execute(
+        "SELECT id, body FROM trials WHERE signature_version IS NULL OR signature_version < ?", (SIGNATURE_VERSION,)
+    ).fetchall()
+    with connection:
+        for row in rows:
+            trial = json.loads(zlib.decompress(row["body"]))
+            gaps = trial_gaps(trial)
+            connection.execute(
+                "UPDATE trials SET missing = ?, extra = ?, signatures = ?, gaps = ?, signature_version = ? WHERE id = ?",
+                (len(gaps["missing"]) if gaps else None, len(gaps["extra"]) if gaps else None,
+                 trial_signatures(trial), json.dumps(gaps), SIGNATURE_VERSION, row["id"]),
+            )
+    return len(rows)
+
+
+######################## INGEST ########################
+
+def is_complete(trial):
+    return any(
+        isinstance(turn.get("content"), str) and "###STOP###" in turn["content"]
+        for turn in trial.get("traj") or []
+    )
+
+
+def task_key(trial):
+    """Identity of the task across runs: its user and instruction."""
+    task = (trial.get("info") or {}).get("task") or trial.get("task") or {}
+    key = json.dumps([task.get("user_id"), task.get("instruction")])
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16], task.get("instruction")
+
+
+def trial_signatures(trial):
+    return json.dumps({
+        "expected": [action_hash(name, arguments) for name, arguments in ground_truth_actions(trial)],
+        "made": [action_hash(name, arguments) for name, arguments in model_actions(trial)],
+    })
+
+
+def trial_row(trial):
+    reward = trial.get("reward")
+    gaps = trial_gaps(trial)
+    made = model_actions(trial)
+    key, instruction = task_key(trial)
+    return {
+        "task_key": key,
+        "task_id": None if trial.get("task_id") is None else str(trial.get("task_id")),
+        "instruction": instruction,
+        "reward": float(reward) if isinstance(reward, (int, float)) else None,
+        "passed": int(is_passed(reward)),
+        "complete": int(is_complete(trial)),
+        "num_turns": len(trial.get("traj") or []),
+        "num_tool_calls": len(made),
+        "missing": len(gaps["missing"]) if gaps else None,
+        "extra": len(gaps["extra"]) if gaps else None,
+        "signatures": trial_signatures(trial),
+        "gaps": json.dumps(gaps),
+        "body": zlib.compress(json.dumps(trial, separators=(",", ":")).encode("utf-8")),
+        "tools": sorted({name for name, _ in made if name}),
+    }
+
+
+def ingest_results(results, environment=None, interface=None, name=None, path=None):
+    """
+    Store the trials of a result file as a new run; returns (run id, trial count).
+    Raises ValueError, and stores nothing, when the results are malformed.
+    """
+    try:
+        trials = [trial for trial in load_trials(results) if isinstance(trial, dict)]
+    except (KeyError, TypeError):
+        raise ValueError("results must be a trial, a list of trials or a response_data.results file")
+    connection = connect(path)
+    try:
+        with connection:
+            run_id = connection.execute(
+                "INSERT INTO runs (name, environment, interface, ingested_at, trials) VALUES (?, ?, ?, ?, ?)",
+                (name, environment, None if interface is None else str(interface),
+                 datetime.now(timezone.utc).isoformat(), len(trials)),
+            ).lastrowid
+            for position, trial in enumerate(trials):
+                try:
+                    row = trial_row(trial)
+                except (AttributeError, KeyError, TypeError):
+                    raise ValueError(f"Trial {position} is malformed: expected traj turns, tool calls "
+                                     "and info.task in the trajectory viewer format")
+                trial_id = connection.execute(
+                    "INSERT INTO trials (run_id, position, environment, interface, task_key, task_id, instruction, "
+                    "reward, passed, complete, num_turns, num_tool_calls, missing, extra, signatures, gaps, body, "
+                    "signature_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (run_id, position, environment, None if interface is None else str(interface),
+                     row["task_key"], row["task_id"], row["instruction"], row["reward"], row["passed"],
+                     row["complete"], row["num_turns"], row["num_tool_calls"], row["missing"], row["extra"],
+                     row["signatures"], row["gaps"], row["body"], SIGNATURE_VERSION),
+                ).lastrowid
+                connection.executemany("INSERT INTO trial_tools (trial_id, tool) VALUES (?, ?)",
+                                       [(trial_id, tool) for tool in row["tools"]])
+    finally:
+        connection.close()
+    return run_id, len(trials)
+
+
+######################## QUERIES ########################
+
+def trial_filters(args):
+    """SQL conditions and parameters for the query string filters of the trial endpoints."""
+    conditions, parameters = [], []
+    for field in ("environment", "interface", "run_id", "task_key"):
+        value = args.get(field)
+        if value:
+            conditions.append(f"trials.{field} = ?")
+            parameters.append(value)
+    passed = args.get("passed")
+    if passed in ("true", "false"):
+        conditions.append("trials.passed = ?")
+        parameters.append(1 if passed == "true" else 0)
+    for field, operator in (("min_reward", ">="), ("max_reward", "<=")):
+        if args.get(field) not in (None, ""):
+            conditions.append(f"trials.reward {operator} ?")
+            parameters.append(float(args[field]))
+    tool = args.get("tool")
+    if tool:
+        conditions.append("trials.id IN (SELECT trial_id FROM trial_tools WHERE tool = ?)")
+        parameters.append(tool)
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", parameters
+
+
+def page_arguments(args):
+    page = max(1, int(args.get("page", 1)))
+    per_page = min(MAX_PAGE_SIZE, max(1, int(args.get("per_page", DEFAULT_PAGE_SIZE))))
+    return page, per_page
+
+
+def query_trials(args, path=None):
+    where, parameters = trial_filters(args)
+    page, per_page = page_arguments(args)
+    connection = connect(path)
+    try:
+        total = connection.execute(f"SELECT COUNT(*) FROM trials{where}", parameters).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)} FROM trials{where} ORDER BY run_id, position LIMIT ? OFFSET ?",
+            parameters + [per_page, (page - 1) * per_page],
+        ).fetchall()
+    finally:
+        connection.close()
+    return {"total": total, "page": page, "per_page": per_page, "trials": [dict(row) for row in rows]}
+
+
+def get_trial(trial_id, path=None):
+    connection = connect(path)
+    try:
+        row = connection.execute(
+            f"SELECT {', '.join(SUMMARY_COLUMNS)}, signatures, gaps, body FROM trials WHERE id = ?", (trial_id,)
+        ).fetchone()
+    finally:
+        connection.close()
+    if row is None:
+        return None
+    trial = json.loads(zlib.decompress(row["body"]))
+    trial["archive"] = {column: row[column] for column in SUMMARY_COLUMNS}
+    trial["archive"]["signatures"] = json.loads(row["signatures"])
+    trial["gaps"] = json.loads(row["gaps"])
+    return trial
+
+
+def query_tasks(args, path=None):
+    where, parameters = trial_filters(args)
+    page, per_page = page_arguments(args)
+    connection = connect(path)
+    try:
+        total = connection.execute(f"SELECT COUNT(DISTINCT task_key) FROM trials{where}", parameters).fetchone()[0]
+        rows = connection.execute(
+            f"SELECT task_key, MIN(instruction) AS instruction, MIN(environment) AS environment, "
+            f"COUNT(*) AS trials, SUM(passed) AS passed, AVG(reward) AS mean_reward, "
+            f"AVG(missing) AS mean_missing, AVG(extra) AS mean_extra FROM trials{where} "
+            f"GROUP BY task_key ORDER BY environment, task_key LIMIT ? OFFSET ?",
+            parameters + [per_page, (page - 1) * per_page],
+        ).fetchall()
+    finally:
+        connection.close()
+    return {"total": total, "page": page, "per_page": per_page, "tasks": [dict(row) for row in rows]}
+
+
+def task_gaps(task, args, path=None):
+    """Aggregated gaps of a task's archived trials, from the gaps stored at ingest."""
+    where, parameters = trial_filters(dict(args, task_key=task))
+    connection = connect(path)
+    try:
+        rows = connection.execute(f"SELECT gaps, passed FROM trials{where}", parameters).fetchall()
+    finally:
+        connection.close()
+    return aggregate_gaps([(json.loads(row["gaps"]), row["passed"]) for row in rows])
+
+
+######################## ENDPOINTS ########################
+
+@trajectory_archive_bp.route('/trajectory_archive/ingest', strict_slashes=False, methods=["POST"])
+def ingest():
+    """ Archive a result file: {environment, interface, name, results} """
+    payload = request.get_json(silent=True) or {}
+    if payload.get("results") is None:
+        return jsonify({'status': 'error', 'message': 'results are required'}), 400
+    try:
+        run_id, count = ingest_results(payload["results"], payload.get("environment"),
+                                       payload.get("interface"), payload.get("name"))
+    except ValueError as e:
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        print(f"Error ingesting results: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to ingest results'}), 500
+    return jsonify({'status': 'success', 'run_id': run_id, 'trials': count}), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/runs', strict_slashes=False, methods=["GET"])
+def list_runs():
+    """ Ingested runs, newest first """
+    connection = connect()
+    try:
+        rows = connection.execute(
+            "SELECT runs.*, COALESCE(SUM(trials.passed), 0) AS passed FROM runs "
+            "LEFT JOIN trials ON trials.run_id = runs.id GROUP BY runs.id ORDER BY runs.id DESC"
+        ).fetchall()
+    finally:
+        connection.close()
+    return jsonify({'status': 'success', 'runs': [dict(row) for row in rows]}), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/runs/<int:run_id>', strict_slashes=False, methods=["DELETE"])
+def delete_run(run_id):
+    connection = connect()
+    try:
+        with connection:
+            deleted = connection.execute("DELETE FROM runs WHERE id = ?", (run_id,)).rowcount
+    finally:
+        connection.close()
+    if not deleted:
+        return jsonify({'status': 'error', 'message': 'Run not found'}), 404
+    return jsonify({'status': 'success', 'message': f'Run {run_id} deleted'}), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/trials', strict_slashes=False, methods=["GET"])
+def list_trials():
+    """ Trial summaries matching the filters, one page at a time """
+    try:
+        result = query_trials(request.args)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid numeric parameter'}), 400
+    return jsonify(dict(result, status='success')), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/trials/<int:trial_id>', strict_slashes=False, methods=["GET"])
+def show_trial(trial_id):
+    """ One full trial with its precomputed gaps """
+    trial = get_trial(trial_id)
+    if trial is None:
+        return jsonify({'status': 'error', 'message': 'Trial not found'}), 404
+    return jsonify({'status': 'success', 'trial': trial}), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/tasks', strict_slashes=False, methods=["GET"])
+def list_tasks():
+    """ Per task pass counts and gap averages over the matching trials """
+    try:
+        result = query_tasks(request.args)
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid numeric parameter'}), 400
+    return jsonify(dict(result, status='success')), 200
+
+
+@trajectory_archive_bp.route('/trajectory_archive/tasks/<task>/gaps', strict_slashes=False, methods=["GET"])
+def show_task_gaps(task):
+    """ Gap statistics across all archived trials of a task """
+    try:
+        summary = task_gaps(task, request.args.to_dict())
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'Invalid numeric parameter'}), 400
+    if not summary["trials"]:
+        return jsonify({'status': 'error', 'message': 'No trials found for this task'}), 404
+    return jsonify({'status': 'success', 'task_key': task, 'summary': summary}), 200
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest trial result files into the trajectory archive")
+    parser.add_argument("command", choices=["ingest", "upgrade"])
+    parser.add_argument("environment", nargs="?")
+    parser.add_argument("interface", nargs="?", help="Interface number")
+    parser.add_argument("results", nargs="*", help="Result JSON files (trajectory viewer format)")
+    parser.add_argument("--archive", default=TRAJECTORY_ARCHIVE_PATH, help="Archive database path")
+    args = parser.parse_args()
+
+    if args.command == "upgrade":
+        # Opening the archive recomputes every stale row
+        connect(args.archive).close()
+        print(f"Archive is at signature version {SIGNATURE_VERSION}")
+        raise SystemExit(0)
+    if not args.environment or not args.interface or not args.results:
+        parser.error("ingest needs an environment, an interface and at least one results file")
+
+    for results_path in args.results:
+        with open(results_path, "r") as file:
+            run_id, count = ingest_results(json.load(file), args.environment, args.interface,
+                                           os.path.basename(results_path), args.archive)
+        print(f"Ingested {count} trials from {results_path} as run {run_id}")
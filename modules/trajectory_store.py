@@ -0,0 +1,368 @@
+import io
+import os
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from concurrent.futures import ProcessPoolExecutor
+from modules.dataset_loader import data_fingerprint, load_environment_data
+from modules.state_diff import table_digest, combine_digests
+from modules.task_framework import (
+    ENVS_BASE_PATH,
+    get_interface_manifest,
+    get_tools_class,
+    prepare_arguments,
+)
+
+# Record/replay of tool-call trajectories. Recording runs the tool calls of a
+# trajectory (the assistant tool_calls of "traj", or the ground truth
+# info.task.actions) on a fresh copy of the environment data and stores each
+# call's arguments, output and the data hash after it. Replaying runs the
+# stored calls against the current tools and reports the first call whose
+# output or data hash differs from the recording.
+#
+#   python -m modules.trajectory_store record hr_experts 1 results.json
+#   python -m modules.trajectory_store replay [env ...] --workers 4
+#
+# The archive is append-only: one file per interface under
+# TRAJECTORY_STORE_PATH/<env>/, JSONL compressed with zstandard when it is
+# installed (.jsonl.zst) and gzip otherwise (.jsonl.gz). Every append is a
+# new frame/member, so files are never rewritten. Data hashes only rehash
+# the tables a call looked up (state_diff.combine_digests of table digests).
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+TRAJECTORY_STORE_PATH = os.environ.get("TRAJECTORY_STORE_PATH", os.path.abspath("trajectory_store"))
+RECORD_FORMAT_VERSION = 1
+ARCHIVE_SUFFIXES = (".jsonl.zst", ".jsonl.gz")
+
+
+######################## ARCHIVE FILES ########################
+
+def archive_path(environment, interface, store_path=TRAJECTORY_STORE_PATH):
+    suffix = ".jsonl.zst" if zstandard is not None else ".jsonl.gz"
+    return os.path.join(store_path, environment, f"interface_{interface}{suffix}")
+
+
+def existing_archives(environment, interface, store_path=TRAJECTORY_STORE_PATH):
+    return [
+        path for path in (
+            os.path.join(store_path, environment, f"interface_{interface}{suffix}")
+            for suffix in ARCHIVE_SUFFIXES
+        )
+        if os.path.isfile(path)
+    ]
+
+
+def append_records(path, records):
+    """Append records to an archive file as one new compressed frame."""
+    if not records:
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    payload = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode("utf-8")
+    if path.endswith(".zst"):
+        payload = zstandard.ZstdCompressor(level=10).compress(payload)
+    else:
+        payload = gzip.compress(payload)
+    with open(path, "ab") as file:
+        file.write(payload)
+
+
+def iter_records(path):
+    if path.endswith(".zst"):
+        if zstandard is None:
+            raise RuntimeError(f"{path} needs the zstandard package")
+        with open(path, "rb") as file:
+            reader = zstandard.ZstdDecompressor().stream_reader(file, read_across_frames=True)
+            for line in io.TextIOWrapper(reader, encoding="utf-8"):
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with gzip.open(path, "rt", encoding="utf-8") as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def discover_archives(environments=None, store_path=TRAJECTORY_STORE_PATH):
+    """(environment, interface, path) of every archive file in the store."""
+    archives = []
+    if not os.path.isdir(store_path):
+        return archives
+    for environment in sorted(environments or os.listdir(store_path)):
+        environment_path = os.path.join(store_path, environment)
+        if not os.path.isdir(environment_path):
+            continue
+        for file_name in sorted(os.listdir(environment_path)):
+            for suffix in ARCHIVE_SUFFIXES:
+                if file_name.startswith("interface_") and file_name.endswith(suffix):
+                    interface = file_name[len("interface_"):-len(suffix)]
+                    archives.append((environment, interface, os.path.join(environment_path, file_name)))
+    return archives
+
+
+######################## EXECUTION ########################
+
+class TrackedData(dict):
+    """Environment data that remembers which tables were looked up or replaced."""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.touched = set()
+
+    def __getitem__(self, key):
+        self.touched.add(key)
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        self.touched.add(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self.touched.add(key)
+        return dict.setdefault(self, key, default)
+
+    def __setitem__(self, key, value):
+        self.touched.add(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self.touched.add(key)
+        dict.__delitem__(self, key)
+
+    def pop(self, key, *default):
+        self.touched.add(key)
+        return dict.pop(self, key, *default)
+
+    def values(self):
+        self.touched.update(self.keys())
+        return dict.values(self)
+
+    def items(self):
+        self.touched.update(self.keys())
+        return dict.items(self)
+
+
+_baseline_digests = {}
+
+
+def baseline_digests(data_path, tables):
+    """Table digests of the unmodified dataset, computed once per dataset version."""
+    fingerprint = data_fingerprint(data_path)
+    cached = _baseline_digests.get(data_path)
+    if cached is None or cached[0] != fingerprint:
+        # dict.items so a TrackedData does not mark every table as touched
+        cached = (fingerprint, {name: table_digest(table) for name, table in dict.items(tables)})
+        _baseline_digests[data_path] = cached
+    return dict(cached[1])
+
+
+class InterfaceRunner:
+    """Runs tool calls of one environment interface on fresh copies of its data."""
+
+    def __init__(self, environment, interface, envs_path=ENVS_BASE_PATH):
+        self.data_path = os.path.join(envs_path, environment, "data")
+        manifest = get_interface_manifest(os.path.join(envs_path, environment, "tools", f"interface_{interface}"))
+        self.validators = manifest["argument_validators"]
+        self.tools_instance = get_tools_class(manifest["imports_set"], manifest["invoke_methods"])
+
+    def run(self, calls):
+        """
+        Yield (output, data hash) after each (name, arguments) call. A call
+        that raises yields "Error: <message>" as its output, like Env.step.
+        """
+        data = TrackedData(load_environment_data(self.data_path))
+        digests = baseline_digests(self.data_path, data)
+        for name, arguments in calls:
+            method = getattr(self.tools_instance, name + "_invoke", None)
+            if method is None:
+                output = f"Unknown action {name}"
+            else:
+                try:
+                    output = method(data=data, **prepare_arguments(name + "_invoke", json.loads(json.dumps(arguments)),
+                                                                   self.validators))
+                except Exception as e:
+                    output = f"Error: {e}"
+            for table_name in data.touched:
+                if dict.__contains__(data, table_name):
+                    digests[table_name] = table_digest(dict.__getitem__(data, table_name))
+                else:
+                    digests.pop(table_name, None)
+            data.touched.clear()
+            yield output if isinstance(output, str) else json.dumps(output), combine_digests(digests)
+
+
+######################## RECORD ########################
+
+def trial_calls(trial, source="traj"):
+    """
+    (name, arguments) tool calls of a trial: the assistant tool_calls of its
+    traj, or its ground truth info.task.actions.
+    """
+    calls = []
+    if source == "traj":
+        for message in trial.get("traj") or []:
+            if message.get("role") != "assistant":
+                continue
+            for tool_call in message.get("tool_calls") or []:
+                function = tool_call.get("function") or {}
+                arguments = function.get("arguments") or {}
+                if isinstance(arguments, str):
+                    try:
+                        arguments = json.loads(arguments)
+                    except ValueError:
+                        continue
+                calls.append((function.get("name"), arguments))
+    else:
+        task = (trial.get("info") or {}).get("task") or trial.get("task") or {}
+        for action in task.get("actions") or []:
+            if action.get("name") == "respond":
+                continue
+            calls.append((action["name"], action.get("arguments", action.get("kwargs", {}))))
+    return calls
+
+
+def load_trials(results):
+    """Trials of a result file in any of the shapes the trajectory viewer accepts."""
+    if isinstance(results, dict) and "response_data" in results:
+        return results["response_data"]["results"]
+    if isinstance(results, list):
+        return results
+    return [results]
+
+
+def trajectory_id(environment, interface, calls):
+    key = json.dumps([environment, str(interface), calls], sort_keys=True)
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+
+def record_trajectories(environment, interface, trials, source="traj",
+                        store_path=TRAJECTORY_STORE_PATH, envs_path=ENVS_BASE_PATH):
+    """Run and append the trials not recorded yet; returns the new records."""
+    known = set()
+    for path in existing_archives(environment, interface, store_path):
+        known.update(record["id"] for record in iter_records(path))
+    runner = InterfaceRunner(environment, interface, envs_path)
+    records = []
+    for trial in trials:
+        calls = [(name, arguments) for name, arguments in trial_calls(trial, source) if name]
+        record_id = trajectory_id(environment, interface, calls)
+        if not calls or record_id in known:
+            continue
+        known.add(record_id)
+        steps = [
+            {"name": name, "arguments": arguments, "output": output, "data_hash": data_hash}
+            for (name, arguments), (output, data_hash) in zip(calls, runner.run(calls))
+        ]
+        records.append({
+            "version": RECORD_FORMAT_VERSION,
+            "id": record_id,
+            "environment": environment,
+            "interface": str(interface),
+            "source": source,
+            "task_id": trial.get("task_id"),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "calls": steps,
+        })
+    append_records(archive_path(environment, interface, store_path), records)
+    return records
+
+
+######################## REPLAY ########################
+
+def replay_record(runner, record):
+    """None if the record replays identically, otherwise its first divergent call."""
+    calls = [(step["name"], step["arguments"]) for step in record["calls"]]
+    for index, (step, (output, data_hash)) in enumerate(zip(record["calls"], runner.run(calls))):
+        if output != step["output"] or data_hash != step["data_hash"]:
+            return {
+                "id": record["id"],
+                "call_index": index,
+                "name": step["name"],
+                "arguments": step["arguments"],
+                "output_changed": output != step["output"],
+                "data_changed": data_hash != step["data_hash"],
+                "recorded_output": step["output"],
+                "output": output,
+            }
+    return None
+
+
+def replay_archive(environment, interface, path, envs_path=ENVS_BASE_PATH):
+    start = time.perf_counter()
+    runner = InterfaceRunner(environment, interface, envs_path)
+    replayed = 0
+    divergences = []
+    for record in iter_records(path):
+        replayed += 1
+        divergence = replay_record(runner, record)
+        if divergence is not None:
+            divergences.append(divergence)
+    return {
+        "environment": environment,
+        "interface": interface,
+        "trajectories": replayed,
+        "divergences": divergences,
+        "elapsed_s": round(time.perf_counter() - start, 3),
+    }
+
+
+def replay_store(environments=None, workers=1, store_path=TRAJECTORY_STORE_PATH, envs_path=ENVS_BASE_PATH):
+    """Replay every archive of the store, one interface per worker process."""
+    archives = discover_archives(environments, store_path)
+    if workers <= 1:
+        return [replay_archive(environment, interface, path, envs_path) for environment, interface, path in archives]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(replay_archive, environment, interface, path, envs_path)
+            for environment, interface, path in archives
+        ]
+        return [future.result() for future in futures]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record tool-call trajectories and replay them against the current tools")
+    parser.add_argument("--store", default=TRAJECTORY_STORE_PATH, help="Trajectory archive directory")
+    parser.add_argument("--envs-path", default="envs", help="Path to the envs directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Record the trials of result files")
+    record_parser.add_argument("environment")
+    record_parser.add_argument("interface", help="Interface number")
+    record_parser.add_argument("results", nargs="+", help="Result JSON files (trajectory viewer format)")
+    record_parser.add_argument("--source", choices=["traj", "actions"], default="traj",
+                               help="Record the agent's tool calls or the task's ground truth actions")
+
+    replay_parser = commands.add_parser("replay", help="Replay recorded trajectories")
+    replay_parser.add_argument("environments", nargs="*", help="Environments to replay (default: all)")
+    replay_parser.add_argument("--workers", type=int, default=1, help="Interfaces replayed in parallel")
+    replay_parser.add_argument("--output", help="Also write the JSON report to this path")
+    args = parser.parse_args()
+    envs_path = os.path.abspath(args.envs_path)
+
+    if args.command == "record":
+        trials = []
+        for results_path in args.results:
+            with open(results_path, "r") as file:
+                trials.extend(load_trials(json.load(file)))
+        records = record_trajectories(args.environment, args.interface, trials, args.source, args.store, envs_path)
+        print(f"Recorded {len(records)} new trajectories ({sum(len(r['calls']) for r in records)} calls) "
+              f"to {archive_path(args.environment, args.interface, args.store)}")
+    else:
+        report = replay_store(args.environments, args.workers, args.store, envs_path)
+        if args.output:
+            with open(args.output, "w") as file:
+                json.dump(report, file, indent=2)
+        for result in report:
+            print(f"{result['environment']}/interface_{result['interface']}: {result['trajectories']} trajectories, "
+                  f"{len(result['divergences'])} divergent ({result['elapsed_s']:.2f} s)")
+            for divergence in result["divergences"]:
+                changed = " and ".join(kind for kind, flag in (("output", divergence["output_changed"]),
+                                                               ("data", divergence["data_changed"])) if flag)
+                print(f"  {divergence['id']}: call {divergence['call_index']} {divergence['name']} changed {changed}")
+        if any(result["divergences"] for result in report):
+            raise SystemExit(1)
@@ -0,0 +1,280 @@
+import os
+import json
+import inspect
+import importlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from flask import Blueprint, request, jsonify, Response
+from modules.task_framework import ENVS_BASE_PATH, safe_join_path, validate_path_component
+
+# Runs trials of a task in-process: the task's environment is built from its
+# envs/<env>/env.py Env subclass and N trials run concurrently in a thread
+# pool, each streamed back as one NDJSON line when it finishes. Agents and
+# user simulators are pluggable backends; "oracle" and "scripted" are
+# deterministic local stand-ins that need no model provider.
+#
+# tau_bench is optional: the Env classes need tau_bench.types and the
+# model-backed backends need its agents and litellm. Without it the
+# endpoint answers 503.
+try:
+    import tau_bench.envs as tau_bench_envs
+    from tau_bench.types import Action, Task, RESPOND_ACTION_NAME
+except ImportError:
+    tau_bench_envs = None
+
+trial_runner_bp = Blueprint('trial_runner', __name__)
+
+TRIAL_WORKERS = int(os.environ.get("TRIAL_WORKERS", 8))
+MAX_TRIALS = int(os.environ.get("MAX_TRIALS", 50))
+DEFAULT_MAX_NUM_STEPS = 30
+
+_env_classes = {}
+_env_classes_lock = threading.Lock()
+
+
+def mount_local_envs():
+    """Resolve tau_bench.envs.<env> to this repository's envs/ directories first."""
+    if ENVS_BASE_PATH not in tau_bench_envs.__path__:
+        tau_bench_envs.__path__.insert(0, ENVS_BASE_PATH)
+
+
+def get_env_class(environment):
+    """The Env subclass defined in envs/<environment>/env.py (imported once)."""
+    with _env_classes_lock:
+        env_class = _env_classes.get(environment)
+        if env_class is None:
+            mount_local_envs()
+            module = importlib.import_module(f"tau_bench.envs.{environment}.env")
+            base = importlib.import_module("tau_bench.envs.base").Env
+            env_class = next(
+                value for value in vars(module).values()
+                if inspect.isclass(value) and issubclass(value, base) and value is not base
+            )
+            _env_classes[environment] = env_class
+        return env_class
+
+
+######################## USER BACKENDS ########################
+
+class ScriptedUser:
+    """Deterministic user: states the instruction, then ends the conversation."""
+
+    def reset(self, instruction=None):
+        return instruction or ""
+
+    def step(self, content):
+        return "###STOP###"
+
+    def get_total_cost(self):
+        return 0.0
+
+
+def scripted_user(settings):
+    return ScriptedUser()
+
+
+def llm_user(strategy):
+    def factory(settings):
+        from tau_bench.envs.user import load_user
+        return load_user(strategy, model=settings['user_model'], provider=settings['user_model_provider'])
+    return factory
+
+
+USER_BACKENDS = {
+    'scripted': scripted_user,
+    'llm': llm_user('llm'),
+    'react': llm_user('react'),
+    'verify': llm_user('verify'),
+    'reflection': llm_user('reflection'),
+}
+
+
+######################## AGENT BACKENDS ########################
+
+class OracleAgent:
+    """
+    Deterministic agent: calls the task's ground-truth actions in order and
+    then closes the conversation. Its trials pass unless the environment or
+    the task itself is broken.
+    """
+
+    def solve(self, env, task_index=0, max_num_steps=DEFAULT_MAX_NUM_STEPS):
+        reset = env.reset(task_index=task_index)
+        messages = [
+            {"role": "system", "content": env.wiki},
+            {"role": "user", "content": reset.observation},
+        ]
+        reward, info = 0.0, {}
+        actions = [action for action in env.task.actions if action.name != RESPOND_ACTION_NAME]
+        closing = Action(name=RESPOND_ACTION_NAME, kwargs={"content": "Your request has been completed."})
+        for step, action in enumerate(actions[:max_num_steps] + [closing]):
+            if action.name == RESPOND_ACTION_NAME:
+                messages.append({"role": "assistant", "content": action.kwargs["content"]})
+            else:
+                call_id = f"call_{step}"
+                messages.append({"role": "assistant", "content": None, "tool_calls": [{
+                    "id": call_id,
+                    "type": "function",
+                    "function": {"name": action.name, "arguments": json.dumps(action.kwargs)},
+                }]})
+            response = env.step(action)
+            if action.name == RESPOND_ACTION_NAME:
+                messages.append({"role": "user", "content": response.observation})
+            else:
+                messages.append({"role": "tool", "tool_call_id": call_id, "name": action.name,
+                                 "content": response.observation})
+            info = response.info
+            if response.done:
+                reward = response.reward
+                break
+        return {"reward": reward, "messages": messages, "info": info, "total_cost": 0.0}
+
+
+def oracle_agent(env, settings):
+    return OracleAgent()
+
+
+def tool_calling_agent(env, settings):
+    from tau_bench.agents.tool_calling_agent import ToolCallingAgent
+    return ToolCallingAgent(
+        tools_info=env.tools_info,
+        wiki=env.wiki,
+        model=settings['model'],
+        provider=settings['model_provider'],
+        temperature=settings['temperature'],
+    )
+
+
+AGENT_BACKENDS = {
+    'oracle': oracle_agent,
+    'tool-calling': tool_calling_agent,
+}
+
+
+######################## TRIALS ########################
+
+def plain(value):
+    """JSON-ready copy of pydantic models and containers of them."""
+    if hasattr(value, "model_dump"):
+        return plain(value.model_dump())
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [plain(item) for item in value]
+    return value
+
+
+def build_task(task_json):
+    """tau_bench Task from the task JSON used across the dashboard (actions carry "arguments")."""
+    return Task(
+        user_id=str(task_json.get('user_id', '')),
+        instruction=task_json.get('instruction', ''),
+        actions=[
+            Action(name=action['name'], kwargs=action.get('arguments', action.get('kwargs', {})))
+            for action in task_json.get('actions', [])
+        ],
+        outputs=task_json.get('outputs', []),
+    )
+
+
+def build_env(environment, interface_num, settings):
+    """Env of an interface with its own task list; the user simulator is set per trial."""
+    env_class = get_env_class(environment)
+    return env_class(
+        user_strategy="human",
+        user_model=settings['user_model'],
+        task_split=f"test_interface_{interface_num}",
+        task_index=0,
+        interface_num=interface_num,
+    )
+
+
+def run_trial(trial, environment, interface_num, task, settings):
+    env = build_env(environment, interface_num, settings)
+    # Only the given task is run, with the requested user simulator
+    env.tasks = [task]
+    env.user = USER_BACKENDS[settings['user']](settings)
+    agent = AGENT_BACKENDS[settings['agent']](env, settings)
+    result = plain(agent.solve(env, task_index=0, max_num_steps=settings['max_num_steps']))
+    return {
+        'task_id': 0,
+        'trial': trial,
+        'reward': result.get('reward'),
+        'info': result.get('info'),
+        'traj': result.get('messages'),
+        'total_cost': result.get('total_cost'),
+    }
+
+
+def iter_trial_results(num_trials, environment, interface_num, task, settings):
+    """Run the trials concurrently and yield one NDJSON line per trial as it finishes."""
+    passed = 0
+    workers = max(1, min(num_trials, settings['max_concurrency']))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(run_trial, trial, environment, interface_num, task, settings): trial
+            for trial in range(num_trials)
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {'task_id': 0, 'trial': futures[future], 'reward': 0.0, 'error': str(e), 'traj': []}
+            if result.get('reward'):
+                passed += 1
+            yield json.dumps(result, default=str) + '\n'
+    yield json.dumps({'done': True, 'num_trials': num_trials, 'passed': passed}) + '\n'
+
+
+@trial_runner_bp.route('/run_trials', strict_slashes=False, methods=["POST"])
+def run_trials():
+    """ Run num_trials trials of a task locally and stream the results as NDJSON """
+    if tau_bench_envs is None:
+        return jsonify({
+            'status': 'error',
+            'message': 'Local trials require the tau_bench package'
+        }), 503
+
+    payload = request.get_json(silent=True) or {}
+    environment = payload.get('env')
+    task_json = payload.get('task')
+    if not environment or not validate_path_component(environment):
+        return jsonify({'status': 'error', 'message': 'Invalid environment name'}), 400
+    env_path = safe_join_path(ENVS_BASE_PATH, environment)
+    if env_path is None or not os.path.isfile(os.path.join(env_path, "env.py")):
+        return jsonify({'status': 'error', 'message': 'Environment not found'}), 404
+    if not isinstance(task_json, dict):
+        return jsonify({'status': 'error', 'message': 'A task object is required'}), 400
+
+    try:
+        interface_num = int(payload.get('interface_num', 1))
+        num_trials = int(payload.get('num_trials', 1))
+        settings = {
+            'agent': payload.get('agent', 'tool-calling'),
+            'user': payload.get('user_strategy', 'llm'),
+            'model': payload.get('model'),
+            'model_provider': payload.get('model_provider'),
+            'temperature': float(payload.get('temperature', 0.0)),
+            'user_model': payload.get('user_model', 'gpt-4o'),
+            'user_model_provider': payload.get('user_model_provider', 'openai'),
+            'max_num_steps': int(payload.get('max_num_steps', DEFAULT_MAX_NUM_STEPS)),
+            'max_concurrency': min(int(payload.get('max_concurrency', TRIAL_WORKERS)), TRIAL_WORKERS),
+        }
+    except (TypeError, ValueError):
+        return jsonify({'status': 'error', 'message': 'Invalid numeric parameter'}), 400
+    if not 1 <= num_trials <= MAX_TRIALS:
+        return jsonify({'status': 'error', 'message': f'num_trials must be between 1 and {MAX_TRIALS}'}), 400
+    if settings['agent'] not in AGENT_BACKENDS:
+        return jsonify({'status': 'error', 'message': f"Unknown agent '{settings['agent']}'"}), 400
+    if settings['user'] not in USER_BACKENDS:
+        return jsonify({'status': 'error', 'message': f"Unknown user strategy '{settings['user']}'"}), 400
+
+    try:
+        task = build_task(task_json)
+        get_env_class(environment)
+    except Exception as e:
+        print(f"Error preparing trials for {environment}: {e}")
+        return jsonify({'status': 'error', 'message': 'Failed to load the environment or task'}), 500
+
+    return Response(iter_trial_results(num_trials, environment, interface_num, task, settings),
+                    status=200, mimetype='application/x-ndjson')
@@ -540,7 +540,7 @@ async function executeAPI(actionId) {
             responseDiv.className = 'api-response show success';
             responseDiv.innerHTML = `
                 <div class="response-header">✅ Success</div>
-                <div class="response-content"><pre></pre><pre class="floatFields"></pre><pre class="argFloatFields" style="display:none;"></pre></div>
+                <div class="response-content"><pre></pre><pre class="floatFields"></pre><pre class="argFloatFields" style="display:none;"></pre><pre class="toolProfile"></pre><pre class="argWarnings"></pre></div>
             `;
             // Set the JSON content as text to preserve literals
             
@@ -565,6 +565,15 @@ async function executeAPI(actionId) {
             responseDiv.querySelector('.floatFields').textContent = result.float_fields ? `Float Fields: ${result.float_fields.join(', ')}` : '';
             // Store argument float fields for later export
             responseDiv.querySelector('.argFloatFields').textContent = argumentFloatFields.length > 0 ? argumentFloatFields.join(',') : '';
+            // Timing breakdown, present when profiling is enabled on the server
+            if (result.profile) {
+                const phases = Object.entries(result.profile.phases_ms).map(([phase, ms]) => `${phase} ${ms.toFixed(1)}`).join(', ');
+                responseDiv.querySelector('.toolProfile').textContent = `Profile: ${result.profile.wall_ms.toFixed(1)} ms (${phases})`;
+            }
+            // Arguments that do not match the tool's declared types (not enforced)
+            if (result.warnings && result.warnings.length > 0) {
+                responseDiv.querySelector('.argWarnings').textContent = `⚠️ ${result.warnings.join('; ')}`;
+            }
             showCorrectMessage('API executed successfully!');
         } else {
             responseDiv.className = 'api-response show error';
@@ -138,56 +138,239 @@ function escapeHtml(text) {
     return div.innerHTML;
 }
 
-function compareDiff() {
+// Lines rendered per animation frame, so large diffs never block the page
+const DIFF_RENDER_BATCH = 300;
+let diffRequestId = 0;
+
+function formatWords(words) {
+    return words.map(([op, text]) => {
+        if (op === '-') return `<span class="diff-word-removed">${escapeHtml(text)}</span>`;
+        if (op === '+') return `<span class="diff-word-added">${escapeHtml(text)}</span>`;
+        return escapeHtml(text);
+    }).join('');
+}
+
+function formatHunkLine(line) {
+    const [op, text, words] = line;
+    const content = words ? formatWords(words) : escapeHtml(text);
+    if (op === '-') return `<span class="diff-removed">${content}</span>\n`;
+    if (op === '+') return `<span class="diff-added">${content}</span>\n`;
+    return `<span class="diff-unchanged">${content}</span>\n`;
+}
+
+function formatSkipped(count) {
+    return `<div class="diff-skipped">⋯ ${count} unchanged line${count === 1 ? '' : 's'}</div>`;
+}
+
+function renderHunks(result, requestId) {
+    const original = document.getElementById('originalDiff');
+    const modified = document.getElementById('modifiedDiff');
+    original.innerHTML = '';
+    modified.innerHTML = '';
+    if (result.hunks.length === 0) {
+        original.innerHTML = '<div class="empty-state">No differences</div>';
+        modified.innerHTML = '<div class="empty-state">No differences</div>';
+        return;
+    }
+
+    // Flatten to [skipped, line] items and append them a batch per frame
+    const items = [];
+    let consumed = 0;
+    result.hunks.forEach(hunk => {
+        if (hunk.skipped > 0) items.push({ skipped: hunk.skipped });
+        hunk.lines.forEach(line => items.push({ line }));
+        consumed += hunk.skipped + hunk.lines.length;
+    });
+    const trailing = result.stats.added + result.stats.removed + result.stats.unchanged - consumed;
+    if (trailing > 0) items.push({ skipped: trailing });
+
+    let index = 0;
+    function renderBatch() {
+        if (requestId !== diffRequestId) return;
+        let originalHtml = '', modifiedHtml = '';
+        const end = Math.min(index + DIFF_RENDER_BATCH, items.length);
+        for (; index < end; index++) {
+            const item = items[index];
+            if (item.skipped) {
+                originalHtml += formatSkipped(item.skipped);
+                modifiedHtml += formatSkipped(item.skipped);
+            } else if (item.line[0] === '-') {
+                originalHtml += formatHunkLine(item.line);
+            } else if (item.line[0] === '+') {
+                modifiedHtml += formatHunkLine(item.line);
+            } else {
+                originalHtml += formatHunkLine(item.line);
+                modifiedHtml += formatHunkLine(item.line);
+            }
+        }
+        original.insertAdjacentHTML('beforeend', originalHtml);
+        modified.insertAdjacentHTML('beforeend', modifiedHtml);
+        if (index < items.length) requestAnimationFrame(renderBatch);
+    }
+    renderBatch();
+}
+
+function renderActionChanges(actions) {
+    const container = document.getElementById('actionChanges');
+    if (!container) return;
+    if (!actions) {
+        container.style.display = 'none';
+        return;
+    }
+    const describe = (entry) => {
+        if (entry.old_index !== undefined && entry.new_index !== undefined) {
+            return `${entry.name} #${entry.old_index + 1} → #${entry.new_index + 1}`;
+        }
+        return `${entry.name} #${(entry.old_index !== undefined ? entry.old_index : entry.new_index) + 1}`;
+    };
+    const changed = actions.changed.map(entry =>
+        `${describe(entry)} (${Object.keys(entry.arguments).join(', ')})`);
+    container.innerHTML = [
+        `<strong>Actions:</strong> ${actions.unchanged} unchanged`,
+        `${actions.changed.length} changed${changed.length ? ': ' + changed.map(escapeHtml).join('; ') : ''}`,
+        `${actions.moved.length} moved${actions.moved.length ? ': ' + actions.moved.map(describe).map(escapeHtml).join('; ') : ''}`,
+        `${actions.added.length} added${actions.added.length ? ': ' + actions.added.map(describe).map(escapeHtml).join('; ') : ''}`,
+        `${actions.removed.length} removed${actions.removed.length ? ': ' + actions.removed.map(describe).map(escapeHtml).join('; ') : ''}`,
+    ].join(' · ');
+    container.style.display = 'block';
+}
+
+function updateStats(stats) {
+    document.getElementById('addedCount').textContent = stats.added;
+    document.getElementById('removedCount').textContent = stats.removed;
+    document.getElementById('unchangedCount').textContent = stats.unchanged;
+    document.getElementById('stats').style.display = 'flex';
+}
+
+function compareDiffLocally(text1, text2) {
+    const lineDiff = computeLineDiff(text1, text2);
+    
+    // Format for both panels
+    const originalResult = formatDiffForPanel(lineDiff, 'removed');
+    const modifiedResult = formatDiffForPanel(lineDiff, 'added');
+    
+    document.getElementById('originalDiff').innerHTML = originalResult.content || '<div class="empty-state">No content to display</div>';
+    document.getElementById('modifiedDiff').innerHTML = modifiedResult.content || '<div class="empty-state">No content to display</div>';
+    
+    updateStats({
+        added: lineDiff.filter(item => item.type === 'added').length,
+        removed: lineDiff.filter(item => item.type === 'removed').length,
+        unchanged: lineDiff.filter(item => item.type === 'unchanged').length
+    });
+    renderActionChanges(null);
+}
+
+async function compareDiff() {
     const text1 = document.getElementById('text1').value;
     const text2 = document.getElementById('text2').value;
+    const requestId = ++diffRequestId;
     
     if (!text1.trim() && !text2.trim()) {
         document.getElementById('originalDiff').innerHTML = '<div class="empty-state">Please enter text in at least one field</div>';
         document.getElementById('modifiedDiff').innerHTML = '<div class="empty-state">Please enter text in at least one field</div>';
         document.getElementById('stats').style.display = 'none';
+        renderActionChanges(null);
         return;
     }
     
-    const lineDiff = computeLineDiff(text1, text2);
-    
-    // Enhanced diff that also does word-level comparison within changed lines
-    const enhancedDiff = [];
-    lineDiff.forEach(item => {
-        if (item.type === 'unchanged') {
-            enhancedDiff.push(item);
+    let result = null;
+    try {
+        const response = await fetch('/clone/task_diff', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ old: text1, new: text2 })
+        });
+        if (response.ok) {
+            result = await response.json();
+        }
+    } catch (error) {
+        console.error('Task diff request failed, diffing locally:', error);
+    }
+    // A newer comparison started while this one was in flight
+    if (requestId !== diffRequestId) return;
+
+    if (!result || result.status !== 'success') {
+        compareDiffLocally(text1, text2);
+        return;
+    }
+    updateStats(result.stats);
+    renderActionChanges(result.actions);
+    renderHunks(result, requestId);
+}
+
+function formatFieldChanges(fields) {
+    const parts = [];
+    Object.entries(fields.changed).forEach(([path, change]) =>
+        parts.push(`${path}: ${JSON.stringify(change.old)} → ${JSON.stringify(change.new)}`));
+    Object.entries(fields.added).forEach(([path, value]) => parts.push(`+${path}: ${JSON.stringify(value)}`));
+    Object.entries(fields.removed).forEach(([path, value]) => parts.push(`-${path}: ${JSON.stringify(value)}`));
+    return parts.join(', ');
+}
+
+function renderStateDiff(result) {
+    const container = document.getElementById('stateDiff');
+    const errors = [...result.errors_a.map(error => ['old', error]), ...result.errors_b.map(error => ['new', error])];
+    let html = `<strong>Database:</strong> ${result.identical ? 'both action lists produce the same state' :
+        `${result.summary.changed} changed, ${result.summary.added} added, ${result.summary.removed} removed records`}` +
+        ` · ${result.tables_compared} of ${result.tables_total} tables compared`;
+    errors.forEach(([side, error]) => {
+        html += `<div>⚠️ ${side} task, action #${error.index + 1} ${escapeHtml(error.name)}: ${escapeHtml(error.error)}</div>`;
+    });
+    Object.entries(result.tables).forEach(([tableName, change]) => {
+        let lines = '';
+        if (change.table_added || change.table_removed) {
+            lines = change.table_added ? 'table only in the new state' : 'table only in the old state';
+        } else if (change.replaced) {
+            lines = escapeHtml(formatFieldChanges(change.replaced));
         } else {
-            // For added/removed lines, we keep them as is for line-level diff
-            enhancedDiff.push(item);
+            Object.entries(change.changed).forEach(([recordId, fields]) => {
+                lines += `<span class="diff-unchanged">~ ${escapeHtml(recordId)}: ${escapeHtml(formatFieldChanges(fields))}</span>\n`;
+            });
+            Object.entries(change.added).forEach(([recordId, record]) => {
+                lines += `<span class="diff-added">+ ${escapeHtml(recordId)}: ${escapeHtml(JSON.stringify(record))}</span>\n`;
+            });
+            Object.entries(change.removed).forEach(([recordId, record]) => {
+                lines += `<span class="diff-removed">- ${escapeHtml(recordId)}: ${escapeHtml(JSON.stringify(record))}</span>\n`;
+            });
         }
+        html += `<div class="state-diff-table"><strong>${escapeHtml(tableName)}</strong>\n${lines}</div>`;
     });
-    
-    // Format for both panels
-    const originalResult = formatDiffForPanel(enhancedDiff, 'removed');
-    const modifiedResult = formatDiffForPanel(enhancedDiff, 'added');
-    
-    document.getElementById('originalDiff').innerHTML = originalResult.content || '<div class="empty-state">No content to display</div>';
-    document.getElementById('modifiedDiff').innerHTML = modifiedResult.content || '<div class="empty-state">No content to display</div>';
-    
-    // Update stats
-    const totalStats = {
-        added: enhancedDiff.filter(item => item.type === 'added').length,
-        removed: enhancedDiff.filter(item => item.type === 'removed').length,
-        unchanged: enhancedDiff.filter(item => item.type === 'unchanged').length
-    };
-    
-    document.getElementById('addedCount').textContent = totalStats.added;
-    document.getElementById('removedCount').textContent = totalStats.removed;
-    document.getElementById('unchangedCount').textContent = totalStats.unchanged;
-    document.getElementById('stats').style.display = 'flex';
+    container.innerHTML = html;
+    container.style.display = 'block';
+}
+
+async function compareStates() {
+    if (actionsBefore === null) {
+        showWrongMessage('Please import a task first to compare it with the current task!');
+        return;
+    }
+    try {
+        const response = await fetch('/clone/state_comparison', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ actions_a: actionsBefore, actions_b: getTaskActions(catchFloat=false) })
+        });
+        const result = await response.json();
+        if (result.status !== 'success') {
+            showWrongMessage(result.message || 'Failed to compare database states');
+            return;
+        }
+        renderStateDiff(result);
+    } catch (error) {
+        console.error('Error comparing database states:', error);
+        showWrongMessage('Failed to compare database states');
+    }
 }
 
 function clearAll() {
+    diffRequestId++;
+    document.getElementById('stateDiff').style.display = 'none';
     document.getElementById('text1').value = '';
     document.getElementById('text2').value = '';
     document.getElementById('originalDiff').innerHTML = '<div class="empty-state">Click "Compare Texts" to see differences</div>';
     document.getElementById('modifiedDiff').innerHTML = '<div class="empty-state">Click "Compare Texts" to see differences</div>';
     document.getElementById('stats').style.display = 'none';
+    renderActionChanges(null);
 }
 
 function swapTexts() {